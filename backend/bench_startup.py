@@ -0,0 +1,92 @@
+"""Cold-start budget check for the API.
+
+Each run spawns a fresh interpreter, times `import server` (app factory,
+routers, middleware) and the first request to /api/health. The best of
+several runs is compared against the budgets; exits 1 when one is blown so
+it can gate CI.
+
+    python bench_startup.py [runs]
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent
+
+IMPORT_BUDGET_MS = float(os.environ.get('STARTUP_IMPORT_BUDGET_MS', 1500))
+FIRST_REQUEST_BUDGET_MS = float(os.environ.get('FIRST_REQUEST_BUDGET_MS', 250))
+
+# No `with TestClient(...)`: the lifespan would start the background jobs and
+# try to reach MySQL, which is not what a cold start measures
+PROBE = """
+import json, time
+t0 = time.perf_counter()
+import server
+t1 = time.perf_counter()
+from fastapi.testclient import TestClient
+client = TestClient(server.app)
+t2 = time.perf_counter()
+response = client.get('/api/health')
+t3 = time.perf_counter()
+print(json.dumps({
+    'import_ms': (t1 - t0) * 1000,
+    'first_request_ms': (t3 - t2) * 1000,
+    'status': response.status_code,
+    'modules': len(__import__('sys').modules),
+}))
+"""
+
+
+def run_once():
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PROBE],
+        cwd=ROOT_DIR, capture_output=True, text=True, check=True,
+    )
+    sample = json.loads(result.stdout.strip().splitlines()[-1])
+    sample['slowest_imports'] = slowest_imports(result.stderr)
+    return sample
+
+
+def slowest_imports(importtime_log, limit=5):
+    # Lines look like "import time:  self [us] | cumulative | imported package";
+    # only root packages are ranked so nested modules are not double counted
+    rows = []
+    for line in importtime_log.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        name = name.strip()
+        if '.' not in name and name not in ('server', 'fox', 'site'):
+            rows.append((int(cumulative), name))
+    rows.sort(reverse=True)
+    return [f"{name} {us / 1000:.1f}ms" for us, name in rows[:limit]]
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    samples = [run_once() for _ in range(runs)]
+    best = min(samples, key=lambda s: s['import_ms'])
+    first_request = min(s['first_request_ms'] for s in samples)
+
+    print(f"import server:   {best['import_ms']:.1f}ms (budget {IMPORT_BUDGET_MS:.0f}ms)")
+    print(f"first request:   {first_request:.1f}ms (budget {FIRST_REQUEST_BUDGET_MS:.0f}ms)")
+    print(f"modules loaded:  {best['modules']}")
+    print("slowest imports: " + ", ".join(best['slowest_imports']))
+
+    failed = False
+    if any(s['status'] != 200 for s in samples):
+        print("FAIL: /api/health did not return 200")
+        failed = True
+    if best['import_ms'] > IMPORT_BUDGET_MS:
+        print("FAIL: import budget exceeded")
+        failed = True
+    if first_request > FIRST_REQUEST_BUDGET_MS:
+        print("FAIL: first request budget exceeded")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,7 +3,7 @@ import sys
 sys.path.insert(0, '/app/backend')
 
 import asyncio
-from server import get_db
+from fox.db import get_db
 
 async def create_maintenance_table():
     try:
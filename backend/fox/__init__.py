@@ -0,0 +1,5 @@
+"""Fox backend: FastAPI app factory, domain routers and the MySQL data layer."""
+from pathlib import Path
+from dotenv import load_dotenv
+
+load_dotenv(Path(__file__).resolve().parent.parent / '.env')
@@ -0,0 +1,87 @@
+from fastapi import FastAPI, APIRouter
+from starlette.middleware.cors import CORSMiddleware
+import os
+import asyncio
+
+from fox.archive import ARCHIVE_ENABLED, ARCHIVE_INTERVAL_SECONDS, ARCHIVE_TIMEOUT_SECONDS, run_archiver
+from fox.cepindex import CEP_INDEX_REFRESH_SECONDS, CEP_INDEX_TIMEOUT_SECONDS, refresh_address_index
+from fox.db import MYSQL_READ_HOST, REPLICA_CHECK_SECONDS, check_replica_lag, close_db
+from fox.jobs import background_tasks, start_background_job
+from fox.logs import configure_logging
+from fox.middleware.admission import AdmissionMiddleware
+from fox.middleware.compression import CompressionMiddleware
+from fox.middleware.context import RequestContextMiddleware
+from fox.middleware.idempotency import IdempotencyMiddleware, prune_idempotency_keys
+from fox.middleware.profiling import ProfilingMiddleware
+from fox.middleware.ratelimit import RateLimitMiddleware
+from fox.namesync import (NAME_SYNC_INTERVAL_SECONDS, NAME_SYNC_TIMEOUT_SECONDS, NAME_VERIFY_INTERVAL_SECONDS,
+                          NAME_VERIFY_TIMEOUT_SECONDS, run_name_sync, verify_names)
+from fox.purge import PURGE_INTERVAL_SECONDS, PURGE_TIMEOUT_SECONDS, run_purge_jobs
+from fox.preventive import (PM_INTERVAL_SECONDS, PM_SCHEDULER_ENABLED, PM_TIMEOUT_SECONDS,
+                            run_preventive_maintenance)
+from fox.pricing import PRICE_TABLE_REFRESH_SECONDS, PRICE_TABLE_TIMEOUT_SECONDS, refresh_price_table
+from fox.rentals import (RENTAL_BILLING_ENABLED, RENTAL_BILLING_INTERVAL_SECONDS, RENTAL_BILLING_TIMEOUT_SECONDS,
+                         run_rental_billing)
+from fox.routers import (analytics, auth, cep, clients, dashboard, dumpsters, finance, history, maintenance,
+                         orders, pricing, rentals, system)
+
+# Registration order matters where paths overlap (e.g. /maintenance/proposals before /maintenance/{id})
+ROUTERS = (auth, clients, cep, dumpsters, orders, rentals, pricing, finance, dashboard, maintenance, history, system, analytics)
+
+def create_app() -> FastAPI:
+    configure_logging()
+    app = FastAPI()
+
+    api_router = APIRouter(prefix="/api")
+    for module in ROUTERS:
+        api_router.include_router(module.router)
+    app.include_router(api_router)
+
+    # Innermost first: each add_middleware wraps everything added before it
+    app.add_middleware(IdempotencyMiddleware)
+    app.add_middleware(AdmissionMiddleware)
+    app.add_middleware(RateLimitMiddleware)
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=int(os.environ.get('COMPRESSION_MIN_SIZE', 1024))
+    )
+    app.add_middleware(
+        CORSMiddleware,
+        allow_credentials=True,
+        allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    app.add_middleware(ProfilingMiddleware)
+    app.add_middleware(RequestContextMiddleware)
+
+    @app.on_event("startup")
+    async def start_background_jobs():
+        start_background_job("idempotency-prune", 3600, prune_idempotency_keys, 60)
+        if MYSQL_READ_HOST:
+            start_background_job("replica-lag", REPLICA_CHECK_SECONDS, check_replica_lag,
+                                 max(REPLICA_CHECK_SECONDS, 1), exclusive=False)
+        start_background_job("cep-index", CEP_INDEX_REFRESH_SECONDS, refresh_address_index,
+                             CEP_INDEX_TIMEOUT_SECONDS, exclusive=False)
+        start_background_job("price-table", PRICE_TABLE_REFRESH_SECONDS, refresh_price_table,
+                             PRICE_TABLE_TIMEOUT_SECONDS, exclusive=False)
+        start_background_job("name-sync", NAME_SYNC_INTERVAL_SECONDS, run_name_sync, NAME_SYNC_TIMEOUT_SECONDS)
+        start_background_job("name-verify", NAME_VERIFY_INTERVAL_SECONDS, verify_names, NAME_VERIFY_TIMEOUT_SECONDS)
+        start_background_job("purge", PURGE_INTERVAL_SECONDS, run_purge_jobs, PURGE_TIMEOUT_SECONDS)
+        if ARCHIVE_ENABLED:
+            start_background_job("archive", ARCHIVE_INTERVAL_SECONDS, run_archiver, ARCHIVE_TIMEOUT_SECONDS)
+        if PM_SCHEDULER_ENABLED:
+            start_background_job("preventive-maintenance", PM_INTERVAL_SECONDS,
+                                 run_preventive_maintenance, PM_TIMEOUT_SECONDS)
+        if RENTAL_BILLING_ENABLED:
+            start_background_job("rental-billing", RENTAL_BILLING_INTERVAL_SECONDS,
+                                 run_rental_billing, RENTAL_BILLING_TIMEOUT_SECONDS)
+
+    @app.on_event("shutdown")
+    async def shutdown_db():
+        for task in background_tasks:
+            task.cancel()
+        await asyncio.gather(*background_tasks, return_exceptions=True)
+        await close_db()
+
+    return app
@@ -0,0 +1,151 @@
+import os
+import asyncio
+import logging
+from typing import List, Optional, Tuple
+from datetime import datetime, timezone, timedelta
+
+from fox.bulk import in_clause
+from fox.cache import invalidate_cached, touch_tables
+from fox.db import TracedDictCursor, get_db, to_naive_utc, transaction
+from fox.models import ArchiveRunResult
+
+logger = logging.getLogger(__name__)
+
+# Archival of closed orders and settled receivables
+ARCHIVE_ENABLED = os.environ.get('ARCHIVE_ENABLED', 'true').lower() == 'true'
+ARCHIVE_AFTER_DAYS = int(os.environ.get('ARCHIVE_AFTER_DAYS', 365))
+ARCHIVE_BATCH_SIZE = int(os.environ.get('ARCHIVE_BATCH_SIZE', 200))
+ARCHIVE_MAX_BATCHES = int(os.environ.get('ARCHIVE_MAX_BATCHES', 100))
+ARCHIVE_INTERVAL_SECONDS = float(os.environ.get('ARCHIVE_INTERVAL_SECONDS', 3600))
+ARCHIVE_TIMEOUT_SECONDS = float(os.environ.get('ARCHIVE_TIMEOUT_SECONDS', 300))
+# Pause between batches so the mover never holds locks back to back
+ARCHIVE_BATCH_PAUSE_SECONDS = float(os.environ.get('ARCHIVE_BATCH_PAUSE_SECONDS', 0.05))
+
+# Listed explicitly so live and archive rows line up in INSERT ... SELECT and UNION ALL
+ARCHIVED_COLUMNS = {
+    "orders": ("id", "client_id", "client_name", "dumpster_id", "dumpster_identifier", "order_type", "status",
+               "delivery_address", "delivery_address_id", "rental_value", "payment_method", "scheduled_date",
+               "completed_date", "notes", "created_at"),
+    "accounts_receivable": ("id", "client_id", "client_name", "order_id", "amount", "due_date", "received_date",
+                            "is_received", "bank_transaction_id", "notes", "created_at"),
+}
+
+# An order moves together with its receivables (the FK cascades), so only orders
+# whose every date and every receivable is settled and older than the cutoff qualify
+ARCHIVE_CANDIDATES_SQL = """
+    SELECT o.id FROM orders o
+    WHERE o.status IN ('completed', 'cancelled')
+      AND o.created_at < %s AND o.scheduled_date < %s AND COALESCE(o.completed_date, o.created_at) < %s
+      AND NOT EXISTS (
+          SELECT 1 FROM accounts_receivable ar
+          WHERE ar.order_id = o.id
+            AND (ar.is_received = FALSE OR ar.due_date >= %s OR COALESCE(ar.received_date, ar.due_date) >= %s)
+      )
+      -- Overdue billing still attaches receivables to the order that opened the rental
+      AND NOT EXISTS (SELECT 1 FROM rentals r WHERE r.start_order_id = o.id AND r.settled = FALSE)
+    ORDER BY o.created_at
+    LIMIT %s
+    FOR UPDATE
+"""
+
+def archive_columns(table: str) -> str:
+    return ", ".join(f"`{c}`" for c in ARCHIVED_COLUMNS[table])
+
+async def archived_before(cursor) -> Optional[datetime]:
+    """Watermark: every archived row has all its dates before this; None while the archive is empty."""
+    await cursor.execute("SELECT archived_before FROM archive_state WHERE table_name = 'orders'")
+    row = await cursor.fetchone()
+    return row["archived_before"] if row else None
+
+async def needs_archive(cursor, date_from: Optional[datetime]) -> bool:
+    """Whether a query over [date_from, ...) can match archived rows."""
+    watermark = await archived_before(cursor)
+    if watermark is None:
+        return False
+    return date_from is None or to_naive_utc(date_from) < watermark
+
+def date_range(column: str, date_from: Optional[datetime], date_to: Optional[datetime]) -> Tuple[List[str], list]:
+    """WHERE conditions for an optional [date_from, date_to) filter on ``column``."""
+    conditions, params = [], []
+    if date_from:
+        conditions.append(f"{column} >= %s")
+        params.append(to_naive_utc(date_from))
+    if date_to:
+        conditions.append(f"{column} < %s")
+        params.append(to_naive_utc(date_to))
+    return conditions, params
+
+def with_archive(table: str, columns_sql: str, where: str, params: tuple, order_by: str,
+                 include_archive: bool) -> Tuple[str, tuple]:
+    """SELECT over the live table, plus its archive when ``include_archive``."""
+    sql = f"SELECT {columns_sql} FROM {table} WHERE {where}"
+    if not include_archive:
+        return f"{sql} ORDER BY {order_by}", params
+    return (f"{sql} UNION ALL SELECT {columns_sql} FROM {table}_archive WHERE {where} ORDER BY {order_by}",
+            params + params)
+
+def archive_source(table: str, include_archive: bool) -> str:
+    """FROM target for queries that join or aggregate: the table, or a union with its archive."""
+    if not include_archive:
+        return table
+    columns = archive_columns(table)
+    return f"(SELECT {columns} FROM {table} UNION ALL SELECT {columns} FROM {table}_archive)"
+
+async def move_batch(cursor, order_ids: List[str], archived_at: datetime) -> int:
+    """Copy a batch and its receivables to the archive, then delete them; caller owns the transaction."""
+    placeholders = in_clause(order_ids)
+    receivable_columns = archive_columns("accounts_receivable")
+    await cursor.execute(
+        f"""INSERT INTO accounts_receivable_archive ({receivable_columns}, archived_at)
+            SELECT {receivable_columns}, %s FROM accounts_receivable WHERE order_id IN ({placeholders})""",
+        (archived_at, *order_ids)
+    )
+    receivables = cursor.rowcount
+    order_columns = archive_columns("orders")
+    await cursor.execute(
+        f"""INSERT INTO orders_archive ({order_columns}, archived_at)
+            SELECT {order_columns}, %s FROM orders WHERE id IN ({placeholders})""",
+        (archived_at, *order_ids)
+    )
+    await cursor.execute(f"DELETE FROM accounts_receivable WHERE order_id IN ({placeholders})", order_ids)
+    await cursor.execute(f"DELETE FROM orders WHERE id IN ({placeholders})", order_ids)
+    return receivables
+
+async def run_archiver(now: Optional[datetime] = None) -> ArchiveRunResult:
+    """Move eligible history to the archive in small transactions.
+
+    Each batch locks at most ARCHIVE_BATCH_SIZE orders; the run stops after
+    ARCHIVE_MAX_BATCHES and the next one picks up where it left off.
+    """
+    now = now or datetime.now(timezone.utc)
+    cutoff = (now - timedelta(days=ARCHIVE_AFTER_DAYS)).replace(tzinfo=None)
+    result = ArchiveRunResult(ran=True, cutoff=cutoff)
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            for _ in range(ARCHIVE_MAX_BATCHES):
+                async with transaction(conn):
+                    await cursor.execute(
+                        ARCHIVE_CANDIDATES_SQL,
+                        (cutoff, cutoff, cutoff, cutoff, cutoff, ARCHIVE_BATCH_SIZE)
+                    )
+                    order_ids = [row["id"] for row in await cursor.fetchall()]
+                    if not order_ids:
+                        break
+                    # Same transaction as the move: no reader sees archived rows behind the watermark
+                    await cursor.execute(
+                        """INSERT INTO archive_state (table_name, archived_before, updated_at)
+                           VALUES ('orders', %s, %s)
+                           ON DUPLICATE KEY UPDATE archived_before = GREATEST(archived_before, VALUES(archived_before)),
+                                                   updated_at = VALUES(updated_at)""",
+                        (cutoff, now)
+                    )
+                    result.receivables += await move_batch(cursor, order_ids, now)
+                    result.orders += len(order_ids)
+                    result.batches += 1
+                await asyncio.sleep(ARCHIVE_BATCH_PAUSE_SECONDS)
+            if result.batches:
+                await invalidate_cached(cursor, "orders")
+                await touch_tables(cursor, "orders", "accounts_receivable")
+                logger.info("Archived %s orders and %s receivables", result.orders, result.receivables)
+    return result
@@ -0,0 +1,71 @@
+from fastapi import HTTPException
+import os
+from typing import List, Optional
+from datetime import datetime
+
+from fox.db import transaction
+from fox.models import BulkItemResult, BulkResult
+
+# Bulk operations
+BULK_CHUNK_SIZE = int(os.environ.get('BULK_CHUNK_SIZE', 500))
+BULK_MAX_ITEMS = int(os.environ.get('BULK_MAX_ITEMS', 5000))
+
+def chunked(items, size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def in_clause(values) -> str:
+    return ", ".join(["%s"] * len(values))
+
+async def resolve_bulk_ids(cursor, table: str, ids: Optional[List[str]], conditions: List[str], params: list,
+                           order_by: str) -> List[str]:
+    """Explicit ids win (deduplicated, order kept); otherwise the filter selects them."""
+    if ids:
+        ids = list(dict.fromkeys(ids))
+    elif conditions:
+        await cursor.execute(
+            f"SELECT id FROM {table} WHERE {' AND '.join(conditions)} ORDER BY {order_by} LIMIT %s",
+            (*params, BULK_MAX_ITEMS + 1)
+        )
+        ids = [row["id"] for row in await cursor.fetchall()]
+    else:
+        raise HTTPException(status_code=400, detail="Provide ids or at least one filter")
+    if len(ids) > BULK_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {BULK_MAX_ITEMS} items per request")
+    return ids
+
+async def settle_chunk(cursor, table: str, ids: List[str], settled_at: datetime) -> dict:
+    """Settle ``ids`` inside the caller's transaction; returns {id: was_already_settled}."""
+    flag, date_column = ("is_paid", "paid_date") if table == "accounts_payable" else ("is_received", "received_date")
+    await cursor.execute(
+        f"SELECT id, {flag} AS settled FROM {table} WHERE id IN ({in_clause(ids)}) FOR UPDATE",
+        ids
+    )
+    found = {row["id"]: bool(row["settled"]) for row in await cursor.fetchall()}
+    pending = [account_id for account_id in ids if account_id in found and not found[account_id]]
+    if pending:
+        await cursor.execute(
+            f"UPDATE {table} SET {flag} = %s, {date_column} = %s WHERE id IN ({in_clause(pending)})",
+            (True, settled_at, *pending)
+        )
+    return found
+
+async def settle_accounts(conn, cursor, table: str, ids: List[str], settled_at: datetime) -> List[BulkItemResult]:
+    """Mark payables as paid / receivables as received, one transaction per chunk."""
+    results = []
+    for chunk in chunked(ids, BULK_CHUNK_SIZE):
+        async with transaction(conn):
+            found = await settle_chunk(cursor, table, chunk, settled_at)
+        for account_id in chunk:
+            if account_id not in found:
+                results.append(BulkItemResult(id=account_id, success=False, detail="Account not found"))
+            elif found[account_id]:
+                results.append(BulkItemResult(id=account_id, success=True, detail="Already settled"))
+            else:
+                results.append(BulkItemResult(id=account_id, success=True, changed=True))
+    return results
+
+def bulk_result(results: List[BulkItemResult]) -> BulkResult:
+    updated = sum(1 for r in results if r.changed)
+    failed = sum(1 for r in results if not r.success)
+    return BulkResult(updated=updated, unchanged=len(results) - updated - failed, failed=failed, results=results)
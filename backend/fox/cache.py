@@ -0,0 +1,175 @@
+import os
+from typing import Optional
+from datetime import datetime, timezone, timedelta
+import time
+from collections import OrderedDict
+
+from fox.db import from_replica
+
+# Entity cache
+CACHED_TABLES = ("clients", "dumpsters", "orders", "dumpster_maintenance")
+
+class EntityCache:
+    """Bounded LRU cache of single rows keyed by (table, id), with a TTL."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, table: str, entity_id: str) -> Optional[dict]:
+        key = (table, entity_id)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, table: str, entity_id: str, row: dict):
+        key = (table, entity_id)
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, dict(row))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, table: str, entity_id: Optional[str] = None):
+        self.invalidations += 1
+        if entity_id is not None:
+            self._entries.pop((table, entity_id), None)
+        else:
+            for key in [k for k in self._entries if k[0] == table]:
+                del self._entries[key]
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+class LocalInvalidationBackend:
+    """Single-process backend: invalidations only touch this worker's cache."""
+    name = "local"
+
+    async def publish(self, cursor, table: str, entity_id: Optional[str]):
+        pass
+
+    async def sync(self, cursor, cache: EntityCache):
+        pass
+
+class MySQLInvalidationBackend:
+    """Shares invalidations between uvicorn workers through cache_invalidations.
+
+    Each write appends a row; every worker replays new rows at most once per
+    ``sync_interval`` seconds. AUTO_INCREMENT ids can commit out of order, so
+    each sync re-scans the last ``rescan_ids`` ids and applies the ones it has
+    not seen yet instead of trusting ``id > last id``.
+    """
+    name = "mysql"
+
+    def __init__(self, sync_interval: float, retention_seconds: int = 3600, rescan_ids: int = 1000):
+        self.sync_interval = sync_interval
+        self.retention_seconds = retention_seconds
+        self.rescan_ids = rescan_ids
+        self._last_id = None
+        self._seen = set()
+        self._next_sync = 0.0
+        self._syncs = 0
+
+    async def publish(self, cursor, table: str, entity_id: Optional[str]):
+        await cursor.execute(
+            "INSERT INTO cache_invalidations (entity_table, entity_id, created_at) VALUES (%s, %s, %s)",
+            (table, entity_id, datetime.now(timezone.utc))
+        )
+
+    async def sync(self, cursor, cache: EntityCache):
+        now = time.monotonic()
+        if now < self._next_sync:
+            return
+        self._next_sync = now + self.sync_interval
+
+        if self._last_id is None:
+            await cursor.execute("SELECT COALESCE(MAX(id), 0) AS last_id FROM cache_invalidations")
+            self._last_id = (await cursor.fetchone())["last_id"]
+            cache.clear()
+            return
+
+        await cursor.execute(
+            "SELECT id, entity_table, entity_id FROM cache_invalidations WHERE id > %s ORDER BY id",
+            (max(self._last_id - self.rescan_ids, 0),)
+        )
+        self.apply(await cursor.fetchall(), cache)
+
+        self._syncs += 1
+        if self._syncs % 600 == 0:
+            await cursor.execute(
+                "DELETE FROM cache_invalidations WHERE created_at < %s",
+                (datetime.now(timezone.utc) - timedelta(seconds=self.retention_seconds),)
+            )
+
+    def apply(self, rows, cache: EntityCache):
+        for row in rows:
+            if row["id"] in self._seen:
+                continue
+            cache.invalidate(row["entity_table"], row["entity_id"])
+            self._seen.add(row["id"])
+            self._last_id = max(self._last_id, row["id"])
+        floor = self._last_id - self.rescan_ids
+        self._seen = {seen_id for seen_id in self._seen if seen_id > floor}
+
+entity_cache = EntityCache(
+    max_entries=int(os.environ.get('ENTITY_CACHE_MAX_ENTRIES', 10000)),
+    ttl_seconds=float(os.environ.get('ENTITY_CACHE_TTL_SECONDS', 30))
+)
+if os.environ.get('ENTITY_CACHE_BACKEND', 'local') == 'mysql':
+    cache_backend = MySQLInvalidationBackend(float(os.environ.get('ENTITY_CACHE_SYNC_SECONDS', 1)),
+                                             rescan_ids=int(os.environ.get('ENTITY_CACHE_RESCAN_IDS', 1000)))
+else:
+    cache_backend = LocalInvalidationBackend()
+
+async def get_cached_row(cursor, table: str, entity_id: str) -> Optional[dict]:
+    assert table in CACHED_TABLES
+    await cache_backend.sync(cursor, entity_cache)
+    row = entity_cache.get(table, entity_id)
+    if row is None:
+        await cursor.execute(f"SELECT * FROM {table} WHERE id = %s", (entity_id,))
+        row = await cursor.fetchone()
+        if row is None:
+            return None
+        # A lagging replica row would outlive the read-your-writes window for the whole TTL
+        if not from_replica(cursor):
+            entity_cache.set(table, entity_id, row)
+    if row.get("deleted_at") is not None:
+        # Soft-deleted clients and dumpsters read as missing until the purge removes them
+        return None
+    return dict(row)
+
+async def invalidate_cached(cursor, table: str, entity_id: Optional[str] = None):
+    # entity_id=None drops the whole table, used when a cascade touched unknown rows
+    entity_cache.invalidate(table, entity_id)
+    await cache_backend.publish(cursor, table, entity_id)
+
+# Table versions (conditional GET)
+async def touch_tables(cursor, *tables: str):
+    # Bumped by every write route; list/detail ETags are derived from these counters
+    now = datetime.now(timezone.utc)
+    await cursor.executemany(
+        """INSERT INTO table_versions (table_name, version, updated_at) VALUES (%s, 1, %s)
+           ON DUPLICATE KEY UPDATE version = version + 1, updated_at = VALUES(updated_at)""",
+        [(table, now) for table in tables]
+    )
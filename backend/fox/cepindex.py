@@ -0,0 +1,212 @@
+import os
+import asyncio
+import bisect
+import csv
+import logging
+import re
+import time
+import unicodedata
+from typing import Iterable, List, Optional
+
+from fox.db import TracedDictCursor, get_read_db
+
+logger = logging.getLogger(__name__)
+
+# Local CEP / street index
+CEP_INDEX_REFRESH_SECONDS = float(os.environ.get('CEP_INDEX_REFRESH_SECONDS', 60))
+CEP_INDEX_TIMEOUT_SECONDS = float(os.environ.get('CEP_INDEX_TIMEOUT_SECONDS', 60))
+# Optional CSV (cep;street;neighborhood;city;state) loaded once per worker into its own,
+# never rebuilt index; it wins over client addresses
+CEP_DATASET_PATH = os.environ.get('CEP_DATASET_PATH', '')
+CEP_AUTOCOMPLETE_MAX_LIMIT = 50
+
+ADDRESS_FIELDS = ("street", "neighborhood", "city", "state")
+# The most used spelling of each CEP among client addresses
+ADDRESS_ROWS_SQL = """
+    SELECT cep, street, neighborhood, city, state, COUNT(*) AS uses
+    FROM client_addresses
+    GROUP BY cep, street, neighborhood, city, state
+"""
+
+def clean_cep(value: str) -> str:
+    return re.sub(r"\D", "", value or "")
+
+def fold(text: str) -> str:
+    """Lowercase without accents, so "sao" finds "São"."""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    return " ".join("".join(c for c in decomposed if not unicodedata.combining(c)).lower().split())
+
+def street_keys(street: str) -> List[str]:
+    # One key per word start: "paulista" finds "Avenida Paulista"
+    words = fold(street).split()
+    return [" ".join(words[position:]) for position in range(len(words))]
+
+class AddressIndex:
+    """Map of CEP -> address, with sorted arrays for prefix search.
+
+    ``ceps`` is sorted CEP digits and ``streets`` sorted (street key, cep)
+    pairs; a prefix query is two bisects plus a short scan.
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self.ceps = []
+        self.streets = []
+        self.version = None
+        self.built_at = None
+
+    def rebuild(self, entries: dict):
+        # Built aside and swapped in one step, so lookups never see a half-built index
+        streets = sorted((key, cep) for cep, entry in entries.items() for key in street_keys(entry["street"]))
+        self.entries, self.ceps, self.streets = dict(entries), sorted(entries), streets
+        self.built_at = time.time()
+
+    def add(self, cep: str, street: str, neighborhood: str, city: str, state: str, source: str = "local"):
+        cep = clean_cep(cep)
+        if len(cep) != 8 or not street or cep in dataset_index.entries:
+            return
+        current = self.entries.get(cep)
+        if current is not None:
+            if current["street"] == street:
+                return
+            for key in street_keys(current["street"]):
+                position = bisect.bisect_left(self.streets, (key, cep))
+                if position < len(self.streets) and self.streets[position] == (key, cep):
+                    del self.streets[position]
+        else:
+            bisect.insort(self.ceps, cep)
+        self.entries[cep] = {"street": street, "neighborhood": neighborhood, "city": city,
+                             "state": (state or "").upper(), "source": source}
+        for key in street_keys(street):
+            bisect.insort(self.streets, (key, cep))
+
+    def search(self, query: str, limit: int, city: Optional[str] = None, state: Optional[str] = None,
+               seen: Optional[set] = None) -> List[dict]:
+        """Addresses whose CEP (digits) or any word of the street starts with ``query``."""
+        digits = clean_cep(query)
+        city_key = fold(city) if city else None
+        state_key = state.upper() if state else None
+        results, seen = [], set() if seen is None else seen
+        if limit <= 0:
+            return results
+
+        def accept(cep: str) -> bool:
+            entry = self.entries[cep]
+            if cep in seen or (city_key and fold(entry["city"]) != city_key) or \
+                    (state_key and entry["state"] != state_key):
+                return False
+            seen.add(cep)
+            results.append(address_response(cep, entry))
+            return len(results) >= limit
+
+        if digits and digits == re.sub(r"[\s.\-]", "", query):
+            position = bisect.bisect_left(self.ceps, digits)
+            for cep in self.ceps[position:]:
+                if not cep.startswith(digits) or accept(cep):
+                    break
+            return results
+        prefix = fold(query)
+        if not prefix:
+            return results
+        position = bisect.bisect_left(self.streets, (prefix, ""))
+        while position < len(self.streets):
+            key, cep = self.streets[position]
+            if not key.startswith(prefix) or accept(cep):
+                break
+            position += 1
+        return results
+
+def address_response(cep: str, entry: dict) -> dict:
+    # Same shape the ViaCEP route has always returned, plus where it came from
+    return {
+        "cep": f"{cep[:5]}-{cep[5:]}",
+        "street": entry["street"],
+        "complement": "",
+        "neighborhood": entry["neighborhood"],
+        "city": entry["city"],
+        "state": entry["state"],
+        "source": entry["source"],
+    }
+
+# Per worker: the dataset is built once; address_index holds what clients use,
+# gets this worker's writes right away through add() and is rebuilt by the
+# refresh job when client_addresses' table version moves (other workers' writes)
+dataset_index = AddressIndex()
+address_index = AddressIndex()
+lookup_counters = {"hits": 0, "misses": 0, "viacep_fallbacks": 0}
+
+def lookup_address(cep: str) -> Optional[dict]:
+    for index in (dataset_index, address_index):
+        entry = index.entries.get(cep)
+        if entry is not None:
+            lookup_counters["hits"] += 1
+            return address_response(cep, entry)
+    lookup_counters["misses"] += 1
+    return None
+
+def search_addresses(query: str, limit: int, city: Optional[str] = None, state: Optional[str] = None) -> List[dict]:
+    seen = set()
+    results = dataset_index.search(query, limit, city, state, seen)
+    return results + address_index.search(query, limit - len(results), city, state, seen)
+
+def index_stats() -> dict:
+    lookups = lookup_counters["hits"] + lookup_counters["misses"]
+    return {
+        "entries": len(address_index.entries),
+        "dataset_entries": len(dataset_index.entries),
+        "street_keys": len(address_index.streets) + len(dataset_index.streets),
+        "version": address_index.version,
+        "built_at": address_index.built_at,
+        **lookup_counters,
+        "hit_ratio": round(lookup_counters["hits"] / lookups, 4) if lookups else 0.0,
+    }
+
+def load_dataset(path: str) -> dict:
+    entries = {}
+    with open(path, newline="", encoding="utf-8-sig") as handle:
+        for row in csv.reader(handle, delimiter=";"):
+            if len(row) < 5:
+                continue
+            cep = clean_cep(row[0])
+            if len(cep) == 8 and row[1].strip():
+                entries[cep] = {"street": row[1].strip(), "neighborhood": row[2].strip(), "city": row[3].strip(),
+                                "state": row[4].strip().upper(), "source": "dataset"}
+    return entries
+
+def remember_addresses(addresses: Iterable[dict]):
+    """Feed addresses just written by this worker into its index."""
+    for address in addresses:
+        address_index.add(address["cep"], address["street"], address["neighborhood"], address["city"],
+                          address["state"])
+
+async def refresh_address_index():
+    """Rebuild this worker's index when client_addresses changed since the last build."""
+    if CEP_DATASET_PATH and dataset_index.built_at is None:
+        # A full national dataset takes seconds to parse and sort; keep it off the event loop
+        dataset = await asyncio.to_thread(load_dataset, CEP_DATASET_PATH)
+        await asyncio.to_thread(dataset_index.rebuild, dataset)
+        logger.info("Loaded %s CEPs from %s", len(dataset), CEP_DATASET_PATH)
+    pool = await get_read_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            await cursor.execute("SELECT version FROM table_versions WHERE table_name = 'client_addresses'")
+            row = await cursor.fetchone()
+            version = row["version"] if row else 0
+            if address_index.built_at is not None and version == address_index.version:
+                return
+            await cursor.execute(ADDRESS_ROWS_SQL)
+            entries, uses = {}, {}
+            for row in await cursor.fetchall():
+                cep = clean_cep(row["cep"])
+                if len(cep) != 8 or len(row["state"] or "") != 2 or not row["street"]:
+                    continue
+                if row["uses"] > uses.get(cep, 0):
+                    uses[cep] = row["uses"]
+                    entries[cep] = {field: row[field] for field in ADDRESS_FIELDS}
+                    entries[cep]["state"] = entries[cep]["state"].upper()
+                    entries[cep]["source"] = "local"
+    # CEPs learned from ViaCEP are kept across rebuilds
+    learned = {cep: entry for cep, entry in address_index.entries.items() if entry["source"] == "viacep"}
+    learned.update(entries)
+    address_index.rebuild(learned)
+    address_index.version = version
@@ -0,0 +1,417 @@
+from fastapi import HTTPException
+import os
+import csv
+import io
+import re
+import uuid
+import zipfile
+import xml.etree.ElementTree as ET
+from decimal import Decimal, InvalidOperation
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timezone
+
+import aiomysql
+from pydantic import validate_email
+
+from fox.bulk import chunked, in_clause
+from fox.cache import invalidate_cached, touch_tables
+from fox.cepindex import remember_addresses
+from fox.db import transaction
+from fox.geo import locate_client_addresses
+from fox.models import ClientImportError, ClientImportReport, PurgeEntity
+from fox.namesync import enqueue_name_syncs
+
+# Client bulk import
+CLIENT_IMPORT_MAX_BYTES = int(os.environ.get('CLIENT_IMPORT_MAX_BYTES', 10 * 1024 * 1024))
+CLIENT_IMPORT_MAX_ROWS = int(os.environ.get('CLIENT_IMPORT_MAX_ROWS', 20000))
+CLIENT_IMPORT_CHUNK_SIZE = int(os.environ.get('CLIENT_IMPORT_CHUNK_SIZE', 500))
+# Uncompressed size limit for each XLSX part that is read (guards against zip bombs)
+CLIENT_IMPORT_MAX_XLSX_PART_BYTES = int(os.environ.get('CLIENT_IMPORT_MAX_XLSX_PART_BYTES', 100 * 1024 * 1024))
+
+# Header aliases; a key may match several columns ("CPF" and "CNPJ", "Telefone" and
+# "Celular"): the first non-empty one wins, except phones, which are all kept
+IMPORT_COLUMNS = {
+    "name": ("nome", "name", "cliente", "razao social", "razão social", "nome/razão social", "nome / razão social"),
+    "document": ("documento", "document", "cpf", "cnpj", "cpf/cnpj", "cpf / cnpj", "cpf_cnpj"),
+    "email": ("email", "e-mail"),
+    "phone": ("telefone", "phone", "celular", "fone", "whatsapp", "telefone 2", "telefone2"),
+    "address": ("endereco", "endereço", "address"),
+    "address_type": ("tipo endereco", "tipo endereço", "address_type"),
+    "cep": ("cep",),
+    "street": ("logradouro", "rua", "street"),
+    "number": ("numero", "número", "nº", "number"),
+    "complement": ("complemento", "complement"),
+    "neighborhood": ("bairro", "neighborhood"),
+    "city": ("cidade", "municipio", "município", "city"),
+    "state": ("uf", "estado", "state"),
+}
+ADDRESS_FIELDS = ("cep", "street", "number", "complement", "neighborhood", "city", "state")
+
+DOCUMENT_NOISE = re.compile(r"[^0-9A-Za-z]")
+CPF_PATTERN = re.compile(r"\d{11}")
+# Alphanumeric CNPJs (issued from July 2026) keep numeric check digits
+CNPJ_PATTERN = re.compile(r"[0-9A-Z]{12}\d{2}")
+CNPJ_WEIGHTS = (6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2)
+
+XLSX_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+XLSX_SHEET = re.compile(r"xl/worksheets/sheet(\d+)\.xml")
+CELL_COLUMN = re.compile(r"[A-Z]+")
+
+UPSERT_CLIENT_SQL = """
+    INSERT INTO clients (id, name, email, phone, address, document, document_type, document_normalized, created_at)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE name = VALUES(name), email = COALESCE(VALUES(email), email),
+        phone = IF(VALUES(phone) = '', phone, VALUES(phone)),
+        address = IF(VALUES(address) = '', address, VALUES(address)),
+        document = VALUES(document), document_type = VALUES(document_type)
+"""
+
+def normalize_document(value: str) -> str:
+    """CPF/CNPJ without punctuation, in upper case; document_key() adds the zero-fill."""
+    return DOCUMENT_NOISE.sub("", value).upper()
+
+def check_digit(base: str, weights) -> int:
+    # Letters count as their ASCII code minus 48, so digits keep their value
+    rest = sum((ord(char) - 48) * weight for char, weight in zip(base, weights)) % 11
+    return 0 if rest < 2 else 11 - rest
+
+def document_type_of(document: str) -> Optional[str]:
+    """'cpf' or 'cnpj' when ``document`` (normalized) has valid check digits, else None."""
+    if len(set(document)) == 1:
+        return None
+    if CPF_PATTERN.fullmatch(document):
+        first = check_digit(document[:9], range(10, 1, -1))
+        second = check_digit(document[:10], range(11, 1, -1))
+        return "cpf" if document[9:] == f"{first}{second}" else None
+    if CNPJ_PATTERN.fullmatch(document):
+        first = check_digit(document[:12], CNPJ_WEIGHTS[1:])
+        second = check_digit(document[:13], CNPJ_WEIGHTS)
+        return "cnpj" if document[12:] == f"{first}{second}" else None
+    return None
+
+def document_key(value: str) -> Tuple[str, Optional[str]]:
+    """(normalized document, 'cpf' | 'cnpj' | None); the first is the document_normalized rule,
+    the same one migration_client_import.sql backfilled."""
+    document = normalize_document(value)
+    if document.isdigit() and len(document) in (9, 10, 12, 13):
+        # Leading zeros dropped when the column was formatted as a number
+        document = document.zfill(11 if len(document) < 11 else 14)
+    return document, document_type_of(document)
+
+def phone_key(phone: str) -> str:
+    digits = re.sub(r"\D", "", phone).lstrip("0")
+    return digits[2:] if digits.startswith("55") and len(digits) > 11 else digits
+
+def address_key(cep: str, number: str) -> Tuple[str, str]:
+    return re.sub(r"\D", "", cep), number.strip().lower()
+
+def read_csv(content: bytes) -> List[Tuple[int, List[str]]]:
+    try:
+        text = content.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        # Excel on Windows saves CSV in cp1252
+        text = content.decode("cp1252", errors="replace")
+    sample = text[:4096]
+    delimiter = ";" if sample.count(";") > sample.count(",") else ","
+    return list(enumerate(csv.reader(io.StringIO(text), delimiter=delimiter), start=1))
+
+def xlsx_part(book: zipfile.ZipFile, name: str) -> bytes:
+    if book.getinfo(name).file_size > CLIENT_IMPORT_MAX_XLSX_PART_BYTES:
+        raise HTTPException(status_code=413, detail="Spreadsheet too large")
+    return book.read(name)
+
+def xlsx_cell_text(cell, shared: List[str]) -> str:
+    kind = cell.get("t")
+    if kind == "inlineStr":
+        return "".join(t.text or "" for t in cell.iter(f"{XLSX_NS}t"))
+    value = cell.find(f"{XLSX_NS}v")
+    if value is None or value.text is None:
+        return ""
+    if kind == "s":
+        return shared[int(value.text)]
+    if kind in (None, "n"):
+        # Documents and phones typed as numbers come back as 12345678909 or 1.2345678909E10
+        try:
+            number = Decimal(value.text)
+        except InvalidOperation:
+            return value.text
+        if number == number.to_integral_value():
+            return str(int(number))
+    return value.text
+
+def column_index(reference: str) -> int:
+    index = 0
+    for letter in CELL_COLUMN.match(reference).group():
+        index = index * 26 + ord(letter) - 64
+    return index - 1
+
+def read_xlsx(content: bytes) -> List[Tuple[int, List[str]]]:
+    """Rows of the first worksheet, read with zipfile and ElementTree (no openpyxl)."""
+    try:
+        with zipfile.ZipFile(io.BytesIO(content)) as book:
+            names = book.namelist()
+            sheets = sorted((int(m.group(1)), m.group()) for m in map(XLSX_SHEET.fullmatch, names) if m)
+            if not sheets:
+                raise HTTPException(status_code=400, detail="Spreadsheet has no worksheet")
+            shared = []
+            if "xl/sharedStrings.xml" in names:
+                for item in ET.fromstring(xlsx_part(book, "xl/sharedStrings.xml")).iter(f"{XLSX_NS}si"):
+                    # Rich text splits a string into runs; phonetic hints (rPh) are not part of it
+                    shared.append("".join(t.text or "" for r in item if r.tag != f"{XLSX_NS}rPh"
+                                          for t in r.iter(f"{XLSX_NS}t")))
+            sheet = ET.fromstring(xlsx_part(book, sheets[0][1]))
+
+            rows = []
+            for line_number, row in enumerate(sheet.iter(f"{XLSX_NS}row"), start=1):
+                cells = {}
+                for position, cell in enumerate(row.iter(f"{XLSX_NS}c")):
+                    reference = cell.get("r")
+                    cells[column_index(reference) if reference else position] = xlsx_cell_text(cell, shared)
+                values = [""] * (max(cells) + 1 if cells else 0)
+                for index, text in cells.items():
+                    values[index] = text
+                # Empty rows are not stored, so the sheet's own row number is used when present
+                rows.append((int(row.get("r", line_number)), values))
+            return rows
+    except (zipfile.BadZipFile, ET.ParseError, KeyError, IndexError, ValueError, AttributeError):
+        raise HTTPException(status_code=400, detail="Invalid XLSX file")
+
+def read_spreadsheet(filename: str, content: bytes) -> List[Tuple[int, List[str]]]:
+    if content[:2] == b"PK" or filename.lower().endswith(".xlsx"):
+        return read_xlsx(content)
+    return read_csv(content)
+
+def header_positions(header: List[str]) -> Dict[str, List[int]]:
+    names = [" ".join(cell.strip().lower().split()) for cell in header]
+    positions = {}
+    for key, aliases in IMPORT_COLUMNS.items():
+        found = [index for index, name in enumerate(names) if name in aliases]
+        if found:
+            positions[key] = found
+    if "name" not in positions or "document" not in positions:
+        raise HTTPException(status_code=400, detail="Spreadsheet must have name and document columns")
+    return positions
+
+def cell_values(row: List[str], positions: Dict[str, List[int]], key: str) -> List[str]:
+    values = (row[index].strip() for index in positions.get(key, ()) if index < len(row))
+    return [value for value in values if value]
+
+def parse_client_row(row: List[str], positions: Dict[str, List[int]]) -> Tuple[Optional[dict], List[str]]:
+    """One spreadsheet row as an import record, or the reasons it was rejected."""
+    first = {key: (cell_values(row, positions, key) or [""])[0] for key in IMPORT_COLUMNS if key != "phone"}
+    problems = []
+    if not first["name"]:
+        problems.append("missing name")
+
+    document, document_type = document_key(first["document"])
+    if not document:
+        problems.append("missing document")
+    elif document_type is None:
+        problems.append(f"invalid CPF/CNPJ {first['document']}")
+
+    email = None
+    if first["email"]:
+        try:
+            email = validate_email(first["email"])[1]
+        except ValueError:
+            problems.append(f"invalid email {first['email']}")
+
+    phones = {}
+    for phone in cell_values(row, positions, "phone"):
+        key = phone_key(phone)
+        if not 10 <= len(key) <= 11:
+            problems.append(f"invalid phone {phone}")
+        else:
+            phones.setdefault(key, phone)
+
+    addresses = {}
+    parts = {field: first[field] for field in ADDRESS_FIELDS}
+    if any(parts.values()):
+        cep = re.sub(r"\D", "", parts["cep"])
+        missing = [field for field in ("cep", "street", "neighborhood", "city", "state") if not parts[field]]
+        if missing:
+            problems.append(f"incomplete address: missing {', '.join(missing)}")
+        elif len(cep) != 8:
+            problems.append(f"invalid CEP {parts['cep']}")
+        elif len(parts["state"]) != 2:
+            problems.append(f"invalid state {parts['state']}")
+        else:
+            parts.update(cep=f"{cep[:5]}-{cep[5:]}", number=parts["number"] or "S/N", state=parts["state"].upper(),
+                         complement=parts["complement"] or None,
+                         address_type=first["address_type"] or "Residencial")
+            addresses[address_key(parts["cep"], parts["number"])] = parts
+
+    if problems:
+        return None, problems
+    legacy_address = first["address"]
+    if not legacy_address and addresses:
+        legacy_address = "{street}, {number} - {neighborhood}, {city}/{state}".format(**parts)
+    return {
+        "name": first["name"],
+        "email": email,
+        # Legacy single-value columns: left untouched on update when the sheet has nothing
+        "phone": next(iter(phones.values()), ""),
+        "address": legacy_address,
+        "document": first["document"],
+        "document_type": document_type,
+        "document_key": document,
+        "phones": phones,
+        "addresses": addresses,
+    }, []
+
+def validate_rows(rows: List[Tuple[int, List[str]]]) -> Tuple[List[dict], ClientImportReport]:
+    """Batch validation pass: no database access, every rejected row reported."""
+    rows = [(line, row) for line, row in rows if any(cell.strip() for cell in row)]
+    if not rows:
+        raise HTTPException(status_code=400, detail="Spreadsheet is empty")
+    if len(rows) - 1 > CLIENT_IMPORT_MAX_ROWS:
+        raise HTTPException(status_code=400, detail=f"At most {CLIENT_IMPORT_MAX_ROWS} rows per import")
+    positions = header_positions(rows[0][1])
+
+    report = ClientImportReport(rows=len(rows) - 1, valid=0, duplicates_in_file=0)
+    clients = {}
+    for line, row in rows[1:]:
+        record, problems = parse_client_row(row, positions)
+        if record is None:
+            document = (cell_values(row, positions, "document") or [None])[0]
+            report.errors.append(ClientImportError(row=line, document=document, detail="; ".join(problems)))
+            continue
+        report.valid += 1
+        merged = clients.get(record["document_key"])
+        if merged is None:
+            clients[record["document_key"]] = dict(record, row=line)
+            continue
+        # Same client twice in the file: later values win, contacts accumulate
+        report.duplicates_in_file += 1
+        for field in ("name", "email", "phone", "address", "document"):
+            if record[field]:
+                merged[field] = record[field]
+        for key, phone in record["phones"].items():
+            merged["phones"].setdefault(key, phone)
+        merged["addresses"].update(record["addresses"])
+    return list(clients.values()), report
+
+async def existing_clients(cursor, keys: List[str], lock: bool) -> Dict[str, dict]:
+    # One lookup per chunk on the unique document_key index
+    await cursor.execute(
+        f"SELECT id, name, document_key FROM clients WHERE document_key IN ({in_clause(keys)})"
+        + (" FOR UPDATE" if lock else ""),
+        keys
+    )
+    return {row["document_key"]: row for row in await cursor.fetchall()}
+
+async def existing_contacts(cursor, table: str, client_ids: List[str]) -> List[dict]:
+    if not client_ids:
+        return []
+    columns = "client_id, phone, is_primary" if table == "client_phones" else "client_id, cep, number, is_primary"
+    await cursor.execute(f"SELECT {columns} FROM {table} WHERE client_id IN ({in_clause(client_ids)})", client_ids)
+    return await cursor.fetchall()
+
+async def import_chunk(cursor, chunk: List[dict], update_existing: bool, now: datetime) -> dict:
+    """Upsert one chunk inside the caller's transaction; returns its counts."""
+    counts = {"created": 0, "updated": 0, "skipped": 0, "phones_added": 0, "addresses_added": 0}
+    existing = await existing_clients(cursor, [c["document_key"] for c in chunk], lock=True)
+    if not update_existing:
+        counts["skipped"] = len(existing)
+        chunk = [c for c in chunk if c["document_key"] not in existing]
+    renamed = []
+    for client in chunk:
+        found = existing.get(client["document_key"])
+        client["id"] = found["id"] if found else str(uuid.uuid4())
+        counts["updated" if found else "created"] += 1
+        if found and found["name"] != client["name"]:
+            renamed.append(found["id"])
+    if not chunk:
+        return counts
+
+    await cursor.executemany(UPSERT_CLIENT_SQL, [
+        (c["id"], c["name"], c["email"], c["phone"], c["address"], c["document"], c["document_type"],
+         c["document_key"], now)
+        for c in chunk
+    ])
+    if renamed:
+        # Orders and receivables keep a copy of the name; refreshed by the name-sync job
+        await enqueue_name_syncs(cursor, PurgeEntity.CLIENT, renamed)
+
+    updated_ids = [c["id"] for c in chunk if c["document_key"] in existing]
+    known_phones, known_addresses, has_primary = {}, {}, set()
+    for row in await existing_contacts(cursor, "client_phones", updated_ids):
+        known_phones.setdefault(row["client_id"], set()).add(phone_key(row["phone"]))
+        if row["is_primary"]:
+            has_primary.add(("phone", row["client_id"]))
+    for row in await existing_contacts(cursor, "client_addresses", updated_ids):
+        known_addresses.setdefault(row["client_id"], set()).add(address_key(row["cep"], row["number"]))
+        if row["is_primary"]:
+            has_primary.add(("address", row["client_id"]))
+
+    phones, addresses = [], []
+    for client in chunk:
+        client_id = client["id"]
+        for key, phone in client["phones"].items():
+            if key in known_phones.get(client_id, ()):
+                continue
+            is_primary = ("phone", client_id) not in has_primary
+            has_primary.add(("phone", client_id))
+            phones.append((str(uuid.uuid4()), client_id, phone, "Celular", is_primary, now))
+        for key, address in client["addresses"].items():
+            if key in known_addresses.get(client_id, ()):
+                continue
+            is_primary = ("address", client_id) not in has_primary
+            has_primary.add(("address", client_id))
+            addresses.append((str(uuid.uuid4()), client_id, address["address_type"], address["cep"],
+                              address["street"], address["number"], address["complement"],
+                              address["neighborhood"], address["city"], address["state"], is_primary, now))
+    if phones:
+        await cursor.executemany(
+            """INSERT INTO client_phones (id, client_id, phone, phone_type, is_primary, created_at)
+               VALUES (%s, %s, %s, %s, %s, %s)""",
+            phones
+        )
+    if addresses:
+        await cursor.executemany(
+            """INSERT INTO client_addresses (id, client_id, address_type, cep, street, number, complement,
+               neighborhood, city, state, is_primary, created_at)
+               VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""",
+            addresses
+        )
+        await locate_client_addresses(cursor, list({address[1] for address in addresses}))
+    counts["phones_added"] = len(phones)
+    counts["addresses_added"] = len(addresses)
+    return counts
+
+async def import_clients(conn, cursor, clients: List[dict], report: ClientImportReport,
+                         update_existing: bool = True, dry_run: bool = False) -> ClientImportReport:
+    """Write validated records CLIENT_IMPORT_CHUNK_SIZE at a time, one transaction per chunk.
+
+    A chunk that fails (a client with the same document created meanwhile)
+    rolls back alone and its rows are reported; earlier chunks stay committed.
+    """
+    now = datetime.now(timezone.utc)
+    for chunk in chunked(clients, CLIENT_IMPORT_CHUNK_SIZE):
+        if dry_run:
+            existing = await existing_clients(cursor, [c["document_key"] for c in chunk], lock=False)
+            report.created += len(chunk) - len(existing)
+            report.updated += len(existing) if update_existing else 0
+            report.skipped += 0 if update_existing else len(existing)
+            continue
+        try:
+            async with transaction(conn):
+                counts = await import_chunk(cursor, chunk, update_existing, now)
+        except aiomysql.IntegrityError as exc:
+            report.failed += len(chunk)
+            report.errors.extend(
+                ClientImportError(row=c["row"], document=c["document"], detail=f"not imported: {exc.args[-1]}")
+                for c in chunk
+            )
+            continue
+        for key, value in counts.items():
+            setattr(report, key, getattr(report, key) + value)
+        remember_addresses(address for client in chunk for address in client["addresses"].values())
+
+    if not dry_run:
+        if report.updated:
+            await invalidate_cached(cursor, "clients")
+        if report.created or report.updated:
+            await touch_tables(cursor, "clients", "client_phones", "client_addresses")
+    report.errors.sort(key=lambda e: e.row)
+    return report
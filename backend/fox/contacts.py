@@ -0,0 +1,87 @@
+from fastapi import HTTPException
+import uuid
+from typing import List
+from datetime import datetime, timezone
+
+from fox.bulk import in_clause
+
+# Client phones and addresses; the unique index on primary_client_id allows at
+# most one primary per client and ensure_primary() keeps it from dropping to zero
+CONTACT_FIELDS = {
+    "client_phones": ("phone", "phone_type"),
+    "client_addresses": ("address_type", "cep", "street", "number", "complement", "neighborhood", "city", "state"),
+}
+CONTACT_NAMES = {"client_phones": "phone", "client_addresses": "address"}
+
+async def lock_client(cursor, client_id: str):
+    """Serialize contact edits of one client behind its row lock; 404 if it does not exist."""
+    await cursor.execute("SELECT id FROM clients WHERE id = %s AND deleted_at IS NULL FOR UPDATE", (client_id,))
+    if not await cursor.fetchone():
+        raise HTTPException(status_code=404, detail="Client not found")
+
+async def demote_primary(cursor, table: str, client_id: str):
+    await cursor.execute(f"UPDATE {table} SET is_primary = FALSE WHERE client_id = %s AND is_primary", (client_id,))
+
+async def ensure_primary(cursor, table: str, client_id: str):
+    # The oldest row takes over when the primary was deleted or unflagged
+    await cursor.execute(
+        f"SELECT id, is_primary FROM {table} WHERE client_id = %s ORDER BY is_primary DESC, created_at, id LIMIT 1",
+        (client_id,)
+    )
+    row = await cursor.fetchone()
+    if row and not row["is_primary"]:
+        await cursor.execute(f"UPDATE {table} SET is_primary = TRUE WHERE id = %s", (row["id"],))
+
+async def replace_contacts(cursor, table: str, client_id: str, entries: List) -> int:
+    """Make ``table`` hold exactly ``entries`` for the client with the fewest statements.
+
+    Runs inside the caller's transaction, after lock_client(). Unchanged rows
+    are not touched; returns the number of rows inserted, updated or deleted.
+    """
+    fields = CONTACT_FIELDS[table]
+    name = CONTACT_NAMES[table]
+    primaries = [entry for entry in entries if entry.is_primary]
+    if len(primaries) > 1:
+        raise HTTPException(status_code=400, detail=f"Only one primary {name} is allowed")
+    primary = primaries[0] if primaries else (entries[0] if entries else None)
+
+    await cursor.execute(
+        f"SELECT id, {', '.join(fields)}, is_primary FROM {table} WHERE client_id = %s", (client_id,)
+    )
+    current = {row["id"]: row for row in await cursor.fetchall()}
+    ids = [entry.id for entry in entries if entry.id]
+    if len(ids) != len(set(ids)):
+        raise HTTPException(status_code=400, detail=f"Repeated {name} id")
+    unknown = [contact_id for contact_id in ids if contact_id not in current]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown {name} id {unknown[0]}")
+
+    deleted = [contact_id for contact_id in current if contact_id not in set(ids)]
+    updates, inserts = [], []
+    now = datetime.now(timezone.utc)
+    for entry in entries:
+        values = tuple(getattr(entry, field) for field in fields) + (entry is primary,)
+        if entry.id is None:
+            inserts.append((str(uuid.uuid4()), client_id, *values, now))
+            continue
+        row = current[entry.id]
+        if values != tuple(row[field] for field in fields) + (bool(row["is_primary"]),):
+            updates.append((*values, entry.id))
+
+    if deleted:
+        await cursor.execute(f"DELETE FROM {table} WHERE client_id = %s AND id IN ({in_clause(deleted)})",
+                             (client_id, *deleted))
+    if updates:
+        # Demotions first, so the new primary never meets the old one in the unique index
+        updates.sort(key=lambda update: update[-2])
+        await cursor.executemany(
+            f"UPDATE {table} SET {', '.join(f'{field} = %s' for field in fields)}, is_primary = %s WHERE id = %s",
+            updates
+        )
+    if inserts:
+        await cursor.executemany(
+            f"""INSERT INTO {table} (id, client_id, {', '.join(fields)}, is_primary, created_at)
+                VALUES ({in_clause(range(len(fields) + 4))})""",
+            inserts
+        )
+    return len(deleted) + len(updates) + len(inserts)
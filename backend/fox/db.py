@@ -0,0 +1,326 @@
+import aiomysql
+import os
+import logging
+import contextvars
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+from datetime import datetime, timezone
+
+# MySQL connection pool
+db_pool = None
+
+DB_POOL_MAX_SIZE = int(os.environ.get('DB_POOL_MAX_SIZE', 10))
+DB_ACQUIRE_TIMEOUT = float(os.environ.get('DB_ACQUIRE_TIMEOUT', 5))
+
+class PoolSaturated(Exception):
+    """No connection became free within the acquire timeout."""
+
+class BoundedPool:
+    """aiomysql pool whose acquire() gives up after ``acquire_timeout`` seconds.
+
+    Raises PoolSaturated instead of queueing forever; AdmissionMiddleware
+    turns that into a 503. Everything else is delegated to the wrapped pool.
+    Connections from a replica pool are tagged, see from_replica().
+    """
+
+    def __init__(self, pool, acquire_timeout: float, replica: bool = False):
+        self._pool = pool
+        self.acquire_timeout = acquire_timeout
+        self.replica = replica
+        self.waiting = 0
+        self.acquired = 0
+        self.timeouts = 0
+
+    def acquire(self):
+        return BoundedAcquire(self)
+
+    def __getattr__(self, name):
+        return getattr(self._pool, name)
+
+    def stats(self) -> dict:
+        return {
+            "size": self._pool.size,
+            "free": self._pool.freesize,
+            "max_size": self._pool.maxsize,
+            "waiting": self.waiting,
+            "acquired": self.acquired,
+            "timeouts": self.timeouts,
+            "acquire_timeout_seconds": self.acquire_timeout,
+        }
+
+class BoundedAcquire:
+    def __init__(self, pool: BoundedPool):
+        self.pool = pool
+        self.conn = None
+
+    async def __aenter__(self):
+        self.pool.waiting += 1
+        try:
+            self.conn = await asyncio.wait_for(self.pool._pool.acquire(), self.pool.acquire_timeout)
+        except asyncio.TimeoutError:
+            self.pool.timeouts += 1
+            raise PoolSaturated()
+        finally:
+            self.pool.waiting -= 1
+        self.pool.acquired += 1
+        self.conn.replica = self.pool.replica
+        return self.conn
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.pool._pool.release(self.conn)
+
+async def get_db():
+    global db_pool
+    if db_pool is None:
+        db_pool = BoundedPool(await aiomysql.create_pool(
+            host=os.environ.get('MYSQL_HOST', 'localhost'),
+            port=int(os.environ.get('MYSQL_PORT', 3306)),
+            user=os.environ.get('MYSQL_USER', 'root'),
+            password=os.environ.get('MYSQL_PASSWORD', ''),
+            db=os.environ.get('MYSQL_DB', 'fox_db'),
+            charset='utf8mb4',
+            autocommit=True,
+            minsize=1,
+            maxsize=DB_POOL_MAX_SIZE
+        ), DB_ACQUIRE_TIMEOUT)
+    return db_pool
+
+# Read replica
+MYSQL_READ_HOST = os.environ.get('MYSQL_READ_HOST')
+REPLICA_MAX_LAG_SECONDS = float(os.environ.get('REPLICA_MAX_LAG_SECONDS', 5))
+REPLICA_CHECK_SECONDS = float(os.environ.get('REPLICA_CHECK_SECONDS', 2))
+# Should exceed REPLICA_MAX_LAG_SECONDS, otherwise a writer can be unpinned
+# before the replica has applied their change
+READ_YOUR_WRITES_SECONDS = float(os.environ.get('READ_YOUR_WRITES_SECONDS', 10))
+# Wall-clock time of the client's last write, echoed back by the client (cookie for
+# browsers, header for API clients) so any worker can honor read-your-writes
+LAST_WRITE_COOKIE = "fox_last_write"
+LAST_WRITE_HEADER = "x-last-write"
+
+read_pool = None
+
+class ReplicaRouter:
+    """Decides, per read, whether the replica may serve it.
+
+    The replica is only used after a lag check has passed; any failed or
+    stale check sends reads back to the primary until the next good one.
+    Users who just wrote are pinned to the primary for READ_YOUR_WRITES_SECONDS
+    so they see their own changes. The in-worker pin covers clients that drop
+    cookies; the last-write time the client sends back covers follow-up reads
+    landing on another worker.
+    """
+
+    def __init__(self, max_lag: float, pin_seconds: float):
+        self.max_lag = max_lag
+        self.pin_seconds = pin_seconds
+        self.healthy = False
+        self.lag = None
+        self.last_error = None
+        self.checked_at = 0.0
+        self._pinned = {}
+        self.reads = {"replica": 0, "primary_pinned": 0, "primary_unhealthy": 0}
+
+    def note_write(self, user: Optional[str]):
+        if user:
+            self._pinned[user] = time.monotonic() + self.pin_seconds
+
+    def choose(self, user: Optional[str], last_write: Optional[float] = None) -> str:
+        now = time.monotonic()
+        if not self.healthy or now - self.checked_at > self.max_lag + REPLICA_CHECK_SECONDS * 2:
+            # No recent verdict (monitor stalled or never ran) counts as unhealthy
+            self.reads["primary_unhealthy"] += 1
+            return "primary"
+        if last_write is not None and 0 <= time.time() - last_write < self.pin_seconds:
+            self.reads["primary_pinned"] += 1
+            return "primary"
+        pinned_until = self._pinned.get(user) if user else None
+        if pinned_until is not None:
+            if pinned_until > now:
+                self.reads["primary_pinned"] += 1
+                return "primary"
+            del self._pinned[user]
+        self.reads["replica"] += 1
+        return "replica"
+
+    def record_check(self, lag: Optional[float], error: Optional[str] = None):
+        self.lag = lag
+        self.last_error = error
+        self.checked_at = time.monotonic()
+        self.healthy = error is None and lag is not None and lag <= self.max_lag
+        now = self.checked_at
+        for user in [u for u, until in self._pinned.items() if until <= now]:
+            del self._pinned[user]
+
+    def stats(self) -> dict:
+        return {
+            "configured": bool(MYSQL_READ_HOST),
+            "healthy": self.healthy,
+            "lag_seconds": self.lag,
+            "max_lag_seconds": self.max_lag,
+            "last_error": self.last_error,
+            "pinned_users": len(self._pinned),
+            "reads": dict(self.reads),
+        }
+
+replica_router = ReplicaRouter(REPLICA_MAX_LAG_SECONDS, READ_YOUR_WRITES_SECONDS)
+
+async def get_read_pool():
+    global read_pool
+    if read_pool is None:
+        read_pool = BoundedPool(await aiomysql.create_pool(
+            host=MYSQL_READ_HOST,
+            port=int(os.environ.get('MYSQL_READ_PORT', os.environ.get('MYSQL_PORT', 3306))),
+            user=os.environ.get('MYSQL_READ_USER', os.environ.get('MYSQL_USER', 'root')),
+            password=os.environ.get('MYSQL_READ_PASSWORD', os.environ.get('MYSQL_PASSWORD', '')),
+            db=os.environ.get('MYSQL_DB', 'fox_db'),
+            charset='utf8mb4',
+            autocommit=True,
+            minsize=1,
+            maxsize=int(os.environ.get('DB_READ_POOL_MAX_SIZE', DB_POOL_MAX_SIZE))
+        ), DB_ACQUIRE_TIMEOUT, replica=True)
+    return read_pool
+
+def from_replica(cursor) -> bool:
+    """Whether ``cursor`` reads from the replica, which may lag behind the primary."""
+    return getattr(cursor.connection, "replica", False)
+
+def read_pool_stats() -> Optional[dict]:
+    return read_pool.stats() if read_pool is not None else None
+
+async def get_read_db():
+    """Pool for read-only routes: the replica when it is safe to use, else the primary."""
+    if not MYSQL_READ_HOST:
+        return await get_db()
+    trace = request_trace.get()
+    target = (replica_router.choose(trace.user, trace.last_write) if trace is not None
+              else replica_router.choose(None))
+    if trace is not None:
+        trace.db_target = target
+    if target == "replica":
+        return await get_read_pool()
+    return await get_db()
+
+def note_write(user: Optional[str]):
+    replica_router.note_write(user)
+
+async def check_replica_lag():
+    """Refresh the replica verdict; run periodically by every worker."""
+    try:
+        pool = await get_read_pool()
+        async with pool.acquire() as conn:
+            async with conn.cursor(TracedDictCursor) as cursor:
+                try:
+                    await cursor.execute("SHOW REPLICA STATUS")
+                except aiomysql.ProgrammingError:
+                    # MySQL < 8.0.22 and MariaDB < 10.5
+                    await cursor.execute("SHOW SLAVE STATUS")
+                status = await cursor.fetchone()
+    except Exception as exc:
+        replica_router.record_check(None, f"{type(exc).__name__}: {exc}")
+        return
+    if status is None:
+        replica_router.record_check(None, "Not configured as a replica")
+        return
+    lag = status.get("Seconds_Behind_Source", status.get("Seconds_Behind_Master"))
+    # NULL lag means the SQL or IO thread is stopped
+    replica_router.record_check(lag, None if lag is not None else "Replication is not running")
+
+async def close_db():
+    global db_pool, read_pool
+    if db_pool:
+        db_pool.close()
+        await db_pool.wait_closed()
+        db_pool = None
+    if read_pool:
+        read_pool.close()
+        await read_pool.wait_closed()
+        read_pool = None
+
+# Request tracing
+SQL_TRACE_FILE = os.environ.get('SQL_TRACE_FILE')
+SQL_TRACE_SAMPLE_RATE = float(os.environ.get('SQL_TRACE_SAMPLE_RATE', 0.01))
+SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', 500))
+
+class RequestTrace:
+    """Per-request state read by log records and SQL spans."""
+    __slots__ = ("request_id", "scope", "user", "db_time", "statements", "sampled", "started", "statement_log",
+                 "db_target", "last_write", "wrote")
+
+    def __init__(self, request_id: str, scope: dict, sampled: bool):
+        self.request_id = request_id
+        self.scope = scope
+        self.user = None
+        self.db_time = 0.0
+        self.statements = 0
+        self.sampled = sampled
+        self.started = time.perf_counter()
+        # Only set while an admin profiles the request
+        self.statement_log = None
+        # "replica" or "primary" once a read route picked a pool
+        self.db_target = None
+        # Last-write time the client sent back, and whether this request writes
+        self.last_write = None
+        self.wrote = False
+
+    @property
+    def route(self) -> str:
+        # Filled in by the router once the request has been matched
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or self.scope.get("path")
+
+request_trace = contextvars.ContextVar("request_trace", default=None)
+span_logger = logging.getLogger("fox.sql_spans")
+span_logger.propagate = False
+
+class TracedDictCursor(aiomysql.DictCursor):
+    """DictCursor that charges each round trip to the current request.
+
+    executemany goes through execute for every batch it sends, so counts
+    match what actually hits the server. Outside a request (background jobs)
+    it behaves exactly like DictCursor.
+    """
+
+    async def execute(self, query, args=None):
+        trace = request_trace.get()
+        if trace is None:
+            return await super().execute(query, args)
+        started = time.perf_counter()
+        try:
+            return await super().execute(query, args)
+        finally:
+            elapsed = time.perf_counter() - started
+            trace.db_time += elapsed
+            trace.statements += 1
+            exported = SQL_TRACE_FILE and (trace.sampled or elapsed * 1000 >= SLOW_QUERY_MS)
+            if exported or trace.statement_log is not None:
+                span = {
+                    "offset_ms": round((started - trace.started) * 1000, 3),
+                    "duration_ms": round(elapsed * 1000, 3),
+                    "rows": self.rowcount,
+                    "statement": " ".join(query.split())[:500],
+                }
+                if trace.statement_log is not None:
+                    trace.statement_log.append({**span, "args": repr(args)[:500] if args else None})
+                if exported:
+                    span_logger.info("sql", extra={"fields": {
+                        "request_id": trace.request_id, "route": trace.route, **span
+                    }})
+
+def to_naive_utc(value: datetime) -> datetime:
+    # MySQL DATETIME columns come back naive and are written in UTC
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+@asynccontextmanager
+async def transaction(conn):
+    await conn.begin()
+    try:
+        yield
+    except BaseException:
+        await conn.rollback()
+        raise
+    else:
+        await conn.commit()
@@ -0,0 +1,248 @@
+from fastapi import HTTPException
+import os
+import asyncio
+import csv
+import io
+import math
+import re
+from typing import List, Optional, Tuple
+from datetime import datetime, timezone
+
+from fox.bulk import chunked, in_clause
+from fox.cache import invalidate_cached, touch_tables
+from fox.models import GeoCentroidLoadResult
+
+# Coordinates from CEP centroids and the dumpster position grid
+GEO_CELL_DEGREES = float(os.environ.get('GEO_CELL_DEGREES', 0.05))  # ~5.5 km of latitude
+GEO_MAX_RADIUS_KM = float(os.environ.get('GEO_MAX_RADIUS_KM', 200))
+GEO_CENTROIDS_MAX_BYTES = int(os.environ.get('GEO_CENTROIDS_MAX_BYTES', 50 * 1024 * 1024))
+GEO_CENTROIDS_CHUNK_SIZE = int(os.environ.get('GEO_CENTROIDS_CHUNK_SIZE', 1000))
+# Where available dumpsters without a position are (the yard); unset = they are not located
+DEPOT_LATITUDE = os.environ.get('DEPOT_LATITUDE')
+DEPOT_LONGITUDE = os.environ.get('DEPOT_LONGITUDE')
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+CEP_IN_TEXT = re.compile(r"(?<!\d)(\d{5})-?(\d{3})(?!\d)")
+
+# LEFT JOIN: an address whose new CEP has no centroid loses its old coordinates
+LOCATE_ADDRESSES_SQL = """
+    UPDATE client_addresses a
+    LEFT JOIN cep_centroids c ON c.cep = REPLACE(a.cep, '-', '')
+    SET a.latitude = c.latitude, a.longitude = c.longitude
+"""
+# Rented dumpsters placed before coordinates existed: position of their latest placement,
+# from the chosen client address or a CEP written in the free-text delivery address
+LOCATE_RENTED_DUMPSTERS_SQL = """
+    UPDATE dumpsters d
+    JOIN orders o ON o.id = (
+        SELECT o2.id FROM orders o2
+        WHERE o2.dumpster_id = d.id AND o2.order_type = 'placement'
+        ORDER BY o2.created_at DESC LIMIT 1
+    )
+    LEFT JOIN client_addresses a ON a.id = o.delivery_address_id AND a.latitude IS NOT NULL
+    LEFT JOIN cep_centroids c
+        ON c.cep = REPLACE(REGEXP_SUBSTR(o.delivery_address, '[0-9]{5}-?[0-9]{3}'), '-', '')
+    SET d.latitude = COALESCE(a.latitude, c.latitude), d.longitude = COALESCE(a.longitude, c.longitude)
+    WHERE d.status = 'rented' AND d.latitude IS NULL AND d.deleted_at IS NULL
+"""
+
+def distance_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    # Haversine; plenty for city-scale distances
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi, dlambda = phi2 - phi1, math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+def depot_position() -> Optional[Tuple[float, float]]:
+    if DEPOT_LATITUDE and DEPOT_LONGITUDE:
+        return float(DEPOT_LATITUDE), float(DEPOT_LONGITUDE)
+    return None
+
+async def centroid(cursor, cep: str) -> Optional[Tuple[float, float]]:
+    await cursor.execute("SELECT latitude, longitude FROM cep_centroids WHERE cep = %s",
+                         (re.sub(r"\D", "", cep or ""),))
+    row = await cursor.fetchone()
+    return (float(row["latitude"]), float(row["longitude"])) if row else None
+
+async def text_position(cursor, text: Optional[str]) -> Optional[Tuple[float, float]]:
+    """Centroid of the last CEP written in a free-text address, if any."""
+    found = CEP_IN_TEXT.findall(text or "")
+    if not found:
+        return None
+    return await centroid(cursor, "".join(found[-1]))
+
+async def address_position(cursor, address_id: str, client_id: Optional[str] = None) -> Optional[Tuple[float, float]]:
+    condition, params = "id = %s", [address_id]
+    if client_id:
+        condition += " AND client_id = %s"
+        params.append(client_id)
+    await cursor.execute(f"SELECT latitude, longitude FROM client_addresses WHERE {condition}", params)
+    row = await cursor.fetchone()
+    if not row or row["latitude"] is None:
+        return None
+    return float(row["latitude"]), float(row["longitude"])
+
+async def locate_client_addresses(cursor, client_ids: Optional[List[str]] = None) -> int:
+    """Copy CEP centroids onto the given clients' addresses (every address when None)."""
+    if client_ids is None:
+        await cursor.execute(LOCATE_ADDRESSES_SQL)
+        return cursor.rowcount
+    located = 0
+    for chunk in chunked(client_ids, GEO_CENTROIDS_CHUNK_SIZE):
+        await cursor.execute(f"{LOCATE_ADDRESSES_SQL} WHERE a.client_id IN ({in_clause(chunk)})", chunk)
+        located += cursor.rowcount
+    return located
+
+async def origin_position(cursor, latitude: Optional[float], longitude: Optional[float], cep: Optional[str],
+                          address_id: Optional[str]) -> Tuple[float, float]:
+    """Query origin from explicit coordinates, a CEP centroid or a client address."""
+    if latitude is not None and longitude is not None:
+        return latitude, longitude
+    if cep:
+        position = await centroid(cursor, cep)
+        if position is None:
+            raise HTTPException(status_code=404, detail="No coordinates for this CEP")
+        return position
+    if address_id:
+        position = await address_position(cursor, address_id)
+        if position is None:
+            raise HTTPException(status_code=404, detail="No coordinates for this address")
+        return position
+    raise HTTPException(status_code=400, detail="Provide latitude and longitude, cep or address_id")
+
+def parse_centroids(text: str) -> List[tuple]:
+    """cep;latitude;longitude lines (a header line is skipped); bad lines raise 400."""
+    sample = text[:4096]
+    delimiter = ";" if sample.count(";") >= sample.count(",") else ","
+    rows, now = [], datetime.now(timezone.utc)
+    for line_number, row in enumerate(csv.reader(io.StringIO(text), delimiter=delimiter), start=1):
+        if not row or not any(cell.strip() for cell in row):
+            continue
+        cep = re.sub(r"\D", "", row[0])
+        if line_number == 1 and len(cep) != 8:
+            continue
+        try:
+            latitude, longitude = float(row[1].replace(",", ".")), float(row[2].replace(",", "."))
+        except (ValueError, IndexError):
+            raise HTTPException(status_code=400, detail=f"Invalid centroid line {line_number}")
+        if len(cep) != 8 or not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise HTTPException(status_code=400, detail=f"Invalid centroid line {line_number}")
+        rows.append((cep, latitude, longitude, now))
+    return rows
+
+async def store_centroids(cursor, rows: List[tuple]) -> GeoCentroidLoadResult:
+    """Upsert centroids in chunks, then locate every address and the rented dumpsters still without a position."""
+    for chunk in chunked(rows, GEO_CENTROIDS_CHUNK_SIZE):
+        await cursor.executemany(
+            """INSERT INTO cep_centroids (cep, latitude, longitude, updated_at) VALUES (%s, %s, %s, %s)
+               ON DUPLICATE KEY UPDATE latitude = VALUES(latitude), longitude = VALUES(longitude),
+                                       updated_at = VALUES(updated_at)""",
+            chunk
+        )
+    addresses = await locate_client_addresses(cursor)
+    await cursor.execute(LOCATE_RENTED_DUMPSTERS_SQL)
+    dumpsters = cursor.rowcount
+    if dumpsters:
+        await invalidate_cached(cursor, "dumpsters")
+    await touch_tables(cursor, "client_addresses", "dumpsters")
+    return GeoCentroidLoadResult(centroids=len(rows), addresses_located=addresses, dumpsters_located=dumpsters)
+
+class DumpsterGrid:
+    """Per-worker grid of dumpster positions for radius and k-nearest queries.
+
+    Positions are bucketed into GEO_CELL_DEGREES square cells; a query only
+    visits the cells around the origin. The grid is rebuilt from MySQL
+    whenever the dumpsters table version moved, checked on every query with
+    one primary-key read, so answers are as fresh as the table.
+    """
+
+    def __init__(self, cell_degrees: float):
+        self.cell_degrees = cell_degrees
+        self.cells = {}
+        self.version = None
+        self.built_at = None
+        self._lock = asyncio.Lock()
+
+    def cell(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        return math.floor(latitude / self.cell_degrees), math.floor(longitude / self.cell_degrees)
+
+    def build(self, rows: List[dict]):
+        depot = depot_position()
+        cells = {}
+        for row in rows:
+            if row["latitude"] is not None:
+                position = float(row["latitude"]), float(row["longitude"])
+            elif depot and row["status"] == "available":
+                position = depot
+            else:
+                continue
+            entry = dict(row, latitude=position[0], longitude=position[1])
+            cells.setdefault(self.cell(*position), []).append(entry)
+        self.cells = cells
+        self.built_at = datetime.now(timezone.utc)
+
+    async def refresh(self, cursor):
+        await cursor.execute("SELECT version FROM table_versions WHERE table_name = 'dumpsters'")
+        row = await cursor.fetchone()
+        version = row["version"] if row else 0
+        if version == self.version:
+            return
+        async with self._lock:
+            if version == self.version:
+                return
+            await cursor.execute(
+                """SELECT id, identifier, size, capacity, status, current_location, latitude, longitude
+                   FROM dumpsters WHERE deleted_at IS NULL"""
+            )
+            self.build(await cursor.fetchall())
+            self.version = version
+
+    def _ring(self, center: Tuple[int, int], radius: int):
+        # Cells at Chebyshev distance exactly ``radius`` from the center cell
+        ci, cj = center
+        for i in range(ci - radius, ci + radius + 1):
+            for j in range(cj - radius, cj + radius + 1):
+                if max(abs(i - ci), abs(j - cj)) == radius:
+                    yield self.cells.get((i, j), ())
+
+    def _ring_reach_km(self, latitude: float, radius: int) -> float:
+        # Every point closer than this is inside rings 0..radius (a cell is narrower in longitude)
+        width = self.cell_degrees * KM_PER_DEGREE * max(math.cos(math.radians(latitude)), 0.01)
+        return radius * min(width, self.cell_degrees * KM_PER_DEGREE)
+
+    def within(self, latitude: float, longitude: float, radius_km: float, statuses=None) -> List[dict]:
+        center = self.cell(latitude, longitude)
+        found, ring = [], 0
+        while ring == 0 or self._ring_reach_km(latitude, ring - 1) <= radius_km:
+            for entries in self._ring(center, ring):
+                for entry in entries:
+                    if statuses and entry["status"] not in statuses:
+                        continue
+                    distance = distance_km(latitude, longitude, entry["latitude"], entry["longitude"])
+                    if distance <= radius_km:
+                        found.append(dict(entry, distance_km=round(distance, 3)))
+            ring += 1
+        found.sort(key=lambda entry: entry["distance_km"])
+        return found
+
+    def nearest(self, latitude: float, longitude: float, k: int, statuses=None,
+                max_km: float = GEO_MAX_RADIUS_KM) -> List[dict]:
+        """Expand ring by ring until the k-th candidate is closer than any unvisited cell."""
+        center = self.cell(latitude, longitude)
+        found, ring = [], 0
+        while True:
+            for entries in self._ring(center, ring):
+                for entry in entries:
+                    if statuses and entry["status"] not in statuses:
+                        continue
+                    distance = distance_km(latitude, longitude, entry["latitude"], entry["longitude"])
+                    if distance <= max_km:
+                        found.append(dict(entry, distance_km=round(distance, 3)))
+            reach = self._ring_reach_km(latitude, ring)
+            found.sort(key=lambda entry: entry["distance_km"])
+            if (len(found) >= k and found[k - 1]["distance_km"] <= reach) or reach >= max_km:
+                return found[:k]
+            ring += 1
+
+dumpster_grid = DumpsterGrid(GEO_CELL_DEGREES)
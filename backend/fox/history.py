@@ -0,0 +1,31 @@
+from typing import Optional
+from datetime import datetime, timezone
+from enum import Enum
+
+from fox.models import HistoryEntity
+
+async def record_status_change(cursor, entity_type: HistoryEntity, entity_id: str, old_status: Optional[str],
+                               new_status: str, changed_by: Optional[str] = None,
+                               location: Optional[str] = None, reference_id: Optional[str] = None):
+    await record_status_changes(cursor, entity_type, [(entity_id, old_status, new_status, location, reference_id)],
+                                changed_by)
+
+async def record_status_changes(cursor, entity_type: HistoryEntity, changes, changed_by: Optional[str] = None):
+    # Append-only: rows are never updated, so the past state can be read back.
+    # ``changes`` holds (entity_id, old_status, new_status, location, reference_id) tuples.
+    if not changes:
+        return
+    now = datetime.now(timezone.utc)
+    rows = []
+    for entity_id, old_status, new_status, location, reference_id in changes:
+        if isinstance(old_status, Enum):
+            old_status = old_status.value
+        if isinstance(new_status, Enum):
+            new_status = new_status.value
+        rows.append((entity_type.value, entity_id, old_status, new_status, location, reference_id, changed_by, now))
+    await cursor.executemany(
+        """INSERT INTO status_history (entity_type, entity_id, old_status, new_status, location,
+           reference_id, changed_by, changed_at)
+           VALUES (%s, %s, %s, %s, %s, %s, %s, %s)""",
+        rows
+    )
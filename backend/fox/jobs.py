@@ -0,0 +1,60 @@
+import os
+import asyncio
+import logging
+
+from fox.db import TracedDictCursor, get_db
+
+logger = logging.getLogger(__name__)
+
+# Background jobs
+# An exclusive job holds two pooled connections (its GET_LOCK one and its own), so
+# only a few of them run at once and their first runs are spread out after startup;
+# per-worker jobs are short single-connection probes and are not held back
+JOB_MAX_CONCURRENT = int(os.environ.get('JOB_MAX_CONCURRENT', 2))
+JOB_START_STAGGER_SECONDS = float(os.environ.get('JOB_START_STAGGER_SECONDS', 5))
+
+background_tasks = []
+exclusive_jobs = []
+job_slots = asyncio.Semaphore(JOB_MAX_CONCURRENT)
+
+async def run_with_lock(lock_name: str, job, timeout: float):
+    """Run ``job`` only if this process wins the named MySQL lock.
+
+    GET_LOCK is held by one pooled connection for the duration of the job, so
+    with several uvicorn workers exactly one of them does the work. Returns
+    None when another worker holds the lock.
+    """
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            await cursor.execute("SELECT GET_LOCK(%s, 0) AS acquired", (lock_name,))
+            row = await cursor.fetchone()
+            if not row or not row["acquired"]:
+                return None
+            try:
+                return await asyncio.wait_for(job(), timeout)
+            finally:
+                await cursor.execute("SELECT RELEASE_LOCK(%s)", (lock_name,))
+
+async def periodic_worker(name: str, interval: float, job, timeout: float, exclusive: bool, delay: float):
+    await asyncio.sleep(delay)
+    while True:
+        try:
+            if exclusive:
+                async with job_slots:
+                    await run_with_lock(f"fox:{name}", job, timeout)
+            else:
+                await asyncio.wait_for(job(), timeout)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Background job %s failed", name)
+        await asyncio.sleep(interval)
+
+def start_background_job(name: str, interval: float, job, timeout: float, exclusive: bool = True):
+    # exclusive=False runs the job in every worker, for per-process state
+    delay = 0.0
+    if exclusive:
+        delay = len(exclusive_jobs) * JOB_START_STAGGER_SECONDS
+        exclusive_jobs.append(name)
+    background_tasks.append(asyncio.create_task(periodic_worker(name, interval, job, timeout, exclusive, delay)))
@@ -0,0 +1,102 @@
+import os
+import logging
+import logging.handlers
+import copy
+import json
+import queue
+import atexit
+from datetime import datetime, timezone
+
+from fox.db import SQL_TRACE_FILE, request_trace, span_logger
+
+# Logging
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+LOG_FORMAT = os.environ.get('LOG_FORMAT', 'json')  # json | text
+log_listeners = []
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in ("request_id", "route", "user", "db_time_ms", "statements"):
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        entry.update(getattr(record, "fields", None) or {})
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+class RequestContextFilter(logging.Filter):
+    # Runs in the emitting task, before the record crosses over to the listener thread
+    def filter(self, record):
+        trace = request_trace.get()
+        if trace is not None:
+            record.request_id = trace.request_id
+            record.route = trace.route
+            record.user = trace.user
+            record.db_time_ms = round(trace.db_time * 1000, 3)
+            record.statements = trace.statements
+        return True
+
+class TracebackQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that keeps the traceback out of the message.
+
+    The stock prepare() formats the traceback into msg and drops exc_info, so
+    the listener's formatter never sees the exception. Here it is rendered in
+    the emitting thread into exc_text, which both formatters pick up.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+def configure_logging():
+    """Route all logging through queues so the event loop never blocks on I/O.
+
+    Handlers only enqueue records; listener threads do the formatting and
+    writing. SQL spans get their own queue and file when SQL_TRACE_FILE is set.
+    """
+    if log_listeners:
+        return
+    stream_handler = logging.StreamHandler()
+    if LOG_FORMAT == "json":
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    log_queue = queue.SimpleQueue()
+    queue_handler = TracebackQueueHandler(log_queue)
+    queue_handler.addFilter(RequestContextFilter())
+    root = logging.getLogger()
+    root.setLevel(LOG_LEVEL)
+    root.addHandler(queue_handler)
+    log_listeners.append(logging.handlers.QueueListener(log_queue, stream_handler))
+
+    if SQL_TRACE_FILE:
+        file_handler = logging.FileHandler(SQL_TRACE_FILE)
+        file_handler.setFormatter(JsonFormatter())
+        span_queue = queue.SimpleQueue()
+        span_logger.addHandler(TracebackQueueHandler(span_queue))
+        span_logger.setLevel(logging.INFO)
+        log_listeners.append(logging.handlers.QueueListener(span_queue, file_handler))
+
+    for listener in log_listeners:
+        listener.start()
+    atexit.register(stop_logging)
+
+def stop_logging():
+    # Drains whatever is still queued
+    while log_listeners:
+        log_listeners.pop().stop()
@@ -0,0 +1,154 @@
+from fastapi.responses import JSONResponse
+import os
+import asyncio
+import re
+
+from fox.db import DB_POOL_MAX_SIZE, PoolSaturated
+
+# Admission control
+ADMISSION_RETRY_AFTER = int(os.environ.get('ADMISSION_RETRY_AFTER', 2))
+# Connections the default and bulk lanes can never reach; kept free for critical work
+ADMISSION_CRITICAL_RESERVE = int(os.environ.get('ADMISSION_CRITICAL_RESERVE', max(DB_POOL_MAX_SIZE // 4, 1)))
+
+class Lane:
+    """Concurrency limit with a bounded, time-limited wait queue."""
+
+    def __init__(self, name: str, concurrency: int, max_queue: int, queue_timeout: float):
+        self.name = name
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+
+    @classmethod
+    def from_env(cls, name: str, concurrency: int, max_queue: int, queue_timeout: float):
+        prefix = f"LANE_{name.upper()}_"
+        return cls(
+            name,
+            int(os.environ.get(prefix + "CONCURRENCY", concurrency)),
+            int(os.environ.get(prefix + "QUEUE", max_queue)),
+            float(os.environ.get(prefix + "TIMEOUT", queue_timeout)),
+        )
+
+    async def enter(self) -> bool:
+        if not self.semaphore.locked():
+            # A slot is free: acquire() returns without suspending
+            await self.semaphore.acquire()
+        elif self.waiting >= self.max_queue:
+            self.rejected += 1
+            return False
+        else:
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self.semaphore.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                return False
+            finally:
+                self.waiting -= 1
+        self.active += 1
+        self.admitted += 1
+        return True
+
+    def leave(self):
+        self.active -= 1
+        self.semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "concurrency": self.concurrency,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
+
+# Lanes are sized from the connection pool, one connection per admitted request.
+# Critical work may use the whole pool and waits longest; default and bulk together
+# stay ADMISSION_CRITICAL_RESERVE below it, so a critical request always finds a
+# free connection instead of queueing behind reports in the pool.
+BULK_LANE_SIZE = max(DB_POOL_MAX_SIZE // 4, 1)
+ADMISSION_LANES = {
+    "critical": Lane.from_env("critical", DB_POOL_MAX_SIZE, 200, 10),
+    "default": Lane.from_env("default", max(DB_POOL_MAX_SIZE - ADMISSION_CRITICAL_RESERVE - BULK_LANE_SIZE, 1),
+                             100, 5),
+    "bulk": Lane.from_env("bulk", BULK_LANE_SIZE, 10, 2),
+}
+
+# (method, path pattern, lane, per-route concurrency limit or None); first match wins
+ADMISSION_ROUTES = [
+    ("POST", r"^/api/auth/(login|register)$", "critical", None),
+    ("POST", r"^/api/orders$", "critical", None),
+    ("PATCH", r"^/api/orders/[^/]+/status$", "critical", None),
+    ("PATCH", r"^/api/finance/accounts-(receivable|payable)/[^/]+/(receive|pay)$", "critical", None),
+    ("POST", r"^/api/finance/reconciliation$", "bulk", 1),
+    ("POST", r"/bulk-[a-z]+$", "bulk", 2),
+    ("GET", r"^/api/analytics/", "bulk", 2),
+    ("GET", r"^/api/history/", "bulk", None),
+    ("GET", r"^/api/dashboard/", "bulk", None),
+    ("GET", r"^/api/clients/[^/]+/financial-summary$", "bulk", None),
+    ("POST", r"^/api/maintenance/scheduler/run$", "bulk", 1),
+]
+ADMISSION_ROUTE_RULES = [
+    (method, re.compile(pattern), lane, Lane(f"{method} {pattern}", limit, 0, 0) if limit else None)
+    for method, pattern, lane, limit in ADMISSION_ROUTES
+]
+
+def admission_lanes(method: str, path: str):
+    for rule_method, pattern, lane, route_lane in ADMISSION_ROUTE_RULES:
+        if method == rule_method and pattern.search(path):
+            return ADMISSION_LANES[lane], route_lane
+    return ADMISSION_LANES["default"], None
+
+class AdmissionMiddleware:
+    """Admit requests through their lane (and route limit) or fail fast with 503.
+
+    Also turns PoolSaturated raised anywhere below into a 503, so a slow
+    database sheds load instead of building an unbounded backlog.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def reject(self, scope, receive, send, detail: str):
+        response = JSONResponse(status_code=503, content={"detail": detail},
+                                headers={"Retry-After": str(ADMISSION_RETRY_AFTER)})
+        await response(scope, receive, send)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith("/api/"):
+            await self.app(scope, receive, send)
+            return
+        lane, route_lane = admission_lanes(scope["method"], scope["path"])
+        if not await lane.enter():
+            await self.reject(scope, receive, send, "Server busy, retry later")
+            return
+        # Route limits have no queue: reject rather than wait behind a long report
+        if route_lane is not None and not await route_lane.enter():
+            lane.leave()
+            await self.reject(scope, receive, send, "Too many concurrent requests for this route")
+            return
+
+        response_started = False
+
+        async def send_tracking(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_tracking)
+        except PoolSaturated:
+            if response_started:
+                raise
+            await self.reject(scope, receive, send, "Database busy, retry later")
+        finally:
+            if route_lane is not None:
+                route_lane.leave()
+            lane.leave()
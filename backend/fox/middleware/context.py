@@ -0,0 +1,64 @@
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import cookie_parser
+from typing import Optional
+import random
+import uuid
+import logging
+import time
+
+from fox.db import (LAST_WRITE_COOKIE, LAST_WRITE_HEADER, READ_YOUR_WRITES_SECONDS, RequestTrace, SQL_TRACE_FILE,
+                    SQL_TRACE_SAMPLE_RATE, request_trace)
+
+access_logger = logging.getLogger("fox.access")
+
+def client_last_write(headers: Headers) -> Optional[float]:
+    value = headers.get(LAST_WRITE_HEADER) or cookie_parser(headers.get("cookie", "")).get(LAST_WRITE_COOKIE)
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+class RequestContextMiddleware:
+    """Assign a request id, expose it to logs and SQL spans, and write one access line."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_headers = Headers(scope=scope)
+        request_id = request_headers.get("x-request-id") or uuid.uuid4().hex
+        sampled = bool(SQL_TRACE_FILE) and random.random() < SQL_TRACE_SAMPLE_RATE
+        trace = RequestTrace(request_id[:64], scope, sampled)
+        trace.last_write = client_last_write(request_headers)
+        token = request_trace.set(trace)
+        status_code = 500
+
+        async def send_with_request_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(raw=list(message["headers"]))
+                headers["X-Request-ID"] = trace.request_id
+                if trace.wrote and status_code < 400:
+                    # Read-your-writes across workers: the client sends this back on its next reads
+                    written_at = f"{time.time():.3f}"
+                    headers["X-Last-Write"] = written_at
+                    headers.append("Set-Cookie", f"{LAST_WRITE_COOKIE}={written_at}; Max-Age="
+                                                 f"{int(READ_YOUR_WRITES_SECONDS) + 1}; Path=/; HttpOnly; SameSite=Lax")
+                message = {**message, "headers": headers.raw}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            access_logger.info("%s %s %s", scope["method"], scope["path"], status_code, extra={"fields": {
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": status_code,
+                "duration_ms": round((time.perf_counter() - trace.started) * 1000, 3),
+                "db": trace.db_target,
+            }})
+            request_trace.reset(token)
@@ -0,0 +1,179 @@
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
+import os
+from datetime import datetime, timezone, timedelta
+import re
+import hashlib
+import zlib
+
+from fox.cache import EntityCache
+from fox.db import TracedDictCursor, get_db
+from fox.security import token_subject
+
+# Idempotency keys
+IDEMPOTENCY_TTL_SECONDS = int(os.environ.get('IDEMPOTENCY_TTL_SECONDS', 86400))
+# A claim with no stored response after this long is taken to belong to a dead worker
+IDEMPOTENCY_LEASE_SECONDS = int(os.environ.get('IDEMPOTENCY_LEASE_SECONDS', 60))
+IDEMPOTENT_ROUTES = (
+    ("POST", re.compile(r"^/api/orders$")),
+    ("PATCH", re.compile(r"^/api/finance/accounts-receivable/[^/]+/receive$")),
+    ("PATCH", re.compile(r"^/api/finance/accounts-payable/[^/]+/pay$")),
+)
+
+# Replays served from here never touch the database
+idempotency_cache = EntityCache(
+    max_entries=int(os.environ.get('IDEMPOTENCY_CACHE_MAX_ENTRIES', 10000)),
+    ttl_seconds=min(IDEMPOTENCY_TTL_SECONDS, 3600)
+)
+
+async def prune_idempotency_keys():
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            await cursor.execute("DELETE FROM idempotency_keys WHERE expires_at < %s LIMIT 5000",
+                                 (datetime.now(timezone.utc),))
+
+class IdempotencyMiddleware:
+    """Honour ``Idempotency-Key`` on the write routes listed in IDEMPOTENT_ROUTES.
+
+    The first request claims the key with INSERT IGNORE and stores its
+    response; retries with the same key and payload get that response back
+    without the route running again. A retry that arrives while the first
+    request is still running gets 409, unless its claim is older than
+    IDEMPOTENCY_LEASE_SECONDS, in which case the retry takes it over. A
+    different payload under the same key gets 422. 5xx responses are not
+    stored so the client can retry.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def send_stored(self, send, status_code: int, content_type: str, body: bytes):
+        await send({
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [(b"content-type", content_type.encode()), (b"content-length", str(len(body)).encode()),
+                        (b"idempotent-replayed", b"true")],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def send_error(self, scope, receive, send, status_code: int, detail: str):
+        await JSONResponse(status_code=status_code, content={"detail": detail})(scope, receive, send)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        idempotency_key = headers.get("idempotency-key")
+        if not idempotency_key or not any(scope["method"] == method and pattern.match(scope["path"])
+                                          for method, pattern in IDEMPOTENT_ROUTES):
+            await self.app(scope, receive, send)
+            return
+        if len(idempotency_key) > 255:
+            await self.send_error(scope, receive, send, 400, "Idempotency-Key too long")
+            return
+
+        # Keys are scoped to the caller and the route; the token subject survives a token refresh
+        key_hash = hashlib.sha256("\n".join((
+            token_subject(scope) or headers.get("authorization", ""), scope["method"], scope["path"], idempotency_key
+        )).encode()).digest()
+        chunks = []
+        while True:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body"):
+                break
+        body = b"".join(chunks)
+        request_hash = hashlib.sha256(body).digest()
+
+        cached = idempotency_cache.get("idempotency", key_hash)
+        if cached:
+            if cached["request_hash"] != request_hash:
+                await self.send_error(scope, receive, send, 422, "Idempotency-Key reused with a different request")
+                return
+            await self.send_stored(send, cached["status_code"], cached["content_type"], cached["body"])
+            return
+
+        now = datetime.now(timezone.utc)
+        pool = await get_db()
+        async with pool.acquire() as conn:
+            async with conn.cursor(TracedDictCursor) as cursor:
+                await cursor.execute("DELETE FROM idempotency_keys WHERE key_hash = %s AND expires_at < %s",
+                                     (key_hash, now))
+                await cursor.execute(
+                    """INSERT IGNORE INTO idempotency_keys (key_hash, request_hash, created_at, claimed_at, expires_at)
+                       VALUES (%s, %s, %s, %s, %s)""",
+                    (key_hash, request_hash, now, now, now + timedelta(seconds=IDEMPOTENCY_TTL_SECONDS))
+                )
+                claimed = cursor.rowcount == 1
+                if not claimed:
+                    # Take over a claim whose worker died before storing a response
+                    await cursor.execute(
+                        """UPDATE idempotency_keys SET claimed_at = %s
+                           WHERE key_hash = %s AND request_hash = %s AND status_code IS NULL AND claimed_at < %s""",
+                        (now, key_hash, request_hash, now - timedelta(seconds=IDEMPOTENCY_LEASE_SECONDS))
+                    )
+                    claimed = cursor.rowcount == 1
+                if not claimed:
+                    await cursor.execute(
+                        """SELECT request_hash, status_code, content_type, response_body
+                           FROM idempotency_keys WHERE key_hash = %s""",
+                        (key_hash,)
+                    )
+                    stored = await cursor.fetchone()
+
+        if not claimed:
+            if stored is None or stored["status_code"] is None:
+                await self.send_error(scope, receive, send, 409, "A request with this Idempotency-Key is still in progress")
+                return
+            if bytes(stored["request_hash"]) != request_hash:
+                await self.send_error(scope, receive, send, 422, "Idempotency-Key reused with a different request")
+                return
+            entry = {"request_hash": request_hash, "status_code": stored["status_code"],
+                     "content_type": stored["content_type"], "body": zlib.decompress(stored["response_body"])}
+            idempotency_cache.set("idempotency", key_hash, entry)
+            await self.send_stored(send, entry["status_code"], entry["content_type"], entry["body"])
+            return
+
+        body_sent = False
+
+        async def replay_receive():
+            nonlocal body_sent
+            if body_sent:
+                return await receive()
+            body_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        response = {"status_code": 500, "content_type": "application/json", "chunks": []}
+
+        async def capture_send(message):
+            if message["type"] == "http.response.start":
+                response["status_code"] = message["status"]
+                response["content_type"] = Headers(raw=message["headers"]).get("content-type", "application/json")
+            elif message["type"] == "http.response.body":
+                response["chunks"].append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, replay_receive, capture_send)
+        finally:
+            async with pool.acquire() as conn:
+                async with conn.cursor(TracedDictCursor) as cursor:
+                    # Only while the claim is still ours: a retry may have taken it over
+                    if response["status_code"] >= 500:
+                        await cursor.execute("DELETE FROM idempotency_keys WHERE key_hash = %s AND claimed_at = %s",
+                                             (key_hash, now))
+                    else:
+                        response_body = b"".join(response["chunks"])
+                        await cursor.execute(
+                            """UPDATE idempotency_keys SET status_code = %s, content_type = %s, response_body = %s
+                               WHERE key_hash = %s AND claimed_at = %s""",
+                            (response["status_code"], response["content_type"], zlib.compress(response_body),
+                             key_hash, now)
+                        )
+                        if cursor.rowcount == 1:
+                            idempotency_cache.set("idempotency", key_hash, {
+                                "request_hash": request_hash, "status_code": response["status_code"],
+                                "content_type": response["content_type"], "body": response_body,
+                            })
@@ -0,0 +1,106 @@
+from starlette.datastructures import Headers, MutableHeaders
+import os
+import json
+import cProfile
+import pstats
+from pathlib import Path
+from typing import Optional
+from datetime import datetime, timezone
+import uuid
+import asyncio
+import io
+import re
+import time
+
+from fox.db import request_trace
+from fox.security import is_admin_email, token_subject
+
+# Request profiling
+PROFILE_DIR = Path(os.environ.get('PROFILE_DIR', '/tmp/fox-profiles'))
+PROFILE_MAX_FILES = int(os.environ.get('PROFILE_MAX_FILES', 50))
+PROFILE_ID = re.compile(r"^[0-9a-f]{32}$")
+
+def profile_requested(scope) -> bool:
+    if Headers(scope=scope).get("x-profile") in ("1", "true"):
+        return True
+    query_string = scope.get("query_string", b"")
+    return b"profile=" in query_string and any(
+        part in (b"profile=1", b"profile=true") for part in query_string.split(b"&")
+    )
+
+def profile_admin(scope) -> Optional[str]:
+    # Checked from the token alone so non-admins never pay for profiling
+    email = token_subject(scope)
+    return email if is_admin_email(email) else None
+
+def write_profile(profile_id: str, profiler: cProfile.Profile, report: dict):
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    profiler.dump_stats(PROFILE_DIR / f"{profile_id}.prof")
+    summary = io.StringIO()
+    pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(60)
+    report["profile"] = summary.getvalue()
+    (PROFILE_DIR / f"{profile_id}.json").write_text(json.dumps(report, default=str))
+    reports = sorted(PROFILE_DIR.glob("*.json"), key=lambda p: p.stat().st_mtime)
+    for old in reports[:-PROFILE_MAX_FILES]:
+        old.unlink(missing_ok=True)
+        old.with_suffix(".prof").unlink(missing_ok=True)
+
+class ProfilingMiddleware:
+    """Profile one request with cProfile when an admin sends X-Profile: 1 or ?profile=1.
+
+    The statement trace comes from TracedDictCursor. Both are written to
+    PROFILE_DIR and the id is returned in X-Profile-Id. cProfile sees the
+    whole event loop thread, so profiled requests are serialised and other
+    requests running at the same time can show up in the profile.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.lock = asyncio.Lock()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not profile_requested(scope):
+            await self.app(scope, receive, send)
+            return
+        admin = profile_admin(scope)
+        trace = request_trace.get()
+        if admin is None or trace is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex
+        status_code = 500
+
+        async def send_with_profile_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(raw=list(message["headers"]))
+                headers["X-Profile-Id"] = profile_id
+                message = {**message, "headers": headers.raw}
+            await send(message)
+
+        async with self.lock:
+            trace.statement_log = []
+            profiler = cProfile.Profile()
+            started = time.perf_counter()
+            profiler.enable()
+            try:
+                await self.app(scope, receive, send_with_profile_id)
+            finally:
+                profiler.disable()
+                report = {
+                    "id": profile_id,
+                    "created_at": datetime.now(timezone.utc),
+                    "requested_by": admin,
+                    "request_id": trace.request_id,
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "route": trace.route,
+                    "status": status_code,
+                    "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+                    "db_time_ms": round(trace.db_time * 1000, 3),
+                    "statements": trace.statement_log,
+                }
+                trace.statement_log = None
+                await asyncio.to_thread(write_profile, profile_id, profiler, report)
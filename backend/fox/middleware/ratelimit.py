@@ -0,0 +1,182 @@
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
+import os
+import math
+import sqlite3
+import threading
+import asyncio
+import re
+import time
+from collections import OrderedDict
+
+from fox.security import token_subject
+
+# Rate limiting
+RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+RATE_LIMIT_MAX_KEYS = int(os.environ.get('RATE_LIMIT_MAX_KEYS', 100000))
+RATE_LIMIT_EVICT_SECONDS = float(os.environ.get('RATE_LIMIT_EVICT_SECONDS', 60))
+RATE_LIMIT_STORE = os.environ.get('RATE_LIMIT_STORE')  # path to a SQLite file shared by local workers
+TRUST_PROXY_HEADERS = os.environ.get('TRUST_PROXY_HEADERS', 'false').lower() == 'true'
+
+def parse_rate(spec: str):
+    """'10/60' -> (capacity 10, refill 10/60 tokens per second)."""
+    capacity, seconds = spec.split("/")
+    return int(capacity), int(capacity) / float(seconds)
+
+# (method, path pattern, key kind, default rate); every matching rule must allow the request.
+# Kinds: ip, user (JWT subject, skipped when anonymous), route (shared by all callers).
+RATE_LIMIT_RULES = [
+    ("POST", r"^/api/auth/login$", "ip", "RATE_LIMIT_LOGIN_IP", "10/60"),
+    ("POST", r"^/api/auth/register$", "ip", "RATE_LIMIT_REGISTER_IP", "5/600"),
+    ("GET", r"^/api/cep/", "ip", "RATE_LIMIT_CEP_IP", "60/60"),
+    ("GET", r"^/api/cep/", "user", "RATE_LIMIT_CEP_USER", "120/60"),
+    ("GET", r"^/api/cep/", "route", "RATE_LIMIT_CEP_ROUTE", "600/60"),
+    (None, r"^/api/", "ip", "RATE_LIMIT_API_IP", "1200/60"),
+]
+RATE_LIMIT_COMPILED = [
+    (method, re.compile(pattern), kind, f"{method or '*'} {pattern}", *parse_rate(os.environ.get(env, default)))
+    for method, pattern, kind, env, default in RATE_LIMIT_RULES
+]
+
+class TokenBucketLimiter:
+    """In-process token buckets: O(1) per check, LRU-bounded, idle buckets swept periodically.
+
+    A bucket that has refilled to capacity is indistinguishable from a new
+    one, so the sweep drops it without changing any decision.
+    """
+
+    def __init__(self, max_keys: int, evict_interval: float):
+        self.max_keys = max_keys
+        self.evict_interval = evict_interval
+        self._buckets = OrderedDict()  # key -> [tokens, updated, capacity, rate]
+        self._next_eviction = time.monotonic() + evict_interval
+        self.limited = 0
+
+    def take(self, key: str, capacity: int, rate: float) -> float:
+        """Spend one token; returns 0 when allowed, else seconds until one is available."""
+        now = time.monotonic()
+        if now >= self._next_eviction:
+            self.evict(now)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [float(capacity), now, capacity, rate]
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+            self._buckets.move_to_end(key)
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return 0.0
+        self.limited += 1
+        return (1 - bucket[0]) / rate
+
+    def evict(self, now: float):
+        full = [key for key, (tokens, updated, capacity, rate) in self._buckets.items()
+                if tokens + (now - updated) * rate >= capacity]
+        for key in full:
+            del self._buckets[key]
+        self._next_eviction = now + self.evict_interval
+
+    def stats(self) -> dict:
+        return {"store": "memory", "buckets": len(self._buckets), "limited": self.limited}
+
+class SQLiteBucketStore:
+    """Token buckets in a local SQLite file so every worker on the host shares them."""
+
+    def __init__(self, path: str, evict_interval: float):
+        self.conn = sqlite3.connect(path, timeout=1, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS rate_buckets (
+                   bucket_key TEXT PRIMARY KEY, tokens REAL NOT NULL,
+                   updated REAL NOT NULL, full_at REAL NOT NULL)"""
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_rate_buckets_full_at ON rate_buckets (full_at)")
+        self.lock = threading.Lock()
+        self.evict_interval = evict_interval
+        self._next_eviction = time.time() + evict_interval
+        self.limited = 0
+
+    def take(self, key: str, capacity: int, rate: float) -> float:
+        now = time.time()
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                if now >= self._next_eviction:
+                    self.conn.execute("DELETE FROM rate_buckets WHERE full_at < ?", (now,))
+                    self._next_eviction = now + self.evict_interval
+                row = self.conn.execute(
+                    "SELECT tokens, updated FROM rate_buckets WHERE bucket_key = ?", (key,)
+                ).fetchone()
+                tokens = float(capacity) if row is None else min(capacity, row[0] + (now - row[1]) * rate)
+                allowed = tokens >= 1
+                if allowed:
+                    tokens -= 1
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO rate_buckets (bucket_key, tokens, updated, full_at) VALUES (?, ?, ?, ?)",
+                    (key, tokens, now, now + (capacity - tokens) / rate)
+                )
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+        if allowed:
+            return 0.0
+        self.limited += 1
+        return (1 - tokens) / rate
+
+    def stats(self) -> dict:
+        with self.lock:
+            buckets = self.conn.execute("SELECT COUNT(*) FROM rate_buckets").fetchone()[0]
+        return {"store": "sqlite", "buckets": buckets, "limited": self.limited}
+
+if RATE_LIMIT_STORE:
+    rate_limiter = SQLiteBucketStore(RATE_LIMIT_STORE, RATE_LIMIT_EVICT_SECONDS)
+else:
+    rate_limiter = TokenBucketLimiter(RATE_LIMIT_MAX_KEYS, RATE_LIMIT_EVICT_SECONDS)
+
+def client_ip(scope) -> str:
+    if TRUST_PROXY_HEADERS:
+        forwarded = Headers(scope=scope).get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+class RateLimitMiddleware:
+    """Reject requests over any matching token bucket with 429 and Retry-After."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not RATE_LIMIT_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        method, path = scope["method"], scope["path"]
+        retry_after = 0.0
+        for rule_method, pattern, kind, name, capacity, rate in RATE_LIMIT_COMPILED:
+            if (rule_method and rule_method != method) or not pattern.search(path):
+                continue
+            if kind == "ip":
+                key = client_ip(scope)
+            elif kind == "user":
+                key = token_subject(scope)
+                if key is None:
+                    continue
+            else:
+                key = ""
+            bucket_key = f"{name}|{kind}|{key}"
+            if isinstance(rate_limiter, SQLiteBucketStore):
+                wait = await asyncio.to_thread(rate_limiter.take, bucket_key, capacity, rate)
+            else:
+                wait = rate_limiter.take(bucket_key, capacity, rate)
+            retry_after = max(retry_after, wait)
+        if retry_after > 0:
+            response = JSONResponse(status_code=429, content={"detail": "Too many requests"},
+                                    headers={"Retry-After": str(math.ceil(retry_after))})
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
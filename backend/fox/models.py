@@ -0,0 +1,666 @@
+from pydantic import BaseModel, Field, ConfigDict, EmailStr
+from typing import Dict, List, Optional, Literal
+from datetime import date, datetime, timezone
+from enum import Enum
+
+# Enums
+class DumpsterStatus(str, Enum):
+    AVAILABLE = "available"
+    RENTED = "rented"
+    MAINTENANCE = "maintenance"
+    IN_TRANSIT = "in_transit"
+
+class OrderType(str, Enum):
+    PLACEMENT = "placement"
+    REMOVAL = "removal"
+    EXCHANGE = "exchange"
+
+class OrderStatus(str, Enum):
+    PENDING = "pending"
+    IN_PROGRESS = "in_progress"
+    COMPLETED = "completed"
+    CANCELLED = "cancelled"
+
+class PaymentMethod(str, Enum):
+    CASH = "cash"
+    CREDIT_CARD = "credit_card"
+    DEBIT_CARD = "debit_card"
+    BANK_TRANSFER = "bank_transfer"
+    PIX = "pix"
+
+class TransactionType(str, Enum):
+    INCOME = "income"
+    EXPENSE = "expense"
+
+# Models
+class UserCreate(BaseModel):
+    email: EmailStr
+    password: str
+    full_name: str
+
+class UserLogin(BaseModel):
+    email: EmailStr
+    password: str
+
+class User(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    email: EmailStr
+    full_name: str
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class Token(BaseModel):
+    access_token: str
+    token_type: str = "bearer"
+    user: User
+
+class ClientCreate(BaseModel):
+    name: str
+    email: Optional[EmailStr] = None
+    phone: str  # Mantido para compatibilidade, mas deprecated
+    address: str  # Mantido para compatibilidade, mas deprecated
+    document: str
+    document_type: Literal["cpf", "cnpj"]
+
+class Client(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    name: str
+    email: Optional[EmailStr] = None
+    phone: str  # Deprecated - usar client_phones
+    address: str  # Deprecated - usar client_addresses
+    document: str
+    document_type: Literal["cpf", "cnpj"]
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+# New models for multiple phones and addresses
+class ClientPhoneCreate(BaseModel):
+    phone: str
+    phone_type: str = "Celular"
+    is_primary: bool = False
+
+class ClientPhone(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    client_id: str
+    phone: str
+    phone_type: str
+    is_primary: bool
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class ClientAddressCreate(BaseModel):
+    address_type: str = "Residencial"
+    cep: str
+    street: str
+    number: str
+    complement: Optional[str] = None
+    neighborhood: str
+    city: str
+    state: str
+    is_primary: bool = False
+
+class ClientAddress(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    client_id: str
+    address_type: str
+    cep: str
+    street: str
+    number: str
+    complement: Optional[str] = None
+    neighborhood: str
+    city: str
+    state: str
+    is_primary: bool
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class ClientWithDetails(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    name: str
+    email: Optional[EmailStr] = None
+    document: str
+    document_type: Literal["cpf", "cnpj"]
+    created_at: datetime
+    phones: List[ClientPhone] = []
+    addresses: List[ClientAddress] = []
+
+# Full replacement of a client's contacts: entries with an id update that row,
+# entries without one are created, and rows left out are deleted
+class ClientPhoneEntry(ClientPhoneCreate):
+    id: Optional[str] = None
+
+class ClientAddressEntry(ClientAddressCreate):
+    id: Optional[str] = None
+
+class ClientContactsReplace(BaseModel):
+    # None leaves that list as it is; [] removes every row
+    phones: Optional[List[ClientPhoneEntry]] = None
+    addresses: Optional[List[ClientAddressEntry]] = None
+
+class ClientContacts(BaseModel):
+    phones: List[ClientPhone]
+    addresses: List[ClientAddress]
+    changes: int
+
+class ViaCEPResponse(BaseModel):
+    cep: str
+    logradouro: str
+    complemento: str
+    bairro: str
+    localidade: str
+    uf: str
+    erro: Optional[bool] = None
+
+class DumpsterCreate(BaseModel):
+    identifier: str
+    size: str
+    capacity: str
+    description: Optional[str] = None
+
+class Dumpster(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    identifier: str
+    size: str
+    capacity: str
+    description: Optional[str] = None
+    status: DumpsterStatus = DumpsterStatus.AVAILABLE
+    current_location: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class DumpsterDistance(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    identifier: str
+    size: str
+    capacity: str
+    status: DumpsterStatus
+    current_location: Optional[str] = None
+    latitude: float
+    longitude: float
+    distance_km: float
+
+class GeoCentroidLoadResult(BaseModel):
+    centroids: int
+    addresses_located: int
+    dumpsters_located: int
+
+class OrderCreate(BaseModel):
+    client_id: str
+    dumpster_id: str
+    order_type: OrderType
+    delivery_address: str  # Texto livre (fallback)
+    delivery_address_id: Optional[str] = None  # ID do endereço do cliente
+    rental_value: Optional[float] = None  # Vazio = calculado pela tabela de preços
+    payment_method: PaymentMethod
+    scheduled_date: datetime
+    notes: Optional[str] = None
+    rental_days: Optional[int] = Field(None, ge=1)  # Prazo combinado (placement); padrão RENTAL_DEFAULT_DAYS
+
+class Order(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    client_id: str
+    client_name: str
+    dumpster_id: str
+    dumpster_identifier: str
+    order_type: OrderType
+    status: OrderStatus = OrderStatus.PENDING
+    delivery_address: str
+    rental_value: float
+    payment_method: PaymentMethod
+    scheduled_date: datetime
+    completed_date: Optional[datetime] = None
+    notes: Optional[str] = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class Rental(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    dumpster_id: str
+    dumpster_identifier: str
+    client_id: str
+    client_name: str
+    start_order_id: str
+    end_order_id: Optional[str] = None
+    started_at: datetime
+    agreed_days: int
+    due_at: datetime
+    daily_rate: float
+    billed_until: datetime
+    ended_at: Optional[datetime] = None
+    settled: bool = False
+    overdue_days: int = 0
+
+class AccountsPayableCreate(BaseModel):
+    description: str
+    amount: float
+    due_date: datetime
+    category: str
+    notes: Optional[str] = None
+
+class AccountsPayable(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    description: str
+    amount: float
+    due_date: datetime
+    paid_date: Optional[datetime] = None
+    category: str
+    is_paid: bool = False
+    notes: Optional[str] = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class AccountsReceivableCreate(BaseModel):
+    client_id: str
+    order_id: str
+    amount: float
+    due_date: datetime
+    notes: Optional[str] = None
+
+class AccountsReceivable(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    client_id: str
+    client_name: str
+    order_id: str
+    amount: float
+    due_date: datetime
+    received_date: Optional[datetime] = None
+    is_received: bool = False
+    bank_transaction_id: Optional[str] = None
+    notes: Optional[str] = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class ClientFinancialSummary(BaseModel):
+    client: Client
+    total_orders: int
+    pending_orders: int
+    completed_orders: int
+    total_receivable: float
+    total_received: float
+    pending_amount: float
+    orders: List[Order]
+    accounts_receivable: List[AccountsReceivable]
+
+class BulkOrderStatusUpdate(BaseModel):
+    status: OrderStatus
+    ids: Optional[List[str]] = None
+    current_status: Optional[OrderStatus] = None
+    order_type: Optional[OrderType] = None
+    scheduled_before: Optional[datetime] = None
+
+class BulkAccountSettle(BaseModel):
+    ids: Optional[List[str]] = None
+    due_before: Optional[datetime] = None
+    client_id: Optional[str] = None
+
+class BulkItemResult(BaseModel):
+    id: str
+    success: bool
+    # False when the item was already in the target state
+    changed: bool = False
+    detail: Optional[str] = None
+
+class BulkResult(BaseModel):
+    updated: int
+    unchanged: int
+    failed: int
+    results: List[BulkItemResult]
+
+class StatementTransaction(BaseModel):
+    transaction_id: str
+    date: datetime
+    amount: float
+    memo: Optional[str] = None
+
+class ReconciliationMatch(BaseModel):
+    transaction: StatementTransaction
+    account_id: str
+    client_id: str
+    client_name: str
+    due_date: datetime
+    days_apart: int
+    document_match: bool
+    applied: bool = False
+
+class ReconciliationReport(BaseModel):
+    lines: int
+    credits: int
+    already_reconciled: int
+    matched: int
+    applied: int
+    matches: List[ReconciliationMatch]
+    unmatched: List[StatementTransaction]
+
+class ClientImportError(BaseModel):
+    row: int
+    document: Optional[str] = None
+    detail: str
+
+class ClientImportReport(BaseModel):
+    rows: int
+    valid: int
+    duplicates_in_file: int
+    created: int = 0
+    updated: int = 0
+    skipped: int = 0
+    failed: int = 0
+    phones_added: int = 0
+    addresses_added: int = 0
+    dry_run: bool = False
+    errors: List[ClientImportError] = []
+
+class Transaction(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    type: TransactionType
+    description: str
+    amount: float
+    date: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    category: str
+    reference_id: Optional[str] = None
+
+class DashboardStats(BaseModel):
+    total_dumpsters: int
+    available_dumpsters: int
+    rented_dumpsters: int
+    active_orders: int
+    pending_orders: int
+    total_revenue_month: float
+    total_receivable: float
+    total_payable: float
+    cash_balance: float
+
+class MaintenanceStatus(str, Enum):
+    IN_PROGRESS = "in_progress"
+    COMPLETED = "completed"
+    CANCELLED = "cancelled"
+
+class MaintenanceCreate(BaseModel):
+    reason: Optional[str] = None
+    supplier: Optional[str] = None
+    start_date: datetime
+    expected_end_date: Optional[datetime] = None
+    estimated_cost: Optional[float] = None
+    notes: Optional[str] = None
+
+class MaintenanceUpdate(BaseModel):
+    reason: Optional[str] = None
+    supplier: Optional[str] = None
+    start_date: Optional[datetime] = None
+    expected_end_date: Optional[datetime] = None
+    actual_end_date: Optional[datetime] = None
+    estimated_cost: Optional[float] = None
+    actual_cost: Optional[float] = None
+    notes: Optional[str] = None
+    status: Optional[MaintenanceStatus] = None
+
+class Maintenance(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    dumpster_id: str
+    dumpster_identifier: Optional[str] = None
+    reason: Optional[str] = None
+    supplier: Optional[str] = None
+    start_date: datetime
+    expected_end_date: Optional[datetime] = None
+    actual_end_date: Optional[datetime] = None
+    estimated_cost: Optional[float] = None
+    actual_cost: Optional[float] = None
+    notes: Optional[str] = None
+    status: MaintenanceStatus = MaintenanceStatus.IN_PROGRESS
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class DumpsterUtilization(BaseModel):
+    dumpster_id: str
+    identifier: str
+    size: str
+    occupied_days: float
+    idle_days: float
+    maintenance_days: float
+    occupancy_percent: float
+    revenue: float
+    revenue_per_day: float
+
+class SizeUtilization(BaseModel):
+    size: str
+    dumpster_count: int
+    occupied_days: float
+    idle_days: float
+    maintenance_days: float
+    occupancy_percent: float
+    revenue: float
+    revenue_per_day: float
+
+class HistoryEntity(str, Enum):
+    DUMPSTER = "dumpster"
+    ORDER = "order"
+
+class StatusTransition(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: int
+    entity_type: HistoryEntity
+    entity_id: str
+    old_status: Optional[str] = None
+    new_status: str
+    location: Optional[str] = None
+    reference_id: Optional[str] = None
+    changed_by: Optional[str] = None
+    changed_at: datetime
+
+class StatusSnapshot(BaseModel):
+    entity_type: HistoryEntity
+    entity_id: str
+    as_of: datetime
+    status: str
+    location: Optional[str] = None
+    changed_at: datetime
+
+class ProposalStatus(str, Enum):
+    PROPOSED = "proposed"
+    ACCEPTED = "accepted"
+    DISMISSED = "dismissed"
+
+class MaintenanceProposal(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    dumpster_id: str
+    dumpster_identifier: Optional[str] = None
+    reason: str
+    proposed_start: datetime
+    proposed_end: datetime
+    status: ProposalStatus = ProposalStatus.PROPOSED
+    maintenance_id: Optional[str] = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class SchedulerRunResult(BaseModel):
+    ran: bool
+    evaluated: int = 0
+    proposed: int = 0
+    opened: int = 0
+    skipped: int = 0
+
+class PriceZoneArea(BaseModel):
+    cep_prefix: Optional[str] = Field(None, pattern=r"^\d{1,8}$")
+    city: Optional[str] = None
+    neighborhood: Optional[str] = None
+
+class PriceZoneCreate(BaseModel):
+    name: str
+    surcharge: float = Field(0, ge=0)
+    areas: List[PriceZoneArea] = []
+
+class PriceZone(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    name: str
+    surcharge: float
+    areas: List[PriceZoneArea] = []
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class PriceRuleCreate(BaseModel):
+    size: str
+    order_type: OrderType
+    zone_id: Optional[str] = None
+    base_price: float = Field(..., ge=0)
+    included_days: int = Field(7, ge=1)
+    extra_day_price: float = Field(0, ge=0)
+
+class PriceRule(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    size: str
+    order_type: OrderType
+    zone_id: Optional[str] = None
+    base_price: float
+    included_days: int
+    extra_day_price: float
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class ClientContractCreate(BaseModel):
+    client_id: str
+    size: Optional[str] = None  # Vazio = todos os tamanhos
+    order_type: Optional[OrderType] = None  # Vazio = todos os tipos
+    fixed_price: Optional[float] = Field(None, ge=0)  # Substitui o preço base da regra
+    discount_percent: float = Field(0, ge=0, le=100)
+    valid_from: Optional[date] = None
+    valid_until: Optional[date] = None
+    notes: Optional[str] = None
+
+class ClientContract(ClientContractCreate):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class PriceQuoteRequest(BaseModel):
+    order_type: OrderType
+    size: Optional[str] = None  # Ou dumpster_id
+    dumpster_id: Optional[str] = None
+    client_id: Optional[str] = None
+    rental_days: Optional[int] = Field(None, ge=1)  # Vazio = dias incluídos na regra
+    # Zona: endereço do cliente, CEP ou cidade + bairro
+    delivery_address_id: Optional[str] = None
+    cep: Optional[str] = None
+    city: Optional[str] = None
+    neighborhood: Optional[str] = None
+
+class PriceQuote(BaseModel):
+    size: str
+    order_type: OrderType
+    days: int
+    zone_id: Optional[str] = None
+    zone_name: Optional[str] = None
+    rule_id: str
+    contract_id: Optional[str] = None
+    base_price: float
+    extra_days: int
+    extra_days_amount: float
+    zone_surcharge: float
+    discount: float
+    total: float
+
+class PriceQuoteResult(BaseModel):
+    index: int
+    success: bool
+    quote: Optional[PriceQuote] = None
+    detail: Optional[str] = None
+
+class RentalBillingResult(BaseModel):
+    ran: bool
+    evaluated: int = 0
+    billed: int = 0
+    amount: float = 0.0
+
+class ArchiveRunResult(BaseModel):
+    ran: bool
+    cutoff: Optional[datetime] = None
+    batches: int = 0
+    orders: int = 0
+    receivables: int = 0
+
+class PurgeEntity(str, Enum):
+    CLIENT = "client"
+    DUMPSTER = "dumpster"
+
+class PurgeStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+class PurgeJob(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    id: str
+    entity_type: PurgeEntity
+    entity_id: str
+    status: PurgeStatus
+    current_step: Optional[str] = None
+    deleted_rows: int = 0
+    batches: int = 0
+    attempts: int = 0
+    last_error: Optional[str] = None
+    requested_by: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
+
+class PurgeRunResult(BaseModel):
+    ran: bool
+    jobs_finished: int = 0
+    batches: int = 0
+    deleted_rows: int = 0
+
+class NameSyncResult(BaseModel):
+    ran: bool
+    entities: int = 0
+    chunks: int = 0
+    rows_updated: int = 0
+
+class NameDriftReport(BaseModel):
+    ran: bool
+    checked: Dict[str, int] = Field(default_factory=dict)
+    drifted: Dict[str, List[str]] = Field(default_factory=dict)
+
+class MaintenanceGroupStats(BaseModel):
+    key: Optional[str] = None
+    job_count: int
+    completed_jobs: int
+    in_progress_jobs: int
+    overdue_jobs: int
+    total_estimated_cost: float
+    total_actual_cost: float
+    avg_cost_ratio: Optional[float] = None
+    mean_abs_estimate_error_percent: Optional[float] = None
+    avg_downtime_days: Optional[float] = None
+    p50_downtime_days: Optional[float] = None
+    p90_downtime_days: Optional[float] = None
+
+class OverdueMaintenance(BaseModel):
+    id: str
+    dumpster_id: str
+    dumpster_identifier: str
+    supplier: Optional[str] = None
+    start_date: datetime
+    expected_end_date: datetime
+    days_overdue: float
+
+class MaintenanceAnalyticsReport(BaseModel):
+    start_date: datetime
+    end_date: datetime
+    by_supplier: List[MaintenanceGroupStats]
+    by_size: List[MaintenanceGroupStats]
+    overdue: List[OverdueMaintenance]
+
+class UtilizationReport(BaseModel):
+    start_date: datetime
+    end_date: datetime
+    period_days: float
+    dumpsters: List[DumpsterUtilization]
+    sizes: List[SizeUtilization]
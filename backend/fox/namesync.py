@@ -0,0 +1,139 @@
+import os
+import asyncio
+import logging
+from typing import List
+from datetime import datetime, timezone
+
+from fox.bulk import in_clause
+from fox.cache import invalidate_cached, touch_tables
+from fox.db import TracedDictCursor, get_db
+from fox.models import NameDriftReport, NameSyncResult, PurgeEntity
+
+logger = logging.getLogger(__name__)
+
+# Propagation of client names / dumpster identifiers into denormalized copies
+NAME_SYNC_INTERVAL_SECONDS = float(os.environ.get('NAME_SYNC_INTERVAL_SECONDS', 10))
+NAME_SYNC_TIMEOUT_SECONDS = float(os.environ.get('NAME_SYNC_TIMEOUT_SECONDS', 120))
+NAME_SYNC_ENTITIES_PER_RUN = int(os.environ.get('NAME_SYNC_ENTITIES_PER_RUN', 100))
+NAME_SYNC_CHUNK_SIZE = int(os.environ.get('NAME_SYNC_CHUNK_SIZE', 500))
+NAME_SYNC_PAUSE_SECONDS = float(os.environ.get('NAME_SYNC_PAUSE_SECONDS', 0.05))
+NAME_VERIFY_INTERVAL_SECONDS = float(os.environ.get('NAME_VERIFY_INTERVAL_SECONDS', 86400))
+NAME_VERIFY_TIMEOUT_SECONDS = float(os.environ.get('NAME_VERIFY_TIMEOUT_SECONDS', 600))
+NAME_VERIFY_PAGE_SIZE = int(os.environ.get('NAME_VERIFY_PAGE_SIZE', 500))
+
+# Source column and every (table, copy column, key column) that mirrors it;
+# each key column is indexed, so the chunked UPDATEs only touch the entity's rows
+NAME_COPIES = {
+    PurgeEntity.CLIENT: ("clients", "name", (
+        ("orders", "client_name", "client_id"),
+        ("accounts_receivable", "client_name", "client_id"),
+        ("orders_archive", "client_name", "client_id"),
+        ("accounts_receivable_archive", "client_name", "client_id"),
+    )),
+    PurgeEntity.DUMPSTER: ("dumpsters", "identifier", (
+        ("orders", "dumpster_identifier", "dumpster_id"),
+        ("orders_archive", "dumpster_identifier", "dumpster_id"),
+    )),
+}
+
+# One row per entity: repeated edits only move requested_at forward
+ENQUEUE_SQL = """INSERT INTO name_sync_queue (entity_type, entity_id, requested_at) VALUES (%s, %s, %s)
+                 ON DUPLICATE KEY UPDATE requested_at = VALUES(requested_at)"""
+
+async def enqueue_name_sync(cursor, entity_type: PurgeEntity, entity_id: str):
+    await cursor.execute(ENQUEUE_SQL, (entity_type.value, entity_id, datetime.now(timezone.utc)))
+
+async def enqueue_name_syncs(cursor, entity_type: PurgeEntity, entity_ids: List[str]):
+    now = datetime.now(timezone.utc)
+    await cursor.executemany(ENQUEUE_SQL, [(entity_type.value, entity_id, now) for entity_id in entity_ids])
+
+async def propagate_name(cursor, entity_type: PurgeEntity, entity_id: str, result: NameSyncResult) -> bool:
+    """Rewrite stale copies of one entity's name in chunks; False if the entity is gone."""
+    source, column, copies = NAME_COPIES[entity_type]
+    await cursor.execute(f"SELECT {column} AS name FROM {source} WHERE id = %s AND deleted_at IS NULL",
+                         (entity_id,))
+    row = await cursor.fetchone()
+    if row is None:
+        return False
+    for table, copy_column, key_column in copies:
+        while True:
+            # Autocommit per chunk; the inequality makes a re-run after a crash skip rows already done.
+            # BINARY: under utf8mb4_unicode_ci a case, accent or trailing-space rename compares equal
+            await cursor.execute(
+                f"""UPDATE {table} SET {copy_column} = %s
+                    WHERE {key_column} = %s AND NOT (BINARY {copy_column} <=> BINARY %s) LIMIT %s""",
+                (row["name"], entity_id, row["name"], NAME_SYNC_CHUNK_SIZE)
+            )
+            result.rows_updated += cursor.rowcount
+            result.chunks += 1
+            if cursor.rowcount < NAME_SYNC_CHUNK_SIZE:
+                break
+            await asyncio.sleep(NAME_SYNC_PAUSE_SECONDS)
+    return True
+
+async def run_name_sync() -> NameSyncResult:
+    """Drain the oldest queued entities, up to NAME_SYNC_ENTITIES_PER_RUN per run."""
+    result = NameSyncResult(ran=True)
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            await cursor.execute(
+                "SELECT entity_type, entity_id, requested_at FROM name_sync_queue ORDER BY requested_at LIMIT %s",
+                (NAME_SYNC_ENTITIES_PER_RUN,)
+            )
+            for entry in await cursor.fetchall():
+                await propagate_name(cursor, PurgeEntity(entry["entity_type"]), entry["entity_id"], result)
+                # An edit that arrived meanwhile bumped requested_at and keeps the row for the next run
+                await cursor.execute(
+                    "DELETE FROM name_sync_queue WHERE entity_type = %s AND entity_id = %s AND requested_at = %s",
+                    (entry["entity_type"], entry["entity_id"], entry["requested_at"])
+                )
+                result.entities += 1
+            if result.rows_updated:
+                await invalidate_cached(cursor, "orders")
+                await touch_tables(cursor, "orders", "accounts_receivable")
+    return result
+
+async def find_drift(cursor, entity_type: PurgeEntity, ids: List[str]) -> set:
+    source, column, copies = NAME_COPIES[entity_type]
+    drifted = set()
+    for table, copy_column, key_column in copies:
+        await cursor.execute(
+            f"""SELECT DISTINCT t.{key_column} AS entity_id FROM {table} t
+                JOIN {source} s ON s.id = t.{key_column}
+                WHERE t.{key_column} IN ({in_clause(ids)}) AND NOT (BINARY t.{copy_column} <=> BINARY s.{column})""",
+            ids
+        )
+        drifted.update(row["entity_id"] for row in await cursor.fetchall())
+    return drifted
+
+async def verify_names() -> NameDriftReport:
+    """Walk clients and dumpsters page by page and queue any whose copies drifted.
+
+    Drift should only exist while the queue is non-empty; anything found here
+    points at a write path that forgot to enqueue, so it is logged.
+    """
+    report = NameDriftReport(ran=True)
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            for entity_type, (source, _, _) in NAME_COPIES.items():
+                last_id = ""
+                while True:
+                    await cursor.execute(
+                        f"SELECT id FROM {source} WHERE id > %s AND deleted_at IS NULL ORDER BY id LIMIT %s",
+                        (last_id, NAME_VERIFY_PAGE_SIZE)
+                    )
+                    ids = [row["id"] for row in await cursor.fetchall()]
+                    if not ids:
+                        break
+                    last_id = ids[-1]
+                    report.checked[entity_type.value] = report.checked.get(entity_type.value, 0) + len(ids)
+                    for entity_id in await find_drift(cursor, entity_type, ids):
+                        report.drifted.setdefault(entity_type.value, []).append(entity_id)
+                        await enqueue_name_sync(cursor, entity_type, entity_id)
+    if report.drifted:
+        logger.warning("Name drift found", extra={"fields": {
+            key: len(ids) for key, ids in report.drifted.items()
+        }})
+    return report
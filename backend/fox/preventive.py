@@ -0,0 +1,153 @@
+import os
+from typing import Optional
+from datetime import datetime, timezone, timedelta
+import uuid
+
+from fox.cache import invalidate_cached, touch_tables
+from fox.db import TracedDictCursor, get_db, transaction
+from fox.history import record_status_change
+from fox.models import (DumpsterStatus, HistoryEntity, MaintenanceStatus, OrderType, ProposalStatus,
+                        SchedulerRunResult)
+
+# Preventive maintenance
+PM_SCHEDULER_ENABLED = os.environ.get('PM_SCHEDULER_ENABLED', 'true').lower() == 'true'
+PM_INTERVAL_SECONDS = float(os.environ.get('PM_INTERVAL_SECONDS', 3600))
+PM_TIMEOUT_SECONDS = float(os.environ.get('PM_TIMEOUT_SECONDS', 60))
+PM_MAX_DAYS_IN_SERVICE = int(os.environ.get('PM_MAX_DAYS_IN_SERVICE', 180))
+PM_MAX_PLACEMENTS = int(os.environ.get('PM_MAX_PLACEMENTS', 25))
+PM_WINDOW_DAYS = int(os.environ.get('PM_WINDOW_DAYS', 2))
+PM_LOOKAHEAD_DAYS = int(os.environ.get('PM_LOOKAHEAD_DAYS', 30))
+PM_MODE = os.environ.get('PM_MODE', 'propose')  # propose | open
+PM_BATCH_LIMIT = int(os.environ.get('PM_BATCH_LIMIT', 500))
+# A dismissed proposal holds off the next one for this long (or until another maintenance completes)
+PM_DISMISS_COOLDOWN_DAYS = int(os.environ.get('PM_DISMISS_COOLDOWN_DAYS', 30))
+
+PM_DUE_SQL = """
+    SELECT d.id, d.identifier, d.status,
+           TIMESTAMPDIFF(DAY, COALESCE(lm.last_end, d.created_at), %s) AS days_in_service,
+           COUNT(o.id) AS placements
+    FROM dumpsters d
+    LEFT JOIN (
+        SELECT dumpster_id, MAX(COALESCE(actual_end_date, start_date)) AS last_end
+        FROM dumpster_maintenance
+        WHERE status = 'completed'
+        GROUP BY dumpster_id
+    ) lm ON lm.dumpster_id = d.id
+    LEFT JOIN orders o ON o.dumpster_id = d.id AND o.order_type = 'placement' AND o.status != 'cancelled'
+                      AND o.scheduled_date >= COALESCE(lm.last_end, d.created_at)
+    WHERE d.status != 'maintenance' AND d.deleted_at IS NULL
+      AND NOT EXISTS (SELECT 1 FROM maintenance_proposals p WHERE p.dumpster_id = d.id AND p.status = 'proposed')
+      AND NOT EXISTS (
+          SELECT 1 FROM maintenance_proposals p
+          WHERE p.dumpster_id = d.id AND p.status = 'dismissed'
+            AND p.updated_at >= COALESCE(lm.last_end, d.created_at) AND p.updated_at >= %s
+      )
+      AND NOT EXISTS (SELECT 1 FROM dumpster_maintenance m WHERE m.dumpster_id = d.id AND m.status = 'in_progress')
+    GROUP BY d.id, d.identifier, d.status, d.created_at, lm.last_end
+    HAVING days_in_service >= %s OR placements >= %s
+    ORDER BY days_in_service DESC
+    LIMIT %s
+"""
+
+def find_maintenance_window(status: str, scheduled_orders, now: datetime, window: timedelta,
+                            horizon: datetime) -> Optional[datetime]:
+    """Earliest start of a ``window``-long gap in which the dumpster is in the yard.
+
+    ``scheduled_orders`` are the dumpster's open orders sorted by date: a
+    removal brings it back, a placement or exchange needs it on site.
+    """
+    free = status == DumpsterStatus.AVAILABLE
+    free_since = now
+    for order in scheduled_orders:
+        at = max(order["scheduled_date"], now)
+        if order["order_type"] == OrderType.REMOVAL:
+            if not free:
+                free, free_since = True, at
+            continue
+        if free and at - free_since >= window:
+            return free_since
+        free = False
+    if free and free_since + window <= horizon:
+        return free_since
+    return None
+
+async def run_preventive_maintenance() -> SchedulerRunResult:
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    window = timedelta(days=PM_WINDOW_DAYS)
+    horizon = now + timedelta(days=PM_LOOKAHEAD_DAYS)
+    result = SchedulerRunResult(ran=True)
+
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            # One set-based pass over the fleet decides who is due
+            await cursor.execute(PM_DUE_SQL, (now, now - timedelta(days=PM_DISMISS_COOLDOWN_DAYS),
+                                              PM_MAX_DAYS_IN_SERVICE, PM_MAX_PLACEMENTS, PM_BATCH_LIMIT))
+            due = await cursor.fetchall()
+            result.evaluated = len(due)
+            if not due:
+                return result
+
+            placeholders = ", ".join(["%s"] * len(due))
+            await cursor.execute(
+                f"""SELECT dumpster_id, order_type, scheduled_date FROM orders
+                    WHERE dumpster_id IN ({placeholders}) AND status IN ('pending', 'in_progress')
+                      AND scheduled_date < %s
+                    ORDER BY dumpster_id, scheduled_date""",
+                (*[d["id"] for d in due], horizon)
+            )
+            scheduled = {}
+            for order in await cursor.fetchall():
+                scheduled.setdefault(order["dumpster_id"], []).append(order)
+
+            proposals, openings = [], []
+            for dumpster in due:
+                start = find_maintenance_window(dumpster["status"], scheduled.get(dumpster["id"], []),
+                                                now, window, horizon)
+                if start is None:
+                    result.skipped += 1
+                    continue
+                reason = (f"Preventiva: {dumpster['days_in_service']} dias em serviço, "
+                          f"{dumpster['placements']} locações desde a última manutenção")
+                if PM_MODE == "open" and start == now and dumpster["status"] == DumpsterStatus.AVAILABLE:
+                    openings.append((dumpster, reason))
+                else:
+                    proposals.append((str(uuid.uuid4()), dumpster["id"], reason, start, start + window,
+                                      ProposalStatus.PROPOSED.value, now, now))
+
+            opened_ids = []
+            async with transaction(conn):
+                if proposals:
+                    await cursor.executemany(
+                        """INSERT INTO maintenance_proposals (id, dumpster_id, reason, proposed_start,
+                           proposed_end, status, created_at, updated_at)
+                           VALUES (%s, %s, %s, %s, %s, %s, %s, %s)""",
+                        proposals
+                    )
+                for dumpster, reason in openings:
+                    await cursor.execute(
+                        "UPDATE dumpsters SET status = %s WHERE id = %s AND status = %s",
+                        (DumpsterStatus.MAINTENANCE.value, dumpster["id"], DumpsterStatus.AVAILABLE.value)
+                    )
+                    if cursor.rowcount == 0:
+                        result.skipped += 1
+                        continue
+                    maintenance_id = str(uuid.uuid4())
+                    await cursor.execute(
+                        """INSERT INTO dumpster_maintenance (id, dumpster_id, reason, start_date,
+                           expected_end_date, status, created_at, updated_at)
+                           VALUES (%s, %s, %s, %s, %s, %s, %s, %s)""",
+                        (maintenance_id, dumpster["id"], reason, now, now + window,
+                         MaintenanceStatus.IN_PROGRESS.value, now, now)
+                    )
+                    await record_status_change(cursor, HistoryEntity.DUMPSTER, dumpster["id"], dumpster["status"],
+                                               DumpsterStatus.MAINTENANCE, "scheduler", reference_id=maintenance_id)
+                    opened_ids.append(dumpster["id"])
+                if opened_ids:
+                    await touch_tables(cursor, "dumpsters", "dumpster_maintenance")
+
+            for dumpster_id in opened_ids:
+                await invalidate_cached(cursor, "dumpsters", dumpster_id)
+            result.proposed = len(proposals)
+            result.opened = len(opened_ids)
+            return result
@@ -0,0 +1,208 @@
+from fastapi import HTTPException
+import os
+import asyncio
+from typing import Dict, List, Optional
+from datetime import date, datetime, timezone
+
+from fox.bulk import BULK_CHUNK_SIZE, chunked, in_clause
+from fox.cepindex import clean_cep, fold
+from fox.db import TracedDictCursor, get_read_db
+from fox.geo import CEP_IN_TEXT
+from fox.models import PriceQuote, PriceQuoteRequest, PriceQuoteResult
+
+# Pricing engine
+PRICE_TABLE_REFRESH_SECONDS = float(os.environ.get('PRICE_TABLE_REFRESH_SECONDS', 60))
+PRICE_TABLE_TIMEOUT_SECONDS = float(os.environ.get('PRICE_TABLE_TIMEOUT_SECONDS', 30))
+PRICE_QUOTE_MAX_BATCH = int(os.environ.get('PRICE_QUOTE_MAX_BATCH', 500))
+
+PRICE_TABLES = ("price_rules", "price_zones", "client_contracts")
+
+class PriceTable:
+    """Price rules, zones and client contracts compiled into dicts.
+
+    A quote is a handful of hash lookups: the rule by (size, order type,
+    zone), the zone by CEP prefix (one probe per prefix length in use) or by
+    city + neighborhood, and the contract by (client, size, order type) from
+    the most to the least specific key. The tables are recompiled whenever
+    one of their table versions moved.
+    """
+
+    def __init__(self):
+        self.rules = {}
+        self.zones = {}
+        self.zone_by_prefix = {}
+        self.prefix_lengths = []
+        self.zone_by_neighborhood = {}
+        self.contracts = {}
+        self.versions = None
+        self.built_at = None
+        self._lock = asyncio.Lock()
+
+    def build(self, rules: List[dict], zones: List[dict], areas: List[dict], contracts: List[dict]):
+        # Built aside and swapped in one step, so quotes never see a half-built table
+        compiled_rules = {(r["size"], r["order_type"], r["zone_id"]): r for r in rules}
+        compiled_zones = {z["id"]: z for z in zones}
+        by_prefix, by_neighborhood = {}, {}
+        for area in areas:
+            if area["cep_prefix"]:
+                by_prefix[area["cep_prefix"]] = area["zone_id"]
+            elif area["neighborhood"]:
+                by_neighborhood[(fold(area["city"] or ""), fold(area["neighborhood"]))] = area["zone_id"]
+        compiled_contracts = {}
+        # Most recent first; contract_for() takes the first one valid on the quote date
+        for contract in sorted(contracts, key=lambda c: c["valid_from"] or date.min, reverse=True):
+            key = (contract["client_id"], contract["size"], contract["order_type"])
+            compiled_contracts.setdefault(key, []).append(contract)
+        self.rules, self.zones, self.contracts = compiled_rules, compiled_zones, compiled_contracts
+        self.zone_by_prefix, self.zone_by_neighborhood = by_prefix, by_neighborhood
+        self.prefix_lengths = sorted({len(prefix) for prefix in by_prefix}, reverse=True)
+        self.built_at = datetime.now(timezone.utc)
+
+    async def refresh(self, cursor):
+        await cursor.execute(
+            f"SELECT table_name, version FROM table_versions WHERE table_name IN ({in_clause(PRICE_TABLES)})",
+            PRICE_TABLES
+        )
+        found = {row["table_name"]: row["version"] for row in await cursor.fetchall()}
+        versions = tuple(found.get(table, 0) for table in PRICE_TABLES)
+        if versions == self.versions:
+            return
+        async with self._lock:
+            if versions == self.versions:
+                return
+            await cursor.execute(
+                "SELECT id, size, order_type, zone_id, base_price, included_days, extra_day_price FROM price_rules"
+            )
+            rules = await cursor.fetchall()
+            await cursor.execute("SELECT id, name, surcharge FROM price_zones")
+            zones = await cursor.fetchall()
+            await cursor.execute("SELECT zone_id, cep_prefix, city, neighborhood FROM price_zone_areas")
+            areas = await cursor.fetchall()
+            await cursor.execute(
+                """SELECT id, client_id, size, order_type, fixed_price, discount_percent, valid_from, valid_until
+                   FROM client_contracts"""
+            )
+            contracts = await cursor.fetchall()
+            self.build(rules, zones, areas, contracts)
+            self.versions = versions
+
+    def zone_for(self, cep: Optional[str] = None, city: Optional[str] = None,
+                 neighborhood: Optional[str] = None) -> Optional[str]:
+        """Longest matching CEP prefix first, then city + neighborhood, then neighborhood alone."""
+        digits = clean_cep(cep)
+        for length in self.prefix_lengths:
+            if length <= len(digits):
+                zone_id = self.zone_by_prefix.get(digits[:length])
+                if zone_id:
+                    return zone_id
+        if neighborhood:
+            return (self.zone_by_neighborhood.get((fold(city or ""), fold(neighborhood)))
+                    or self.zone_by_neighborhood.get(("", fold(neighborhood))))
+        return None
+
+    def contract_for(self, client_id: Optional[str], size: str, order_type: str, on: date) -> Optional[dict]:
+        if not client_id:
+            return None
+        for key in ((client_id, size, order_type), (client_id, size, None), (client_id, None, order_type),
+                    (client_id, None, None)):
+            for contract in self.contracts.get(key, ()):
+                if (contract["valid_from"] or date.min) <= on <= (contract["valid_until"] or date.max):
+                    return contract
+        return None
+
+    def quote(self, size: str, order_type: str, days: Optional[int] = None, zone_id: Optional[str] = None,
+              client_id: Optional[str] = None, on: Optional[date] = None) -> PriceQuote:
+        # A rule written for the zone replaces the zone-less rule and its surcharge
+        rule = self.rules.get((size, order_type, zone_id)) if zone_id else None
+        surcharge = 0.0
+        if rule is None:
+            rule = self.rules.get((size, order_type, None))
+            if zone_id in self.zones:
+                surcharge = float(self.zones[zone_id]["surcharge"])
+        if rule is None:
+            raise HTTPException(status_code=400, detail=f"No price rule for size {size} and {order_type}")
+
+        days = days or rule["included_days"]
+        contract = self.contract_for(client_id, size, order_type, on or datetime.now(timezone.utc).date())
+        base = float(rule["base_price"])
+        if contract and contract["fixed_price"] is not None:
+            base = float(contract["fixed_price"])
+        extra_days = max(days - rule["included_days"], 0)
+        extra_amount = extra_days * float(rule["extra_day_price"])
+        subtotal = base + extra_amount + surcharge
+        discount = round(subtotal * float(contract["discount_percent"]) / 100, 2) if contract else 0.0
+        return PriceQuote(
+            size=size, order_type=order_type, days=days, zone_id=zone_id,
+            zone_name=self.zones[zone_id]["name"] if zone_id in self.zones else None,
+            rule_id=rule["id"], contract_id=contract["id"] if contract else None, base_price=base,
+            extra_days=extra_days, extra_days_amount=round(extra_amount, 2), zone_surcharge=surcharge,
+            discount=discount, total=round(subtotal - discount, 2)
+        )
+
+# Per worker; compiled at startup by the price-table job and re-checked on every quote
+price_table = PriceTable()
+
+def text_zone(text: Optional[str]) -> Optional[str]:
+    """Zone of the last CEP written in a free-text address, if any."""
+    found = CEP_IN_TEXT.findall(text or "")
+    return price_table.zone_for("".join(found[-1])) if found else None
+
+async def fetch_by_ids(cursor, sql: str, ids: List[str]) -> Dict[str, dict]:
+    rows = {}
+    for chunk in chunked(ids, BULK_CHUNK_SIZE):
+        await cursor.execute(sql.format(in_clause(chunk)), chunk)
+        rows.update((row["id"], row) for row in await cursor.fetchall())
+    return rows
+
+async def quote_many(cursor, requests: List[PriceQuoteRequest]) -> List[PriceQuoteResult]:
+    """Quote a batch with one query for its dumpsters and one for its addresses."""
+    await price_table.refresh(cursor)
+    dumpster_ids = list({r.dumpster_id for r in requests if r.dumpster_id and not r.size})
+    address_ids = list({r.delivery_address_id for r in requests if r.delivery_address_id})
+    dumpsters = await fetch_by_ids(
+        cursor, "SELECT id, size FROM dumpsters WHERE id IN ({}) AND deleted_at IS NULL", dumpster_ids
+    )
+    addresses = await fetch_by_ids(
+        cursor, "SELECT id, client_id, cep, city, neighborhood FROM client_addresses WHERE id IN ({})", address_ids
+    )
+    today = datetime.now(timezone.utc).date()
+
+    results = []
+    for index, request in enumerate(requests):
+        size = request.size or (dumpsters.get(request.dumpster_id) or {}).get("size")
+        address = addresses.get(request.delivery_address_id)
+        if not size:
+            results.append(PriceQuoteResult(index=index, success=False, detail="Unknown size or dumpster"))
+            continue
+        if request.delivery_address_id and (not address or
+                                            (request.client_id and address["client_id"] != request.client_id)):
+            results.append(PriceQuoteResult(index=index, success=False, detail="Address not found"))
+            continue
+        source = address or {"cep": request.cep, "city": request.city, "neighborhood": request.neighborhood}
+        zone_id = price_table.zone_for(source["cep"], source["city"], source["neighborhood"])
+        try:
+            quote = price_table.quote(size, request.order_type.value, request.rental_days, zone_id,
+                                      request.client_id, today)
+        except HTTPException as exc:
+            results.append(PriceQuoteResult(index=index, success=False, detail=exc.detail))
+            continue
+        results.append(PriceQuoteResult(index=index, success=True, quote=quote))
+    return results
+
+def price_table_stats() -> dict:
+    return {
+        "rules": len(price_table.rules),
+        "zones": len(price_table.zones),
+        "cep_prefixes": len(price_table.zone_by_prefix),
+        "neighborhoods": len(price_table.zone_by_neighborhood),
+        "contracts": sum(len(contracts) for contracts in price_table.contracts.values()),
+        "versions": price_table.versions,
+        "built_at": price_table.built_at,
+    }
+
+async def refresh_price_table():
+    """Compile this worker's price table at startup and whenever it changed."""
+    pool = await get_read_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            await price_table.refresh(cursor)
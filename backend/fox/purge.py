@@ -0,0 +1,146 @@
+import os
+import asyncio
+import logging
+import uuid
+from typing import Optional
+from datetime import datetime, timezone
+
+from fox.cache import invalidate_cached, touch_tables
+from fox.db import TracedDictCursor, get_db
+from fox.models import PurgeEntity, PurgeRunResult, PurgeStatus
+
+logger = logging.getLogger(__name__)
+
+# Soft delete and background purge
+PURGE_BATCH_SIZE = int(os.environ.get('PURGE_BATCH_SIZE', 500))
+PURGE_MAX_BATCHES = int(os.environ.get('PURGE_MAX_BATCHES', 200))
+PURGE_BATCH_PAUSE_SECONDS = float(os.environ.get('PURGE_BATCH_PAUSE_SECONDS', 0.1))
+PURGE_INTERVAL_SECONDS = float(os.environ.get('PURGE_INTERVAL_SECONDS', 30))
+PURGE_TIMEOUT_SECONDS = float(os.environ.get('PURGE_TIMEOUT_SECONDS', 300))
+PURGE_MAX_ATTEMPTS = int(os.environ.get('PURGE_MAX_ATTEMPTS', 5))
+
+# Rows of soft-deleted parents stay until purged; list queries hide them with these
+# (the subqueries only see deletions still waiting for the purge worker)
+LIVE_CLIENT = "client_id NOT IN (SELECT id FROM clients WHERE deleted_at IS NOT NULL)"
+LIVE_DUMPSTER = "dumpster_id NOT IN (SELECT id FROM dumpsters WHERE deleted_at IS NOT NULL)"
+
+# Children first, so no DELETE ever cascades into more than one batch of rows
+PURGE_STEPS = {
+    PurgeEntity.CLIENT: (
+        ("accounts_receivable", "client_id = %s"),
+        ("orders", "client_id = %s"),
+        ("rentals", "client_id = %s"),
+        ("client_contracts", "client_id = %s"),
+        ("accounts_receivable_archive", "client_id = %s"),
+        ("orders_archive", "client_id = %s"),
+        ("client_phones", "client_id = %s"),
+        ("client_addresses", "client_id = %s"),
+    ),
+    PurgeEntity.DUMPSTER: (
+        ("accounts_receivable", "order_id IN (SELECT id FROM orders WHERE dumpster_id = %s)"),
+        ("orders", "dumpster_id = %s"),
+        ("rentals", "dumpster_id = %s"),
+        ("accounts_receivable_archive", "order_id IN (SELECT id FROM orders_archive WHERE dumpster_id = %s)"),
+        ("orders_archive", "dumpster_id = %s"),
+        ("maintenance_proposals", "dumpster_id = %s"),
+        ("dumpster_maintenance", "dumpster_id = %s"),
+    ),
+}
+PARENT_TABLES = {PurgeEntity.CLIENT: "clients", PurgeEntity.DUMPSTER: "dumpsters"}
+# Versions bumped once a purge finishes; the rows were already hidden at soft-delete time
+PURGED_TABLES = {
+    PurgeEntity.CLIENT: ("clients", "orders", "accounts_receivable", "rentals", "client_contracts", "client_phones",
+                         "client_addresses"),
+    PurgeEntity.DUMPSTER: ("dumpsters", "orders", "accounts_receivable", "rentals", "dumpster_maintenance"),
+}
+
+async def soft_delete(cursor, entity_type: PurgeEntity, entity_id: str, requested_by: str) -> Optional[str]:
+    """Hide the row now and queue its purge; returns the job id, or None if there is no such row."""
+    table = PARENT_TABLES[entity_type]
+    now = datetime.now(timezone.utc)
+    await cursor.execute(
+        f"UPDATE {table} SET deleted_at = %s WHERE id = %s AND deleted_at IS NULL", (now, entity_id)
+    )
+    if cursor.rowcount == 0:
+        return None
+    job_id = str(uuid.uuid4())
+    await cursor.execute(
+        """INSERT INTO purge_jobs (id, entity_type, entity_id, status, requested_by, created_at, updated_at)
+           VALUES (%s, %s, %s, %s, %s, %s, %s)""",
+        (job_id, entity_type.value, entity_id, PurgeStatus.PENDING.value, requested_by, now, now)
+    )
+    await invalidate_cached(cursor, table, entity_id)
+    return job_id
+
+async def purge_job(cursor, job: dict, result: PurgeRunResult) -> bool:
+    """Advance one job until it finishes or the run's batch budget is spent.
+
+    Steps are plain ``DELETE ... LIMIT`` in autocommit, so each batch holds its
+    locks only for itself and a job interrupted anywhere resumes from the top.
+    """
+    entity_type = PurgeEntity(job["entity_type"])
+    for table, condition in PURGE_STEPS[entity_type]:
+        while True:
+            if result.batches >= PURGE_MAX_BATCHES:
+                return False
+            await cursor.execute(f"DELETE FROM {table} WHERE {condition} LIMIT %s",
+                                 (job["entity_id"], PURGE_BATCH_SIZE))
+            deleted = cursor.rowcount
+            result.batches += 1
+            result.deleted_rows += deleted
+            await cursor.execute(
+                """UPDATE purge_jobs SET current_step = %s, deleted_rows = deleted_rows + %s,
+                   batches = batches + 1, updated_at = %s WHERE id = %s""",
+                (table, deleted, datetime.now(timezone.utc), job["id"])
+            )
+            await asyncio.sleep(PURGE_BATCH_PAUSE_SECONDS)
+            if deleted < PURGE_BATCH_SIZE:
+                break
+
+    parent = PARENT_TABLES[entity_type]
+    await cursor.execute(f"DELETE FROM {parent} WHERE id = %s AND deleted_at IS NOT NULL", (job["entity_id"],))
+    now = datetime.now(timezone.utc)
+    await cursor.execute(
+        """UPDATE purge_jobs SET status = %s, current_step = NULL, deleted_rows = deleted_rows + %s,
+           updated_at = %s, finished_at = %s WHERE id = %s""",
+        (PurgeStatus.DONE.value, cursor.rowcount, now, now, job["id"])
+    )
+    await invalidate_cached(cursor, "orders")
+    await touch_tables(cursor, *PURGED_TABLES[entity_type])
+    return True
+
+async def run_purge_jobs() -> PurgeRunResult:
+    """Work through queued purges, oldest first, within PURGE_MAX_BATCHES deletes."""
+    result = PurgeRunResult(ran=True)
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            while result.batches < PURGE_MAX_BATCHES:
+                await cursor.execute(
+                    """SELECT id, entity_type, entity_id, attempts FROM purge_jobs
+                       WHERE status IN (%s, %s) ORDER BY created_at LIMIT 1""",
+                    (PurgeStatus.PENDING.value, PurgeStatus.RUNNING.value)
+                )
+                job = await cursor.fetchone()
+                if job is None:
+                    break
+                await cursor.execute(
+                    "UPDATE purge_jobs SET status = %s, updated_at = %s WHERE id = %s",
+                    (PurgeStatus.RUNNING.value, datetime.now(timezone.utc), job["id"])
+                )
+                try:
+                    finished = await purge_job(cursor, job, result)
+                except Exception as exc:
+                    logger.exception("Purge of %s %s failed", job["entity_type"], job["entity_id"])
+                    # Left running for a retry on the next pass until attempts run out
+                    status = PurgeStatus.FAILED if job["attempts"] + 1 >= PURGE_MAX_ATTEMPTS else PurgeStatus.RUNNING
+                    await cursor.execute(
+                        """UPDATE purge_jobs SET status = %s, attempts = attempts + 1, last_error = %s, updated_at = %s
+                           WHERE id = %s""",
+                        (status.value, f"{type(exc).__name__}: {exc}"[:2000], datetime.now(timezone.utc), job["id"])
+                    )
+                    break
+                if not finished:
+                    break
+                result.jobs_finished += 1
+    return result
@@ -0,0 +1,150 @@
+from fastapi import HTTPException
+import os
+from typing import List, Optional
+from datetime import datetime, timedelta
+import bisect
+import csv
+import io
+import re
+import hashlib
+from functools import lru_cache
+
+from fox.models import ReconciliationMatch, StatementTransaction
+
+# Bank reconciliation
+RECONCILIATION_MAX_BYTES = int(os.environ.get('RECONCILIATION_MAX_BYTES', 20 * 1024 * 1024))
+OFX_TRANSACTION = re.compile(r"<STMTTRN>(.*?)(?:</STMTTRN>|(?=<STMTTRN>)|(?=</BANKTRANLIST>))", re.S | re.I)
+OFX_FIELD = re.compile(r"<(TRNTYPE|DTPOSTED|TRNAMT|FITID|MEMO|NAME)>([^<\r\n]*)", re.I)
+DOCUMENT_IN_TEXT = re.compile(r"(?<!\d)(\d{14}|\d{11})(?!\d)")
+CSV_COLUMNS = {
+    "date": ("data", "date", "data lancamento", "data lançamento", "dt"),
+    "amount": ("valor", "amount", "value", "credito", "crédito"),
+    "memo": ("descricao", "descrição", "historico", "histórico", "memo", "description"),
+    "id": ("id", "fitid", "documento", "identificador", "nsu"),
+}
+
+def parse_statement_amount(value: str) -> float:
+    value = value.strip().replace("R$", "").replace(" ", "")
+    if "," in value:
+        # Brazilian format: 1.234,56
+        value = value.replace(".", "").replace(",", ".")
+    return float(value)
+
+@lru_cache(maxsize=4096)
+def parse_statement_date(value: str) -> datetime:
+    # Cached: a statement only spans a handful of distinct dates and strptime is slow
+    value = value.strip()
+    if value[:8].isdigit():
+        # OFX: YYYYMMDD[HHMMSS[.XXX]][[-3:BRT]]
+        return datetime.strptime(value[:8], "%Y%m%d")
+    if "/" in value:
+        return datetime.strptime(value[:10], "%d/%m/%Y")
+    return datetime.strptime(value[:10], "%Y-%m-%d")
+
+def statement_transaction_id(date: datetime, amount: float, memo: str, seen: dict) -> str:
+    # Files without ids get a stable one; repeated identical lines get an occurrence suffix
+    base = hashlib.sha1(f"{date:%Y-%m-%d}|{amount:.2f}|{memo}".encode()).hexdigest()[:32]
+    seen[base] = seen.get(base, 0) + 1
+    return f"{base}-{seen[base]}"
+
+def parse_ofx(text: str) -> List[StatementTransaction]:
+    transactions, seen = [], {}
+    for block in OFX_TRANSACTION.findall(text):
+        fields = {name.upper(): value.strip() for name, value in OFX_FIELD.findall(block)}
+        if "DTPOSTED" not in fields or "TRNAMT" not in fields:
+            continue
+        try:
+            date = parse_statement_date(fields["DTPOSTED"])
+            amount = parse_statement_amount(fields["TRNAMT"])
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid OFX transaction {fields.get('FITID', '')}")
+        memo = " ".join(filter(None, (fields.get("NAME"), fields.get("MEMO"))))
+        transaction_id = fields.get("FITID") or statement_transaction_id(date, amount, memo, seen)
+        transactions.append(StatementTransaction(transaction_id=transaction_id, date=date, amount=amount, memo=memo))
+    return transactions
+
+def parse_statement_csv(text: str) -> List[StatementTransaction]:
+    sample = text[:4096]
+    delimiter = ";" if sample.count(";") > sample.count(",") else ","
+    reader = csv.reader(io.StringIO(text), delimiter=delimiter)
+    header = [h.strip().lower() for h in next(reader, [])]
+    positions = {}
+    for key, names in CSV_COLUMNS.items():
+        for index, name in enumerate(header):
+            if name in names:
+                positions[key] = index
+                break
+    if "date" not in positions or "amount" not in positions:
+        raise HTTPException(status_code=400, detail="CSV must have date and amount columns")
+
+    transactions, seen = [], {}
+    for line_number, row in enumerate(reader, start=2):
+        if not any(cell.strip() for cell in row):
+            continue
+        try:
+            date = parse_statement_date(row[positions["date"]])
+            amount = parse_statement_amount(row[positions["amount"]])
+        except (ValueError, IndexError):
+            raise HTTPException(status_code=400, detail=f"Invalid statement line {line_number}")
+        memo = row[positions["memo"]].strip() if "memo" in positions and positions["memo"] < len(row) else ""
+        transaction_id = row[positions["id"]].strip() if "id" in positions and positions["id"] < len(row) else ""
+        transactions.append(StatementTransaction(
+            transaction_id=transaction_id or statement_transaction_id(date, amount, memo, seen),
+            date=date, amount=amount, memo=memo
+        ))
+    return transactions
+
+def documents_in_text(text: Optional[str]) -> set:
+    if not text:
+        return set()
+    return set(DOCUMENT_IN_TEXT.findall(re.sub(r"[.\-/]", "", text)))
+
+def match_statement(credits: List[StatementTransaction], receivables, tolerance_days: int) -> List[ReconciliationMatch]:
+    """Pair credits with open receivables.
+
+    Receivables are bucketed by amount in cents and sorted by due date, so
+    each credit only looks at same-amount rows inside the date window
+    (found with bisect) instead of comparing every pair. A client document
+    (CPF/CNPJ) in the memo wins over date proximity.
+    """
+    buckets = {}
+    for receivable in receivables:
+        buckets.setdefault(round(float(receivable["amount"]) * 100), []).append(receivable)
+    due_dates = {}
+    for cents, rows in buckets.items():
+        rows.sort(key=lambda r: r["due_date"])
+        due_dates[cents] = [r["due_date"] for r in rows]
+
+    tolerance = timedelta(days=tolerance_days)
+    used = set()
+    matches = []
+    for credit in sorted(credits, key=lambda c: c.date):
+        cents = round(credit.amount * 100)
+        rows = buckets.get(cents)
+        if not rows:
+            continue
+        dates = due_dates[cents]
+        low = bisect.bisect_left(dates, credit.date - tolerance)
+        high = bisect.bisect_right(dates, credit.date + tolerance)
+        documents = documents_in_text(credit.memo)
+        best, best_key = None, None
+        for receivable in rows[low:high]:
+            if receivable["id"] in used:
+                continue
+            document_match = receivable["document_digits"] in documents
+            key = (not document_match, abs(receivable["due_date"] - credit.date))
+            if best_key is None or key < best_key:
+                best, best_key = receivable, key
+        if best is None:
+            continue
+        used.add(best["id"])
+        matches.append(ReconciliationMatch(
+            transaction=credit,
+            account_id=best["id"],
+            client_id=best["client_id"],
+            client_name=best["client_name"],
+            due_date=best["due_date"],
+            days_apart=abs((best["due_date"] - credit.date).days),
+            document_match=not best_key[0],
+        ))
+    return matches
@@ -0,0 +1,169 @@
+import os
+import math
+import uuid
+from typing import List, Optional
+from datetime import datetime, timezone, timedelta
+
+from fox.bulk import in_clause
+from fox.cache import touch_tables
+from fox.db import TracedDictCursor, get_db, transaction
+from fox.models import OrderStatus, OrderType, RentalBillingResult
+
+# Rental periods and overdue billing
+RENTAL_DEFAULT_DAYS = int(os.environ.get('RENTAL_DEFAULT_DAYS', 7))
+RENTAL_OVERDUE_RATE = float(os.environ.get('RENTAL_OVERDUE_RATE', 1.0))  # multiplier on the daily rate
+RENTAL_BILLING_PERIOD_DAYS = int(os.environ.get('RENTAL_BILLING_PERIOD_DAYS', 7))
+RENTAL_DUE_DAYS = int(os.environ.get('RENTAL_DUE_DAYS', 5))
+RENTAL_BILLING_ENABLED = os.environ.get('RENTAL_BILLING_ENABLED', 'true').lower() == 'true'
+RENTAL_BILLING_INTERVAL_SECONDS = float(os.environ.get('RENTAL_BILLING_INTERVAL_SECONDS', 3600))
+RENTAL_BILLING_TIMEOUT_SECONDS = float(os.environ.get('RENTAL_BILLING_TIMEOUT_SECONDS', 120))
+RENTAL_BILLING_BATCH_SIZE = int(os.environ.get('RENTAL_BILLING_BATCH_SIZE', 500))
+RENTAL_BILLING_MAX_BATCHES = int(os.environ.get('RENTAL_BILLING_MAX_BATCHES', 20))
+
+# Open rentals with at least one full billing period past billed_until, and ended
+# ones still owing the days up to their end; idx_billing keeps this off settled rows.
+# Plain FOR UPDATE (MariaDB has no FOR UPDATE OF): it also locks the batch's client
+# and dumpster rows, which only a rename or soft delete would wait on
+RENTAL_BILLING_SQL = """
+    SELECT r.id, r.client_id, c.name AS client_name, r.start_order_id, d.identifier AS dumpster_identifier,
+           r.daily_rate, r.billed_until, r.ended_at
+    FROM rentals r
+    JOIN clients c ON c.id = r.client_id
+    JOIN dumpsters d ON d.id = r.dumpster_id
+    WHERE r.settled = FALSE AND (r.ended_at IS NOT NULL OR r.billed_until <= %s)
+      AND c.deleted_at IS NULL AND d.deleted_at IS NULL
+    ORDER BY r.billed_until
+    LIMIT %s
+    FOR UPDATE
+"""
+
+async def open_rental(cursor, order_id: str, dumpster_id: str, client_id: str, started_at: datetime,
+                      rental_value: float, agreed_days: Optional[int] = None):
+    """Start the rental period of a placement (or exchange) order; runs in the caller's transaction."""
+    agreed_days = agreed_days or RENTAL_DEFAULT_DAYS
+    started_at = started_at.replace(tzinfo=None)
+    # A dumpster freed by hand (status PATCH) left its rental open; it ends where this one starts
+    await cursor.execute(
+        """UPDATE rentals SET ended_at = %s, settled = (billed_until >= %s)
+           WHERE open_dumpster_id = %s""",
+        (started_at, started_at, dumpster_id)
+    )
+    due_at = started_at + timedelta(days=agreed_days)
+    await cursor.execute(
+        """INSERT INTO rentals (id, dumpster_id, client_id, start_order_id, started_at, agreed_days, due_at,
+           daily_rate, billed_until, created_at)
+           VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""",
+        (str(uuid.uuid4()), dumpster_id, client_id, order_id, started_at, agreed_days, due_at,
+         round(rental_value / agreed_days, 2), due_at, datetime.now(timezone.utc))
+    )
+
+async def sync_rentals(cursor, orders: List[dict], status: OrderStatus, now: datetime) -> bool:
+    """Follow order status changes: a completed removal or exchange ends the dumpster's
+    open rental (an exchange opens the next one) and a cancelled placement ends its own.
+
+    ``orders`` are the changed orders (id, order_type, dumpster_id, client_id,
+    rental_value); runs in the caller's transaction. Returns whether any rental changed.
+    """
+    now = now.replace(tzinfo=None)
+    if status == OrderStatus.CANCELLED:
+        placements = [o["id"] for o in orders if o["order_type"] == OrderType.PLACEMENT.value]
+        if not placements:
+            return False
+        # A placement cancelled before it ran over has nothing left to bill
+        await cursor.execute(
+            f"""UPDATE rentals SET ended_at = %s, settled = (billed_until >= %s)
+                WHERE start_order_id IN ({in_clause(placements)}) AND ended_at IS NULL""",
+            (now, now, *placements)
+        )
+        return cursor.rowcount > 0
+    if status != OrderStatus.COMPLETED:
+        return False
+
+    ending = [o for o in orders if o["order_type"] in (OrderType.REMOVAL.value, OrderType.EXCHANGE.value)]
+    if not ending:
+        return False
+    dumpster_ids = [o["dumpster_id"] for o in ending]
+    await cursor.execute(
+        f"""SELECT dumpster_id, agreed_days FROM rentals
+            WHERE open_dumpster_id IN ({in_clause(dumpster_ids)}) FOR UPDATE""",
+        dumpster_ids
+    )
+    agreed = {row["dumpster_id"]: row["agreed_days"] for row in await cursor.fetchall()}
+    if not agreed:
+        return False
+    await cursor.executemany(
+        """UPDATE rentals SET ended_at = %s, end_order_id = %s, settled = (billed_until >= %s)
+           WHERE open_dumpster_id = %s""",
+        [(now, o["id"], now, o["dumpster_id"]) for o in ending if o["dumpster_id"] in agreed]
+    )
+    for order in ending:
+        # The exchanged dumpster stays on site under a fresh period, priced by the exchange order
+        if order["order_type"] == OrderType.EXCHANGE.value and order["dumpster_id"] in agreed:
+            await open_rental(cursor, order["id"], order["dumpster_id"], order["client_id"], now,
+                              float(order["rental_value"]), agreed[order["dumpster_id"]])
+    return True
+
+def overdue_charge(rental: dict, now: datetime) -> tuple:
+    """(days to bill, new billed_until, settled) for one rental.
+
+    Open rentals are billed in whole RENTAL_BILLING_PERIOD_DAYS periods; an
+    ended one is billed for every started day up to its end and then settled.
+    """
+    billed_until = rental["billed_until"]
+    if rental["ended_at"] is not None:
+        days = max(math.ceil((rental["ended_at"] - billed_until) / timedelta(days=1)), 0)
+        return days, max(billed_until, rental["ended_at"]), True
+    periods = (now - billed_until) // timedelta(days=RENTAL_BILLING_PERIOD_DAYS)
+    days = periods * RENTAL_BILLING_PERIOD_DAYS
+    return days, billed_until + timedelta(days=days), False
+
+async def run_rental_billing(now: Optional[datetime] = None) -> RentalBillingResult:
+    """Turn overdue rental days into accounts receivable.
+
+    One indexed query per batch picks the rentals owing days; their
+    receivables go in with one executemany and billed_until moves in the
+    same transaction, so a day is never billed twice.
+    """
+    now = (now or datetime.now(timezone.utc)).replace(tzinfo=None)
+    period_start = now - timedelta(days=RENTAL_BILLING_PERIOD_DAYS)
+    result = RentalBillingResult(ran=True)
+
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            for _ in range(RENTAL_BILLING_MAX_BATCHES):
+                async with transaction(conn):
+                    await cursor.execute(RENTAL_BILLING_SQL, (period_start, RENTAL_BILLING_BATCH_SIZE))
+                    rentals = await cursor.fetchall()
+                    receivables, updates = [], []
+                    for rental in rentals:
+                        days, billed_until, settled = overdue_charge(rental, now)
+                        amount = round(days * float(rental["daily_rate"]) * RENTAL_OVERDUE_RATE, 2)
+                        if amount > 0:
+                            receivables.append((
+                                str(uuid.uuid4()), rental["client_id"], rental["client_name"],
+                                rental["start_order_id"], amount, now + timedelta(days=RENTAL_DUE_DAYS), False,
+                                f"Locação excedente - {rental['dumpster_identifier']} - {days} dia(s) "
+                                f"({rental['billed_until']:%d/%m/%Y} a {billed_until:%d/%m/%Y})",
+                                now
+                            ))
+                            result.amount = round(result.amount + amount, 2)
+                        updates.append((billed_until, settled, rental["id"]))
+                    if receivables:
+                        await cursor.executemany(
+                            """INSERT INTO accounts_receivable (id, client_id, client_name, order_id, amount,
+                               due_date, is_received, notes, created_at)
+                               VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)""",
+                            receivables
+                        )
+                    if updates:
+                        await cursor.executemany(
+                            "UPDATE rentals SET billed_until = %s, settled = %s WHERE id = %s", updates
+                        )
+                result.evaluated += len(rentals)
+                result.billed += len(receivables)
+                if updates:
+                    await touch_tables(cursor, "rentals", "accounts_receivable")
+                if len(rentals) < RENTAL_BILLING_BATCH_SIZE:
+                    break
+            return result
@@ -0,0 +1,70 @@
+from fastapi import HTTPException, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import create_model
+from typing import List, Optional
+import hashlib
+from functools import lru_cache
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+async def check_not_modified(request: Request, response: Response, cursor, tables, *parts) -> Optional[Response]:
+    """Probe table_versions and answer 304 when the client's ETag is current.
+
+    Otherwise the ETag is set on ``response`` and None is returned, so the
+    route runs its query as usual.
+    """
+    placeholders = ", ".join(["%s"] * len(tables))
+    await cursor.execute(
+        f"SELECT table_name, version FROM table_versions WHERE table_name IN ({placeholders})",
+        tuple(tables)
+    )
+    versions = {row["table_name"]: row["version"] for row in await cursor.fetchall()}
+    key = "|".join([f"{t}:{versions.get(t, 0)}" for t in tables] + [str(p) for p in parts])
+    etag = 'W/"%s"' % hashlib.sha1(key.encode('utf-8')).hexdigest()[:20]
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
+# Sparse fieldsets
+def parse_fields(fields: Optional[str], model) -> Optional[List[str]]:
+    """Validate a ``fields=a,b,c`` projection against the model; ``id`` is always kept."""
+    if not fields:
+        return None
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in model.model_fields]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return ["id"] + [f for f in dict.fromkeys(requested) if f != "id"]
+
+def select_list(columns: Optional[List[str]], alias: Optional[str] = None, computed: Optional[dict] = None,
+                default: str = "*") -> str:
+    # Column names were validated against the model, so they are safe to interpolate
+    if not columns:
+        return default
+    computed = computed or {}
+    prefix = f"{alias}." if alias else ""
+    return ", ".join(
+        f"{computed[c]} AS `{c}`" if c in computed else f"{prefix}`{c}`"
+        for c in columns
+    )
+
+@lru_cache(maxsize=256)
+def projected_model(model, columns: tuple):
+    return create_model(
+        f"{model.__name__}Fields",
+        **{c: (model.model_fields[c].annotation, model.model_fields[c]) for c in columns}
+    )
+
+def projected_response(response: Response, model, columns: List[str], rows) -> JSONResponse:
+    projection = projected_model(model, tuple(columns))
+    content = jsonable_encoder([projection(**row) for row in rows])
+    return JSONResponse(content=content, headers=dict(response.headers))
@@ -0,0 +1,275 @@
+from fastapi import APIRouter, HTTPException, Depends
+from typing import Optional
+from datetime import datetime, timezone, timedelta
+
+from fox.archive import archive_source, needs_archive
+from fox.db import TracedDictCursor, get_read_db, to_naive_utc
+from fox.models import (DumpsterUtilization, MaintenanceAnalyticsReport, MaintenanceGroupStats, OrderType,
+                        OverdueMaintenance, SizeUtilization, User, UtilizationReport)
+from fox.security import get_current_user
+
+router = APIRouter()
+
+# Analytics
+SECONDS_PER_DAY = 86400.0
+
+def compute_utilization(dumpsters, order_events, maintenance_rows, revenue_rows, period_seconds: int):
+    """Per-dumpster (occupied, maintenance, idle) days and revenue as numpy arrays.
+
+    Offsets are seconds relative to the range start. ``order_events`` are the
+    completed orders, ordered by (dumpster_id, event_offset): occupancy
+    intervals are derived in a single pass (placement opens, removal closes,
+    exchange keeps the dumpster on site), then clipped and summed with numpy.
+    """
+    import numpy as np  # deferred: only the analytics reports need it
+    index = {d["id"]: i for i, d in enumerate(dumpsters)}
+    n = len(dumpsters)
+
+    occ_idx, occ_start, occ_end = [], [], []
+
+    def close_interval(i, opened, closed):
+        occ_idx.append(i)
+        occ_start.append(opened)
+        occ_end.append(closed)
+
+    current, since = None, None
+    for event in order_events:
+        i = index.get(event["dumpster_id"])
+        if i is None:
+            continue
+        if i != current:
+            if since is not None:
+                close_interval(current, since, period_seconds)
+            current, since = i, None
+        if event["order_type"] == OrderType.REMOVAL:
+            if since is not None:
+                close_interval(i, since, event["event_offset"])
+                since = None
+        elif since is None:
+            since = event["event_offset"]
+    if since is not None:
+        close_interval(current, since, period_seconds)
+
+    def clipped_days(idx, starts, ends):
+        if not idx:
+            return np.zeros(n)
+        s = np.clip(np.array(starts, dtype=np.int64), 0, period_seconds)
+        e = np.clip(np.array(ends, dtype=np.int64), 0, period_seconds)
+        seconds = np.maximum(e - s, 0).astype(np.float64)
+        return np.bincount(np.array(idx, dtype=np.int64), weights=seconds, minlength=n) / SECONDS_PER_DAY
+
+    maintenance_rows = [m for m in maintenance_rows if m["dumpster_id"] in index]
+    period_days = period_seconds / SECONDS_PER_DAY
+    occupied = np.minimum(clipped_days(occ_idx, occ_start, occ_end), period_days)
+    maintenance = np.minimum(clipped_days(
+        [index[m["dumpster_id"]] for m in maintenance_rows],
+        [m["start_offset"] for m in maintenance_rows],
+        [period_seconds if m["end_offset"] is None else m["end_offset"] for m in maintenance_rows]
+    ), period_days)
+    idle = np.maximum(period_days - occupied - maintenance, 0.0)
+
+    revenue = np.zeros(n)
+    for r in revenue_rows:
+        i = index.get(r["dumpster_id"])
+        if i is not None:
+            revenue[i] = float(r["revenue"])
+    return occupied, maintenance, idle, revenue
+
+def build_utilization_report(dumpsters, occupied, maintenance, idle, revenue, start: datetime, end: datetime) -> UtilizationReport:
+    import numpy as np
+    period_days = (end - start).total_seconds() / SECONDS_PER_DAY
+
+    def percent(part, total):
+        part = np.asarray(part, dtype=np.float64)
+        total = np.asarray(total, dtype=np.float64)
+        return np.divide(part * 100.0, total, out=np.zeros_like(part), where=total > 0)
+
+    occupancy = percent(occupied, np.full(len(dumpsters), period_days))
+    dumpster_rows = [
+        DumpsterUtilization(
+            dumpster_id=d["id"], identifier=d["identifier"], size=d["size"],
+            occupied_days=round(float(occupied[i]), 2), idle_days=round(float(idle[i]), 2),
+            maintenance_days=round(float(maintenance[i]), 2),
+            occupancy_percent=round(float(occupancy[i]), 2),
+            revenue=round(float(revenue[i]), 2), revenue_per_day=round(float(revenue[i]) / period_days, 2)
+        )
+        for i, d in enumerate(dumpsters)
+    ]
+
+    sizes = sorted({d["size"] for d in dumpsters})
+    size_index = {s: i for i, s in enumerate(sizes)}
+    size_of = np.array([size_index[d["size"]] for d in dumpsters], dtype=np.int64)
+
+    def by_size(values):
+        return np.bincount(size_of, weights=values, minlength=len(sizes))
+
+    counts = np.bincount(size_of, minlength=len(sizes))
+    size_occupied, size_maintenance = by_size(occupied), by_size(maintenance)
+    size_idle, size_revenue = by_size(idle), by_size(revenue)
+    size_occupancy = percent(size_occupied, counts * period_days)
+    size_rows = [
+        SizeUtilization(
+            size=s, dumpster_count=int(counts[i]),
+            occupied_days=round(float(size_occupied[i]), 2), idle_days=round(float(size_idle[i]), 2),
+            maintenance_days=round(float(size_maintenance[i]), 2),
+            occupancy_percent=round(float(size_occupancy[i]), 2),
+            revenue=round(float(size_revenue[i]), 2), revenue_per_day=round(float(size_revenue[i]) / period_days, 2)
+        )
+        for i, s in enumerate(sizes)
+    ]
+
+    return UtilizationReport(
+        start_date=start, end_date=end, period_days=round(period_days, 2),
+        dumpsters=dumpster_rows, sizes=size_rows
+    )
+
+@router.get("/analytics/dumpster-utilization", response_model=UtilizationReport)
+async def get_dumpster_utilization(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    current_user: User = Depends(get_current_user)
+):
+    end = to_naive_utc(end_date) if end_date else datetime.now(timezone.utc).replace(tzinfo=None)
+    start = to_naive_utc(start_date) if start_date else end - timedelta(days=90)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start_date must be before end_date")
+    period_seconds = int((end - start).total_seconds())
+
+    pool = await get_read_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            await cursor.execute("SELECT id, identifier, size FROM dumpsters WHERE deleted_at IS NULL ORDER BY identifier")
+            dumpsters = await cursor.fetchall()
+
+            orders = archive_source("orders", await needs_archive(cursor, start))
+            # Completed orders inside the range plus, per dumpster, the last one
+            # before it (the state at range start), sorted for the single-pass
+            # sweep by the same event time the offsets are computed from
+            await cursor.execute(
+                f"""SELECT o.dumpster_id, o.order_type, COALESCE(o.completed_date, o.scheduled_date) AS event_at,
+                          TIMESTAMPDIFF(SECOND, %s, COALESCE(o.completed_date, o.scheduled_date)) AS event_offset
+                   FROM {orders} o
+                   WHERE o.status = 'completed'
+                     AND COALESCE(o.completed_date, o.scheduled_date) >= %s
+                     AND COALESCE(o.completed_date, o.scheduled_date) < %s
+                   UNION ALL
+                   SELECT o.dumpster_id, o.order_type, COALESCE(o.completed_date, o.scheduled_date) AS event_at,
+                          TIMESTAMPDIFF(SECOND, %s, COALESCE(o.completed_date, o.scheduled_date)) AS event_offset
+                   FROM {orders} o
+                   JOIN (SELECT dumpster_id, MAX(COALESCE(completed_date, scheduled_date)) AS last_at
+                         FROM {orders} prev_orders
+                         WHERE status = 'completed' AND COALESCE(completed_date, scheduled_date) < %s
+                         GROUP BY dumpster_id) prev
+                     ON prev.dumpster_id = o.dumpster_id
+                    AND prev.last_at = COALESCE(o.completed_date, o.scheduled_date)
+                   WHERE o.status = 'completed'
+                   ORDER BY dumpster_id, event_at""",
+                (start, start, end, start, start)
+            )
+            order_events = await cursor.fetchall()
+
+            await cursor.execute(
+                f"""SELECT dumpster_id, COALESCE(SUM(rental_value), 0) AS revenue
+                   FROM {orders} o
+                   WHERE status != 'cancelled' AND scheduled_date >= %s AND scheduled_date < %s
+                   GROUP BY dumpster_id""",
+                (start, end)
+            )
+            revenue_rows = await cursor.fetchall()
+
+            await cursor.execute(
+                """SELECT dumpster_id,
+                          TIMESTAMPDIFF(SECOND, %s, start_date) AS start_offset,
+                          TIMESTAMPDIFF(SECOND, %s, COALESCE(actual_end_date,
+                              IF(status = 'in_progress', NULL, expected_end_date))) AS end_offset
+                   FROM dumpster_maintenance
+                   WHERE status != 'cancelled' AND start_date < %s
+                     AND (actual_end_date IS NULL OR actual_end_date > %s)""",
+                (start, start, end, start)
+            )
+            maintenance_rows = await cursor.fetchall()
+
+    occupied, maintenance, idle, revenue = compute_utilization(
+        dumpsters, order_events, maintenance_rows, revenue_rows, period_seconds
+    )
+    return build_utilization_report(dumpsters, occupied, maintenance, idle, revenue, start, end)
+
+MAINTENANCE_GROUP_SQL = """
+    SELECT group_key AS `key`,
+           COUNT(*) AS job_count,
+           COALESCE(SUM(status = 'completed'), 0) AS completed_jobs,
+           COALESCE(SUM(status = 'in_progress'), 0) AS in_progress_jobs,
+           COALESCE(SUM(overdue), 0) AS overdue_jobs,
+           COALESCE(SUM(estimated_cost), 0) AS total_estimated_cost,
+           COALESCE(SUM(actual_cost), 0) AS total_actual_cost,
+           AVG(CASE WHEN estimated_cost > 0 AND actual_cost IS NOT NULL
+                    THEN actual_cost / estimated_cost END) AS avg_cost_ratio,
+           AVG(CASE WHEN estimated_cost > 0 AND actual_cost IS NOT NULL
+                    THEN ABS(actual_cost - estimated_cost) / estimated_cost END) * 100 AS mean_abs_estimate_error_percent,
+           AVG(downtime_days) AS avg_downtime_days,
+           MIN(CASE WHEN rn >= CEIL(0.5 * cnt) THEN downtime_days END) AS p50_downtime_days,
+           MIN(CASE WHEN rn >= CEIL(0.9 * cnt) THEN downtime_days END) AS p90_downtime_days
+    FROM (
+        SELECT jobs.*,
+               ROW_NUMBER() OVER (PARTITION BY group_key ORDER BY downtime_days) AS rn,
+               COUNT(*) OVER (PARTITION BY group_key) AS cnt
+        FROM (
+            SELECT {group_expr} AS group_key, m.status, m.estimated_cost, m.actual_cost,
+                   (m.status = 'in_progress' AND m.expected_end_date < %s) AS overdue,
+                   TIMESTAMPDIFF(SECOND, m.start_date, COALESCE(m.actual_end_date, %s)) / 86400 AS downtime_days
+            FROM dumpster_maintenance m
+            JOIN dumpsters d ON d.id = m.dumpster_id AND d.deleted_at IS NULL
+            WHERE m.status != 'cancelled' AND m.start_date >= %s AND m.start_date < %s
+        ) jobs
+    ) ranked
+    GROUP BY group_key
+    ORDER BY total_actual_cost DESC
+"""
+
+@router.get("/analytics/maintenance", response_model=MaintenanceAnalyticsReport)
+async def get_maintenance_analytics(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    current_user: User = Depends(get_current_user)
+):
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    end = to_naive_utc(end_date) if end_date else now
+    start = to_naive_utc(start_date) if start_date else end - timedelta(days=365)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start_date must be before end_date")
+
+    pool = await get_read_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            # Percentiles are nearest-rank over ROW_NUMBER, so they stay in SQL
+            await cursor.execute(
+                MAINTENANCE_GROUP_SQL.format(group_expr="m.supplier"),
+                (now, now, start, end)
+            )
+            by_supplier = await cursor.fetchall()
+
+            await cursor.execute(
+                MAINTENANCE_GROUP_SQL.format(group_expr="d.size"),
+                (now, now, start, end)
+            )
+            by_size = await cursor.fetchall()
+
+            await cursor.execute(
+                """SELECT m.id, m.dumpster_id, d.identifier AS dumpster_identifier, m.supplier,
+                          m.start_date, m.expected_end_date,
+                          TIMESTAMPDIFF(SECOND, m.expected_end_date, %s) / 86400 AS days_overdue
+                   FROM dumpster_maintenance m
+                   JOIN dumpsters d ON d.id = m.dumpster_id AND d.deleted_at IS NULL
+                   WHERE m.status = 'in_progress' AND m.expected_end_date < %s
+                     AND m.start_date >= %s AND m.start_date < %s
+                   ORDER BY m.expected_end_date ASC""",
+                (now, now, start, end)
+            )
+            overdue = await cursor.fetchall()
+
+    return MaintenanceAnalyticsReport(
+        start_date=start, end_date=end,
+        by_supplier=[MaintenanceGroupStats(**row) for row in by_supplier],
+        by_size=[MaintenanceGroupStats(**row) for row in by_size],
+        overdue=[OverdueMaintenance(**row) for row in overdue]
+    )
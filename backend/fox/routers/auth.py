@@ -0,0 +1,43 @@
+from fastapi import APIRouter, HTTPException
+from datetime import datetime, timezone
+
+from fox.db import TracedDictCursor, get_db
+from fox.models import Token, User, UserCreate, UserLogin
+from fox.security import create_access_token, hash_password, verify_password
+
+router = APIRouter()
+
+# Auth routes
+@router.post("/auth/register", response_model=Token)
+async def register(user_data: UserCreate):
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            await cursor.execute("SELECT email FROM users WHERE email = %s", (user_data.email,))
+            existing = await cursor.fetchone()
+            if existing:
+                raise HTTPException(status_code=400, detail="Email already registered")
+            
+            hashed_pw = hash_password(user_data.password)
+            await cursor.execute(
+                "INSERT INTO users (email, password, full_name, created_at) VALUES (%s, %s, %s, %s)",
+                (user_data.email, hashed_pw, user_data.full_name, datetime.now(timezone.utc))
+            )
+            
+            access_token = create_access_token(data={"sub": user_data.email})
+            user = User(email=user_data.email, full_name=user_data.full_name)
+            return Token(access_token=access_token, user=user)
+
+@router.post("/auth/login", response_model=Token)
+async def login(credentials: UserLogin):
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            await cursor.execute("SELECT * FROM users WHERE email = %s", (credentials.email,))
+            user = await cursor.fetchone()
+            if not user or not verify_password(credentials.password, user["password"]):
+                raise HTTPException(status_code=401, detail="Invalid email or password")
+            
+            access_token = create_access_token(data={"sub": credentials.email})
+            user_obj = User(email=user["email"], full_name=user["full_name"])
+            return Token(access_token=access_token, user=user_obj)
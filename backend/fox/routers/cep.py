@@ -0,0 +1,55 @@
+from fastapi import APIRouter, HTTPException, Depends, Query
+from typing import Optional
+
+from fox.cepindex import (CEP_AUTOCOMPLETE_MAX_LIMIT, address_index, clean_cep, lookup_address, lookup_counters,
+                          search_addresses)
+from fox.models import User
+from fox.security import get_current_user
+
+router = APIRouter()
+
+# Address autocomplete, served from the local index only
+@router.get("/cep/autocomplete")
+async def autocomplete_address(q: str = Query(..., min_length=2), city: Optional[str] = None,
+                               state: Optional[str] = None,
+                               limit: int = Query(10, ge=1, le=CEP_AUTOCOMPLETE_MAX_LIMIT),
+                               current_user: User = Depends(get_current_user)):
+    return search_addresses(q, limit, city, state)
+
+# CEP Lookup: local index first, ViaCEP on a miss
+@router.get("/cep/{cep}")
+async def get_address_by_cep(cep: str, current_user: User = Depends(get_current_user)):
+    # Remove non-numeric characters
+    cep_clean = clean_cep(cep)
+
+    if len(cep_clean) != 8:
+        raise HTTPException(status_code=400, detail="CEP must have 8 digits")
+
+    local = lookup_address(cep_clean)
+    if local:
+        return local
+
+    import httpx  # deferred: only this route talks to ViaCEP
+    lookup_counters["viacep_fallbacks"] += 1
+    try:
+        async with httpx.AsyncClient() as client:
+            response = await client.get(f"https://viacep.com.br/ws/{cep_clean}/json/")
+            response.raise_for_status()
+            data = response.json()
+
+            if data.get("erro"):
+                raise HTTPException(status_code=404, detail="CEP not found")
+
+            address_index.add(cep_clean, data.get("logradouro", ""), data.get("bairro", ""),
+                              data.get("localidade", ""), data.get("uf", ""), source="viacep")
+            return {
+                "cep": data.get("cep", ""),
+                "street": data.get("logradouro", ""),
+                "complement": data.get("complemento", ""),
+                "neighborhood": data.get("bairro", ""),
+                "city": data.get("localidade", ""),
+                "state": data.get("uf", ""),
+                "source": "viacep"
+            }
+    except httpx.HTTPError:
+        raise HTTPException(status_code=503, detail="Error connecting to CEP service")
@@ -0,0 +1,440 @@
+from fastapi import APIRouter, HTTPException, Depends, Request, Response, UploadFile, File
+from typing import List, Optional
+from datetime import datetime, timezone
+import uuid
+
+import aiomysql
+
+from fox.archive import archive_columns, date_range, needs_archive, with_archive
+from fox.cepindex import remember_addresses
+from fox.clientimport import CLIENT_IMPORT_MAX_BYTES, document_key, import_clients, read_spreadsheet, validate_rows
+from fox.cache import get_cached_row, invalidate_cached, touch_tables
+from fox.contacts import demote_primary, ensure_primary, lock_client, replace_contacts
+from fox.db import TracedDictCursor, get_db, get_read_db, transaction
+from fox.geo import locate_client_addresses
+from fox.models import (AccountsReceivable, Client, ClientAddress, ClientAddressCreate, ClientContacts,
+                        ClientContactsReplace, ClientCreate, ClientFinancialSummary, ClientImportReport, ClientPhone,
+                        ClientPhoneCreate, Order, OrderStatus, PurgeEntity, User)
+from fox.responses import check_not_modified, parse_fields, projected_response, select_list
+from fox.namesync import enqueue_name_sync
+from fox.purge import LIVE_CLIENT, soft_delete
+from fox.security import get_current_user
+
+router = APIRouter()
+
+DUPLICATE_ENTRY = 1062
+
+def duplicate_document(exc: aiomysql.IntegrityError) -> Exception:
+    # The only unique key a client write can hit besides the primary key is document_key
+    if exc.args and exc.args[0] == DUPLICATE_ENTRY:
+        return HTTPException(status_code=409, detail="A client with this document already exists")
+    return exc
+
+DOCUMENT_KEY_MAX_LENGTH = 14  # clients.document_normalized
+
+def checked_document(client: ClientCreate) -> str:
+    """The client's document keyed as the import keys it, for dedup; 400 only when empty or too long.
+
+    Check digits are not enforced here: the single-client routes always took
+    documents as typed, and existing clients must stay editable.
+    """
+    document = document_key(client.document)[0]
+    if not document:
+        raise HTTPException(status_code=400, detail="Document is required")
+    if len(document) > DOCUMENT_KEY_MAX_LENGTH:
+        raise HTTPException(status_code=400, detail=f"Document too long: {client.document}")
+    return document
+
+# Client routes
+@router.post("/clients", response_model=Client)
+async def create_client(client: ClientCreate, current_user: User = Depends(get_current_user)):
+    document = checked_document(client)
+    pool = await get_db()
+    client_id = str(uuid.uuid4())
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            try:
+                await cursor.execute(
+                    """INSERT INTO clients (id, name, email, phone, address, document, document_type,
+                       document_normalized, created_at)
+                       VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)""",
+                    (client_id, client.name, client.email, client.phone, client.address, 
+                     client.document, client.document_type, document,
+                     datetime.now(timezone.utc))
+                )
+            except aiomysql.IntegrityError as exc:
+                raise duplicate_document(exc)
+            await touch_tables(cursor, "clients")
+            
+            await cursor.execute("SELECT * FROM clients WHERE id = %s", (client_id,))
+            result = await cursor.fetchone()
+            return Client(**result)
+
+@router.post("/clients/import", response_model=ClientImportReport)
+async def import_clients_file(file: UploadFile = File(...), update_existing: bool = True, dry_run: bool = False,
+                              current_user: User = Depends(get_current_user)):
+    content = await file.read(CLIENT_IMPORT_MAX_BYTES + 1)
+    if len(content) > CLIENT_IMPORT_MAX_BYTES:
+        raise HTTPException(status_code=413, detail="Spreadsheet too large")
+    clients, report = validate_rows(read_spreadsheet(file.filename or "", content))
+    report.dry_run = dry_run
+
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            return await import_clients(conn, cursor, clients, report, update_existing, dry_run)
+
+@router.get("/clients", response_model=List[Client])
+async def get_clients(request: Request, response: Response, fields: Optional[str] = None,
+                      current_user: User = Depends(get_current_user)):
+    columns = parse_fields(fields, Client)
+    pool = await get_read_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            not_modified = await check_not_modified(request, response, cursor, ("clients",), columns)
+            if not_modified:
+                return not_modified
+            await cursor.execute(
+                f"SELECT {select_list(columns)} FROM clients WHERE deleted_at IS NULL ORDER BY created_at DESC"
+            )
+            clients = await cursor.fetchall()
+            if columns:
+                return projected_response(response, Client, columns, clients)
+            return [Client(**c) for c in clients]
+
+@router.get("/clients/{client_id}", response_model=Client)
+async def get_client(client_id: str, request: Request, response: Response, current_user: User = Depends(get_current_user)):
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            not_modified = await check_not_modified(request, response, cursor, ("clients",), client_id)
+            if not_modified:
+                return not_modified
+            client = await get_cached_row(cursor, "clients", client_id)
+            if not client:
+                raise HTTPException(status_code=404, detail="Client not found")
+            return Client(**client)
+
+@router.put("/clients/{client_id}", response_model=Client)
+async def update_client(client_id: str, client_data: ClientCreate, current_user: User = Depends(get_current_user)):
+    document = checked_document(client_data)
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            await cursor.execute("SELECT name FROM clients WHERE id = %s AND deleted_at IS NULL", (client_id,))
+            current = await cursor.fetchone()
+            if not current:
+                raise HTTPException(status_code=404, detail="Client not found")
+            try:
+                await cursor.execute(
+                    """UPDATE clients SET name = %s, email = %s, phone = %s, address = %s, document = %s,
+                       document_type = %s, document_normalized = %s WHERE id = %s AND deleted_at IS NULL""",
+                    (client_data.name, client_data.email, client_data.phone, 
+                     client_data.address, client_data.document, client_data.document_type,
+                     document, client_id)
+                )
+            except aiomysql.IntegrityError as exc:
+                raise duplicate_document(exc)
+            if current["name"] != client_data.name:
+                # Orders and receivables keep a copy of the name; refreshed by the name-sync job
+                await enqueue_name_sync(cursor, PurgeEntity.CLIENT, client_id)
+            await invalidate_cached(cursor, "clients", client_id)
+            await touch_tables(cursor, "clients")
+            
+            await cursor.execute("SELECT * FROM clients WHERE id = %s", (client_id,))
+            result = await cursor.fetchone()
+            return Client(**result)
+
+@router.delete("/clients/{client_id}")
+async def delete_client(client_id: str, current_user: User = Depends(get_current_user)):
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            # Hidden right away; orders, receivables and contacts go in the background purge
+            job_id = await soft_delete(cursor, PurgeEntity.CLIENT, client_id, current_user.email)
+            if job_id is None:
+                raise HTTPException(status_code=404, detail="Client not found")
+            await touch_tables(cursor, "clients", "orders", "accounts_receivable")
+            return {"message": "Client deleted successfully", "purge_job_id": job_id}
+
+# Client Phones routes
+@router.post("/clients/{client_id}/phones", response_model=ClientPhone)
+async def create_client_phone(client_id: str, phone_data: ClientPhoneCreate, current_user: User = Depends(get_current_user)):
+    pool = await get_db()
+    phone_id = str(uuid.uuid4())
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            async with transaction(conn):
+                await lock_client(cursor, client_id)
+                if phone_data.is_primary:
+                    await demote_primary(cursor, "client_phones", client_id)
+                await cursor.execute(
+                    """INSERT INTO client_phones (id, client_id, phone, phone_type, is_primary, created_at)
+                       VALUES (%s, %s, %s, %s, %s, %s)""",
+                    (phone_id, client_id, phone_data.phone, phone_data.phone_type, 
+                     phone_data.is_primary, datetime.now(timezone.utc))
+                )
+                await ensure_primary(cursor, "client_phones", client_id)
+            await touch_tables(cursor, "client_phones")
+            
+            await cursor.execute("SELECT * FROM client_phones WHERE id = %s", (phone_id,))
+            result = await cursor.fetchone()
+            return ClientPhone(**result)
+
+@router.get("/clients/{client_id}/phones", response_model=List[ClientPhone])
+async def get_client_phones(client_id: str, current_user: User = Depends(get_current_user)):
+    pool = await get_read_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            await cursor.execute(
+                "SELECT * FROM client_phones WHERE client_id = %s ORDER BY is_primary DESC, created_at ASC",
+                (client_id,)
+            )
+            phones = await cursor.fetchall()
+            return [ClientPhone(**p) for p in phones]
+
+@router.put("/clients/{client_id}/phones/{phone_id}", response_model=ClientPhone)
+async def update_client_phone(client_id: str, phone_id: str, phone_data: ClientPhoneCreate, current_user: User = Depends(get_current_user)):
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            async with transaction(conn):
+                await lock_client(cursor, client_id)
+                await cursor.execute("SELECT id FROM client_phones WHERE id = %s AND client_id = %s",
+                                     (phone_id, client_id))
+                if not await cursor.fetchone():
+                    raise HTTPException(status_code=404, detail="Phone not found")
+                if phone_data.is_primary:
+                    await demote_primary(cursor, "client_phones", client_id)
+                await cursor.execute(
+                    "UPDATE client_phones SET phone = %s, phone_type = %s, is_primary = %s WHERE id = %s",
+                    (phone_data.phone, phone_data.phone_type, phone_data.is_primary, phone_id)
+                )
+                await ensure_primary(cursor, "client_phones", client_id)
+            await touch_tables(cursor, "client_phones")
+            
+            await cursor.execute("SELECT * FROM client_phones WHERE id = %s", (phone_id,))
+            result = await cursor.fetchone()
+            return ClientPhone(**result)
+
+@router.delete("/clients/{client_id}/phones/{phone_id}")
+async def delete_client_phone(client_id: str, phone_id: str, current_user: User = Depends(get_current_user)):
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            async with transaction(conn):
+                await lock_client(cursor, client_id)
+                await cursor.execute(
+                    "DELETE FROM client_phones WHERE id = %s AND client_id = %s",
+                    (phone_id, client_id)
+                )
+                if cursor.rowcount == 0:
+                    raise HTTPException(status_code=404, detail="Phone not found")
+                await ensure_primary(cursor, "client_phones", client_id)
+            await touch_tables(cursor, "client_phones")
+            return {"message": "Phone deleted successfully"}
+
+# Client Addresses routes
+@router.post("/clients/{client_id}/addresses", response_model=ClientAddress)
+async def create_client_address(client_id: str, address_data: ClientAddressCreate, current_user: User = Depends(get_current_user)):
+    pool = await get_db()
+    address_id = str(uuid.uuid4())
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            async with transaction(conn):
+                await lock_client(cursor, client_id)
+                if address_data.is_primary:
+                    await demote_primary(cursor, "client_addresses", client_id)
+                await cursor.execute(
+                    """INSERT INTO client_addresses (id, client_id, address_type, cep, street, number, 
+                       complement, neighborhood, city, state, is_primary, created_at)
+                       VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""",
+                    (address_id, client_id, address_data.address_type, address_data.cep,
+                     address_data.street, address_data.number, address_data.complement,
+                     address_data.neighborhood, address_data.city, address_data.state,
+                     address_data.is_primary, datetime.now(timezone.utc))
+                )
+                await ensure_primary(cursor, "client_addresses", client_id)
+                await locate_client_addresses(cursor, [client_id])
+            await touch_tables(cursor, "client_addresses")
+            remember_addresses([address_data.model_dump()])
+            
+            await cursor.execute("SELECT * FROM client_addresses WHERE id = %s", (address_id,))
+            result = await cursor.fetchone()
+            return ClientAddress(**result)
+
+@router.get("/clients/{client_id}/addresses", response_model=List[ClientAddress])
+async def get_client_addresses(client_id: str, current_user: User = Depends(get_current_user)):
+    pool = await get_read_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            await cursor.execute(
+                "SELECT * FROM client_addresses WHERE client_id = %s ORDER BY is_primary DESC, created_at ASC",
+                (client_id,)
+            )
+            addresses = await cursor.fetchall()
+            return [ClientAddress(**a) for a in addresses]
+
+@router.put("/clients/{client_id}/addresses/{address_id}", response_model=ClientAddress)
+async def update_client_address(client_id: str, address_id: str, address_data: ClientAddressCreate, current_user: User = Depends(get_current_user)):
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            async with transaction(conn):
+                await lock_client(cursor, client_id)
+                await cursor.execute("SELECT id FROM client_addresses WHERE id = %s AND client_id = %s",
+                                     (address_id, client_id))
+                if not await cursor.fetchone():
+                    raise HTTPException(status_code=404, detail="Address not found")
+                if address_data.is_primary:
+                    await demote_primary(cursor, "client_addresses", client_id)
+                await cursor.execute(
+                    """UPDATE client_addresses SET address_type = %s, cep = %s, street = %s, 
+                       number = %s, complement = %s, neighborhood = %s, city = %s, state = %s, 
+                       is_primary = %s WHERE id = %s""",
+                    (address_data.address_type, address_data.cep, address_data.street,
+                     address_data.number, address_data.complement, address_data.neighborhood,
+                     address_data.city, address_data.state, address_data.is_primary, address_id)
+                )
+                await ensure_primary(cursor, "client_addresses", client_id)
+                await locate_client_addresses(cursor, [client_id])
+            await touch_tables(cursor, "client_addresses")
+            remember_addresses([address_data.model_dump()])
+            
+            await cursor.execute("SELECT * FROM client_addresses WHERE id = %s", (address_id,))
+            result = await cursor.fetchone()
+            return ClientAddress(**result)
+
+@router.delete("/clients/{client_id}/addresses/{address_id}")
+async def delete_client_address(client_id: str, address_id: str, current_user: User = Depends(get_current_user)):
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            async with transaction(conn):
+                await lock_client(cursor, client_id)
+                await cursor.execute(
+                    "DELETE FROM client_addresses WHERE id = %s AND client_id = %s",
+                    (address_id, client_id)
+                )
+                if cursor.rowcount == 0:
+                    raise HTTPException(status_code=404, detail="Address not found")
+                await ensure_primary(cursor, "client_addresses", client_id)
+            await touch_tables(cursor, "client_addresses")
+            return {"message": "Address deleted successfully"}
+
+@router.put("/clients/{client_id}/contacts", response_model=ClientContacts)
+async def replace_client_contacts(client_id: str, contacts: ClientContactsReplace,
+                                  current_user: User = Depends(get_current_user)):
+    """Replace a client's phones and/or addresses in one transaction."""
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            changes, changed_tables = 0, []
+            async with transaction(conn):
+                await lock_client(cursor, client_id)
+                for table, entries in (("client_phones", contacts.phones), ("client_addresses", contacts.addresses)):
+                    if entries is None:
+                        continue
+                    changed = await replace_contacts(cursor, table, client_id, entries)
+                    if changed:
+                        changes += changed
+                        changed_tables.append(table)
+                if "client_addresses" in changed_tables:
+                    await locate_client_addresses(cursor, [client_id])
+            if changed_tables:
+                await touch_tables(cursor, *changed_tables)
+            if "client_addresses" in changed_tables:
+                remember_addresses(entry.model_dump() for entry in contacts.addresses)
+
+            await cursor.execute(
+                "SELECT * FROM client_phones WHERE client_id = %s ORDER BY is_primary DESC, created_at ASC",
+                (client_id,)
+            )
+            phones = [ClientPhone(**p) for p in await cursor.fetchall()]
+            await cursor.execute(
+                "SELECT * FROM client_addresses WHERE client_id = %s ORDER BY is_primary DESC, created_at ASC",
+                (client_id,)
+            )
+            addresses = [ClientAddress(**a) for a in await cursor.fetchall()]
+            return ClientContacts(phones=phones, addresses=addresses, changes=changes)
+
+# Client Financial Summary
+@router.get("/clients/{client_id}/financial-summary", response_model=ClientFinancialSummary)
+async def get_client_financial_summary(client_id: str, request: Request, response: Response,
+                                       date_from: Optional[datetime] = None, date_to: Optional[datetime] = None,
+                                       current_user: User = Depends(get_current_user)):
+    pool = await get_read_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            not_modified = await check_not_modified(request, response, cursor,
+                                                    ("clients", "orders", "accounts_receivable"), client_id,
+                                                    date_from, date_to)
+            if not_modified:
+                return not_modified
+            # Get client
+            await cursor.execute("SELECT * FROM clients WHERE id = %s AND deleted_at IS NULL", (client_id,))
+            client = await cursor.fetchone()
+            if not client:
+                raise HTTPException(status_code=404, detail="Client not found")
+            
+            # Orders by creation date, receivables by due date; the archive
+            # is only read when the range reaches back past its watermark
+            include_archive = await needs_archive(cursor, date_from)
+            conditions, params = date_range("created_at", date_from, date_to)
+            await cursor.execute(*with_archive(
+                "orders", archive_columns("orders"), " AND ".join(["client_id = %s"] + conditions),
+                (client_id, *params), "created_at DESC", include_archive
+            ))
+            orders = await cursor.fetchall()
+            
+            conditions, params = date_range("due_date", date_from, date_to)
+            await cursor.execute(*with_archive(
+                "accounts_receivable", archive_columns("accounts_receivable"),
+                " AND ".join(["client_id = %s"] + conditions), (client_id, *params), "due_date ASC", include_archive
+            ))
+            accounts = await cursor.fetchall()
+            
+            # Calculate statistics
+            total_orders = len(orders)
+            pending_orders = len([o for o in orders if o["status"] == OrderStatus.PENDING or o["status"] == OrderStatus.IN_PROGRESS])
+            completed_orders = len([o for o in orders if o["status"] == OrderStatus.COMPLETED])
+            
+            total_receivable = sum(a["amount"] for a in accounts)
+            total_received = sum(a["amount"] for a in accounts if a["is_received"])
+            pending_amount = sum(a["amount"] for a in accounts if not a["is_received"])
+            
+            return ClientFinancialSummary(
+                client=Client(**client),
+                total_orders=total_orders,
+                pending_orders=pending_orders,
+                completed_orders=completed_orders,
+                total_receivable=total_receivable,
+                total_received=total_received,
+                pending_amount=pending_amount,
+                orders=[Order(**o) for o in orders],
+                accounts_receivable=[AccountsReceivable(**a) for a in accounts]
+            )
+
+# Client order history
+@router.get("/clients/{client_id}/orders", response_model=List[Order])
+async def get_client_orders(client_id: str, request: Request, response: Response, fields: Optional[str] = None,
+                            date_from: Optional[datetime] = None, date_to: Optional[datetime] = None,
+                            current_user: User = Depends(get_current_user)):
+    columns = parse_fields(fields, Order)
+    pool = await get_read_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            not_modified = await check_not_modified(request, response, cursor, ("orders",), client_id, columns,
+                                                    date_from, date_to)
+            if not_modified:
+                return not_modified
+            conditions, params = date_range("created_at", date_from, date_to)
+            await cursor.execute(*with_archive(
+                "orders", select_list(columns, default=archive_columns("orders")),
+                " AND ".join(["client_id = %s", LIVE_CLIENT] + conditions), (client_id, *params), "created_at DESC",
+                await needs_archive(cursor, date_from)
+            ))
+            orders = await cursor.fetchall()
+            if columns:
+                return projected_response(response, Order, columns, orders)
+            return [Order(**o) for o in orders]
@@ -0,0 +1,99 @@
+from fastapi import APIRouter, Depends, Request, Response
+from datetime import datetime, timezone
+
+from fox.archive import needs_archive
+from fox.db import TracedDictCursor, get_read_db
+from fox.models import DashboardStats, User
+from fox.responses import check_not_modified
+from fox.security import get_current_user
+
+router = APIRouter()
+
+# Dashboard stats
+@router.get("/dashboard/stats", response_model=DashboardStats)
+async def get_dashboard_stats(request: Request, response: Response, current_user: User = Depends(get_current_user)):
+    pool = await get_read_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            # Monthly revenue rolls over with the calendar, so the month is part of the tag
+            not_modified = await check_not_modified(request, response, cursor,
+                                                    ("dumpsters", "orders", "accounts_receivable", "accounts_payable"),
+                                                    datetime.now(timezone.utc).strftime("%Y-%m"))
+            if not_modified:
+                return not_modified
+            # Count dumpsters by status
+            await cursor.execute("SELECT COUNT(*) as total FROM dumpsters WHERE deleted_at IS NULL")
+            result = await cursor.fetchone()
+            total_dumpsters = result['total']
+            
+            await cursor.execute("SELECT COUNT(*) as total FROM dumpsters WHERE status = 'available' AND deleted_at IS NULL")
+            result = await cursor.fetchone()
+            available_dumpsters = result['total']
+            
+            await cursor.execute("SELECT COUNT(*) as total FROM dumpsters WHERE status = 'rented' AND deleted_at IS NULL")
+            result = await cursor.fetchone()
+            rented_dumpsters = result['total']
+            
+            # Count orders
+            await cursor.execute("SELECT COUNT(*) as total FROM orders WHERE status IN ('pending', 'in_progress')")
+            result = await cursor.fetchone()
+            active_orders = result['total']
+            
+            await cursor.execute("SELECT COUNT(*) as total FROM orders WHERE status = 'pending'")
+            result = await cursor.fetchone()
+            pending_orders = result['total']
+            
+            # Calculate revenue for current month
+            now = datetime.now(timezone.utc)
+            start_of_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+            await cursor.execute(
+                "SELECT COALESCE(SUM(rental_value), 0) as total FROM orders WHERE created_at >= %s",
+                (start_of_month,)
+            )
+            result = await cursor.fetchone()
+            total_revenue_month = float(result['total'])
+            
+            # Calculate receivables
+            await cursor.execute(
+                "SELECT COALESCE(SUM(amount), 0) as total FROM accounts_receivable WHERE is_received = FALSE"
+            )
+            result = await cursor.fetchone()
+            total_receivable = float(result['total'])
+            
+            # Calculate payables
+            await cursor.execute(
+                "SELECT COALESCE(SUM(amount), 0) as total FROM accounts_payable WHERE is_paid = FALSE"
+            )
+            result = await cursor.fetchone()
+            total_payable = float(result['total'])
+            
+            # Calculate cash balance
+            await cursor.execute(
+                "SELECT COALESCE(SUM(amount), 0) as total FROM accounts_receivable WHERE is_received = TRUE"
+            )
+            result = await cursor.fetchone()
+            received = float(result['total'])
+            if await needs_archive(cursor, None):
+                # Only settled receivables are archived
+                await cursor.execute("SELECT COALESCE(SUM(amount), 0) as total FROM accounts_receivable_archive")
+                received += float((await cursor.fetchone())['total'])
+            
+            await cursor.execute(
+                "SELECT COALESCE(SUM(amount), 0) as total FROM accounts_payable WHERE is_paid = TRUE"
+            )
+            result = await cursor.fetchone()
+            paid = float(result['total'])
+            
+            cash_balance = received - paid
+            
+            return DashboardStats(
+                total_dumpsters=total_dumpsters,
+                available_dumpsters=available_dumpsters,
+                rented_dumpsters=rented_dumpsters,
+                active_orders=active_orders,
+                pending_orders=pending_orders,
+                total_revenue_month=total_revenue_month,
+                total_receivable=total_receivable,
+                total_payable=total_payable,
+                cash_balance=cash_balance
+            )
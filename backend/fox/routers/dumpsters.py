@@ -0,0 +1,177 @@
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from typing import List, Optional
+from datetime import datetime, timezone
+import uuid
+
+from fox.cache import get_cached_row, invalidate_cached, touch_tables
+from fox.db import TracedDictCursor, get_db, get_read_db, transaction
+from fox.geo import GEO_MAX_RADIUS_KM, dumpster_grid, origin_position, text_position
+from fox.history import record_status_change
+from fox.models import Dumpster, DumpsterCreate, DumpsterDistance, DumpsterStatus, HistoryEntity, PurgeEntity, User
+from fox.responses import check_not_modified, parse_fields, projected_response, select_list
+from fox.namesync import enqueue_name_sync
+from fox.purge import soft_delete
+from fox.security import get_current_user
+
+router = APIRouter()
+
+# Dumpster routes
+@router.post("/dumpsters", response_model=Dumpster)
+async def create_dumpster(dumpster: DumpsterCreate, current_user: User = Depends(get_current_user)):
+    pool = await get_db()
+    dumpster_id = str(uuid.uuid4())
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            async with transaction(conn):
+                await cursor.execute(
+                    """INSERT INTO dumpsters (id, identifier, size, capacity, description, status, current_location, created_at)
+                       VALUES (%s, %s, %s, %s, %s, %s, %s, %s)""",
+                    (dumpster_id, dumpster.identifier, dumpster.size, dumpster.capacity,
+                     dumpster.description, DumpsterStatus.AVAILABLE, None, datetime.now(timezone.utc))
+                )
+                await record_status_change(cursor, HistoryEntity.DUMPSTER, dumpster_id, None,
+                                           DumpsterStatus.AVAILABLE, current_user.email)
+                await touch_tables(cursor, "dumpsters")
+            
+            await cursor.execute("SELECT * FROM dumpsters WHERE id = %s", (dumpster_id,))
+            result = await cursor.fetchone()
+            return Dumpster(**result)
+
+@router.get("/dumpsters", response_model=List[Dumpster])
+async def get_dumpsters(request: Request, response: Response, fields: Optional[str] = None,
+                        current_user: User = Depends(get_current_user)):
+    columns = parse_fields(fields, Dumpster)
+    pool = await get_read_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            not_modified = await check_not_modified(request, response, cursor, ("dumpsters",), columns)
+            if not_modified:
+                return not_modified
+            await cursor.execute(
+                f"SELECT {select_list(columns)} FROM dumpsters WHERE deleted_at IS NULL ORDER BY created_at DESC"
+            )
+            dumpsters = await cursor.fetchall()
+            if columns:
+                return projected_response(response, Dumpster, columns, dumpsters)
+            return [Dumpster(**d) for d in dumpsters]
+
+# Geographic queries; registered before /dumpsters/{dumpster_id}
+@router.get("/dumpsters/nearby", response_model=List[DumpsterDistance])
+async def get_dumpsters_nearby(latitude: Optional[float] = Query(None, ge=-90, le=90),
+                               longitude: Optional[float] = Query(None, ge=-180, le=180),
+                               cep: Optional[str] = None, address_id: Optional[str] = None,
+                               radius_km: float = Query(5, gt=0, le=GEO_MAX_RADIUS_KM),
+                               status: Optional[List[DumpsterStatus]] = Query(None),
+                               current_user: User = Depends(get_current_user)):
+    """Dumpsters within ``radius_km`` of the origin, closest first (e.g. rented ones near a site)."""
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            origin = await origin_position(cursor, latitude, longitude, cep, address_id)
+            await dumpster_grid.refresh(cursor)
+    statuses = {s.value for s in status} if status else None
+    return [DumpsterDistance(**d) for d in dumpster_grid.within(*origin, radius_km, statuses)]
+
+@router.get("/dumpsters/nearest", response_model=List[DumpsterDistance])
+async def get_nearest_dumpsters(latitude: Optional[float] = Query(None, ge=-90, le=90),
+                                longitude: Optional[float] = Query(None, ge=-180, le=180),
+                                cep: Optional[str] = None, address_id: Optional[str] = None,
+                                k: int = Query(5, ge=1, le=50),
+                                status: List[DumpsterStatus] = Query([DumpsterStatus.AVAILABLE]),
+                                current_user: User = Depends(get_current_user)):
+    """The ``k`` closest dumpsters in ``status`` (available by default), up to GEO_MAX_RADIUS_KM away."""
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            origin = await origin_position(cursor, latitude, longitude, cep, address_id)
+            await dumpster_grid.refresh(cursor)
+    return [DumpsterDistance(**d) for d in dumpster_grid.nearest(*origin, k, {s.value for s in status})]
+
+@router.get("/dumpsters/{dumpster_id}", response_model=Dumpster)
+async def get_dumpster(dumpster_id: str, request: Request, response: Response, current_user: User = Depends(get_current_user)):
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            not_modified = await check_not_modified(request, response, cursor, ("dumpsters",), dumpster_id)
+            if not_modified:
+                return not_modified
+            dumpster = await get_cached_row(cursor, "dumpsters", dumpster_id)
+            if not dumpster:
+                raise HTTPException(status_code=404, detail="Dumpster not found")
+            return Dumpster(**dumpster)
+
+@router.put("/dumpsters/{dumpster_id}", response_model=Dumpster)
+async def update_dumpster(dumpster_id: str, dumpster_data: DumpsterCreate, current_user: User = Depends(get_current_user)):
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            await cursor.execute("SELECT identifier FROM dumpsters WHERE id = %s AND deleted_at IS NULL", (dumpster_id,))
+            current = await cursor.fetchone()
+            if not current:
+                raise HTTPException(status_code=404, detail="Dumpster not found")
+            await cursor.execute(
+                """UPDATE dumpsters SET identifier = %s, size = %s, capacity = %s, 
+                   description = %s WHERE id = %s AND deleted_at IS NULL""",
+                (dumpster_data.identifier, dumpster_data.size, dumpster_data.capacity,
+                 dumpster_data.description, dumpster_id)
+            )
+            if current["identifier"] != dumpster_data.identifier:
+                # Orders keep a copy of the identifier; refreshed by the name-sync job
+                await enqueue_name_sync(cursor, PurgeEntity.DUMPSTER, dumpster_id)
+            await invalidate_cached(cursor, "dumpsters", dumpster_id)
+            await touch_tables(cursor, "dumpsters")
+            
+            await cursor.execute("SELECT * FROM dumpsters WHERE id = %s", (dumpster_id,))
+            result = await cursor.fetchone()
+            return Dumpster(**result)
+
+@router.patch("/dumpsters/{dumpster_id}/status")
+async def update_dumpster_status(dumpster_id: str, status: DumpsterStatus, location: Optional[str] = None,
+                                 latitude: Optional[float] = Query(None, ge=-90, le=90),
+                                 longitude: Optional[float] = Query(None, ge=-180, le=180),
+                                 current_user: User = Depends(get_current_user)):
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            async with transaction(conn):
+                await cursor.execute(
+                    "SELECT status, current_location FROM dumpsters WHERE id = %s AND deleted_at IS NULL FOR UPDATE",
+                    (dumpster_id,)
+                )
+                dumpster = await cursor.fetchone()
+                if not dumpster:
+                    raise HTTPException(status_code=404, detail="Dumpster not found")
+                
+                if location or (latitude is not None and longitude is not None):
+                    # A new location without coordinates or a known CEP leaves the position unknown
+                    position = (latitude, longitude) if latitude is not None and longitude is not None \
+                        else await text_position(cursor, location)
+                    await cursor.execute(
+                        """UPDATE dumpsters SET status = %s, current_location = %s, latitude = %s, longitude = %s
+                           WHERE id = %s""",
+                        (status, location or dumpster["current_location"], *(position or (None, None)), dumpster_id)
+                    )
+                else:
+                    await cursor.execute(
+                        "UPDATE dumpsters SET status = %s WHERE id = %s",
+                        (status, dumpster_id)
+                    )
+                
+                await record_status_change(cursor, HistoryEntity.DUMPSTER, dumpster_id, dumpster["status"],
+                                           status, current_user.email,
+                                           location=location or dumpster["current_location"])
+            await invalidate_cached(cursor, "dumpsters", dumpster_id)
+            await touch_tables(cursor, "dumpsters")
+            return {"message": "Status updated successfully"}
+
+@router.delete("/dumpsters/{dumpster_id}")
+async def delete_dumpster(dumpster_id: str, current_user: User = Depends(get_current_user)):
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            # Hidden right away; orders and maintenance records go in the background purge
+            job_id = await soft_delete(cursor, PurgeEntity.DUMPSTER, dumpster_id, current_user.email)
+            if job_id is None:
+                raise HTTPException(status_code=404, detail="Dumpster not found")
+            await touch_tables(cursor, "dumpsters", "orders", "dumpster_maintenance")
+            return {"message": "Dumpster deleted successfully", "purge_job_id": job_id}
@@ -0,0 +1,237 @@
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response, UploadFile, File
+from typing import List, Optional
+from datetime import datetime, timezone
+import uuid
+import re
+
+from fox.archive import archive_columns, date_range, needs_archive, with_archive
+from fox.bulk import (BULK_CHUNK_SIZE, bulk_result, chunked, in_clause, resolve_bulk_ids, settle_accounts,
+                      settle_chunk)
+from fox.cache import touch_tables
+from fox.db import TracedDictCursor, get_db, get_read_db, transaction
+from fox.models import (AccountsPayable, AccountsPayableCreate, AccountsReceivable, BulkAccountSettle, BulkResult,
+                        ReconciliationReport, User)
+from fox.reconciliation import RECONCILIATION_MAX_BYTES, match_statement, parse_ofx, parse_statement_csv
+from fox.purge import LIVE_CLIENT
+from fox.responses import check_not_modified, parse_fields, projected_response, select_list
+from fox.security import get_current_user
+
+router = APIRouter()
+
+# Accounts Payable routes
+@router.post("/finance/accounts-payable", response_model=AccountsPayable)
+async def create_accounts_payable(account: AccountsPayableCreate, current_user: User = Depends(get_current_user)):
+    pool = await get_db()
+    account_id = str(uuid.uuid4())
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            await cursor.execute(
+                """INSERT INTO accounts_payable (id, description, amount, due_date, paid_date,
+                   category, is_paid, notes, created_at)
+                   VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)""",
+                (account_id, account.description, account.amount, account.due_date, None,
+                 account.category, False, account.notes, datetime.now(timezone.utc))
+            )
+            await touch_tables(cursor, "accounts_payable")
+            
+            await cursor.execute("SELECT * FROM accounts_payable WHERE id = %s", (account_id,))
+            result = await cursor.fetchone()
+            return AccountsPayable(**result)
+
+@router.get("/finance/accounts-payable", response_model=List[AccountsPayable])
+async def get_accounts_payable(request: Request, response: Response, fields: Optional[str] = None,
+                               current_user: User = Depends(get_current_user)):
+    columns = parse_fields(fields, AccountsPayable)
+    pool = await get_read_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            not_modified = await check_not_modified(request, response, cursor, ("accounts_payable",), columns)
+            if not_modified:
+                return not_modified
+            await cursor.execute(f"SELECT {select_list(columns)} FROM accounts_payable ORDER BY due_date DESC")
+            accounts = await cursor.fetchall()
+            if columns:
+                return projected_response(response, AccountsPayable, columns, accounts)
+            return [AccountsPayable(**a) for a in accounts]
+
+@router.patch("/finance/accounts-payable/{account_id}/pay")
+async def pay_account(account_id: str, current_user: User = Depends(get_current_user)):
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            await cursor.execute(
+                "UPDATE accounts_payable SET is_paid = %s, paid_date = %s WHERE id = %s",
+                (True, datetime.now(timezone.utc), account_id)
+            )
+            if cursor.rowcount == 0:
+                raise HTTPException(status_code=404, detail="Account not found")
+            await touch_tables(cursor, "accounts_payable")
+            return {"message": "Account marked as paid"}
+
+@router.post("/finance/accounts-payable/bulk-pay", response_model=BulkResult)
+async def bulk_pay_accounts(selection: BulkAccountSettle, current_user: User = Depends(get_current_user)):
+    conditions, params = ["is_paid = FALSE"], []
+    if selection.due_before:
+        conditions.append("due_date <= %s")
+        params.append(selection.due_before)
+    elif not selection.ids:
+        raise HTTPException(status_code=400, detail="Provide ids or at least one filter")
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            ids = await resolve_bulk_ids(cursor, "accounts_payable", selection.ids, conditions, params, "due_date")
+            results = await settle_accounts(conn, cursor, "accounts_payable", ids, datetime.now(timezone.utc))
+            await touch_tables(cursor, "accounts_payable")
+            return bulk_result(results)
+
+@router.delete("/finance/accounts-payable/{account_id}")
+async def delete_accounts_payable(account_id: str, current_user: User = Depends(get_current_user)):
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            await cursor.execute("DELETE FROM accounts_payable WHERE id = %s", (account_id,))
+            if cursor.rowcount == 0:
+                raise HTTPException(status_code=404, detail="Account not found")
+            await touch_tables(cursor, "accounts_payable")
+            return {"message": "Account deleted successfully"}
+
+# Accounts Receivable routes
+@router.get("/finance/accounts-receivable", response_model=List[AccountsReceivable])
+async def get_accounts_receivable(request: Request, response: Response, fields: Optional[str] = None,
+                                  date_from: Optional[datetime] = None, date_to: Optional[datetime] = None,
+                                  current_user: User = Depends(get_current_user)):
+    columns = parse_fields(fields, AccountsReceivable)
+    pool = await get_read_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            not_modified = await check_not_modified(request, response, cursor, ("accounts_receivable",), columns,
+                                                    date_from, date_to)
+            if not_modified:
+                return not_modified
+            conditions, params = date_range("due_date", date_from, date_to)
+            await cursor.execute(*with_archive(
+                "accounts_receivable", select_list(columns, default=archive_columns("accounts_receivable")),
+                " AND ".join([LIVE_CLIENT] + conditions), tuple(params), "due_date DESC",
+                await needs_archive(cursor, date_from)
+            ))
+            accounts = await cursor.fetchall()
+            if columns:
+                return projected_response(response, AccountsReceivable, columns, accounts)
+            return [AccountsReceivable(**a) for a in accounts]
+
+@router.patch("/finance/accounts-receivable/{account_id}/receive")
+async def receive_payment(account_id: str, current_user: User = Depends(get_current_user)):
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            await cursor.execute(
+                "UPDATE accounts_receivable SET is_received = %s, received_date = %s WHERE id = %s",
+                (True, datetime.now(timezone.utc), account_id)
+            )
+            if cursor.rowcount == 0:
+                raise HTTPException(status_code=404, detail="Account not found")
+            await touch_tables(cursor, "accounts_receivable")
+            return {"message": "Payment received"}
+
+@router.post("/finance/accounts-receivable/bulk-receive", response_model=BulkResult)
+async def bulk_receive_payments(selection: BulkAccountSettle, current_user: User = Depends(get_current_user)):
+    conditions, params = ["is_received = FALSE"], []
+    if selection.due_before:
+        conditions.append("due_date <= %s")
+        params.append(selection.due_before)
+    if selection.client_id:
+        conditions.append("client_id = %s")
+        params.append(selection.client_id)
+    if not selection.ids and len(conditions) == 1:
+        raise HTTPException(status_code=400, detail="Provide ids or at least one filter")
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            ids = await resolve_bulk_ids(cursor, "accounts_receivable", selection.ids, conditions, params, "due_date")
+            results = await settle_accounts(conn, cursor, "accounts_receivable", ids, datetime.now(timezone.utc))
+            await touch_tables(cursor, "accounts_receivable")
+            return bulk_result(results)
+
+@router.post("/finance/reconciliation", response_model=ReconciliationReport)
+async def reconcile_bank_statement(file: UploadFile = File(...), apply: bool = False,
+                                   date_tolerance_days: int = Query(3, ge=0, le=60),
+                                   current_user: User = Depends(get_current_user)):
+    content = await file.read(RECONCILIATION_MAX_BYTES + 1)
+    if len(content) > RECONCILIATION_MAX_BYTES:
+        raise HTTPException(status_code=413, detail="Statement file too large")
+    try:
+        text = content.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        # Brazilian banks still export OFX in cp1252
+        text = content.decode("cp1252", errors="replace")
+
+    if "<OFX>" in text.upper() or (file.filename or "").lower().endswith(".ofx"):
+        transactions = parse_ofx(text)
+    else:
+        transactions = parse_statement_csv(text)
+    # Keyed by transaction id: a line repeated in the file is only counted once
+    credits = list({t.transaction_id: t for t in transactions if t.amount > 0}.values())
+
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            # Lines applied by an earlier upload of an overlapping statement
+            reconciled = set()
+            include_archive = await needs_archive(cursor, None)
+            for chunk in chunked([c.transaction_id for c in credits], BULK_CHUNK_SIZE):
+                await cursor.execute(*with_archive(
+                    "accounts_receivable", "bank_transaction_id", f"bank_transaction_id IN ({in_clause(chunk)})",
+                    tuple(chunk), "bank_transaction_id", include_archive
+                ))
+                reconciled.update(row["bank_transaction_id"] for row in await cursor.fetchall())
+            pending = [c for c in credits if c.transaction_id not in reconciled]
+
+            await cursor.execute(
+                """SELECT ar.id, ar.client_id, ar.client_name, ar.amount, ar.due_date, c.document
+                   FROM accounts_receivable ar
+                   JOIN clients c ON ar.client_id = c.id
+                   WHERE ar.is_received = FALSE AND c.deleted_at IS NULL"""
+            )
+            receivables = await cursor.fetchall()
+            for receivable in receivables:
+                receivable["document_digits"] = re.sub(r"\D", "", receivable["document"] or "")
+            matches = match_statement(pending, receivables, date_tolerance_days)
+
+            if apply and matches:
+                by_date = {}
+                for match in matches:
+                    by_date.setdefault(match.transaction.date, []).append(match)
+                async with transaction(conn):
+                    for received_date, group in by_date.items():
+                        for chunk in chunked(group, BULK_CHUNK_SIZE):
+                            found = await settle_chunk(cursor, "accounts_receivable",
+                                                       [m.account_id for m in chunk], received_date)
+                            for match in chunk:
+                                match.applied = match.account_id in found and not found[match.account_id]
+                    await cursor.executemany(
+                        "UPDATE accounts_receivable SET bank_transaction_id = %s WHERE id = %s",
+                        [(m.transaction.transaction_id, m.account_id) for m in matches if m.applied]
+                    )
+                await touch_tables(cursor, "accounts_receivable")
+
+            matched_ids = {m.transaction.transaction_id for m in matches}
+            return ReconciliationReport(
+                lines=len(transactions),
+                credits=len(credits),
+                already_reconciled=len(credits) - len(pending),
+                matched=len(matches),
+                applied=sum(1 for m in matches if m.applied),
+                matches=matches,
+                unmatched=[c for c in pending if c.transaction_id not in matched_ids],
+            )
+
+@router.delete("/finance/accounts-receivable/{account_id}")
+async def delete_accounts_receivable(account_id: str, current_user: User = Depends(get_current_user)):
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            await cursor.execute("DELETE FROM accounts_receivable WHERE id = %s", (account_id,))
+            if cursor.rowcount == 0:
+                raise HTTPException(status_code=404, detail="Account not found")
+            await touch_tables(cursor, "accounts_receivable")
+            return {"message": "Account deleted successfully"}
@@ -0,0 +1,68 @@
+from fastapi import APIRouter, HTTPException, Depends, Query
+from typing import List, Optional
+from datetime import datetime, timezone
+
+from fox.db import TracedDictCursor, get_read_db, to_naive_utc
+from fox.models import HistoryEntity, StatusSnapshot, StatusTransition, User
+from fox.security import get_current_user
+
+router = APIRouter()
+
+# Status history routes
+@router.get("/history/{entity_type}/{entity_id}/as-of", response_model=StatusSnapshot)
+async def get_status_as_of(entity_type: HistoryEntity, entity_id: str, timestamp: Optional[datetime] = None,
+                           current_user: User = Depends(get_current_user)):
+    as_of = to_naive_utc(timestamp) if timestamp else datetime.now(timezone.utc).replace(tzinfo=None)
+    pool = await get_read_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            # Backward range scan on (entity_type, entity_id, changed_at): one row read
+            await cursor.execute(
+                """SELECT new_status, location, changed_at FROM status_history
+                   WHERE entity_type = %s AND entity_id = %s AND changed_at <= %s
+                   ORDER BY changed_at DESC, id DESC LIMIT 1""",
+                (entity_type.value, entity_id, as_of)
+            )
+            row = await cursor.fetchone()
+            if not row:
+                raise HTTPException(status_code=404, detail="No status recorded before this timestamp")
+            return StatusSnapshot(
+                entity_type=entity_type, entity_id=entity_id, as_of=as_of,
+                status=row["new_status"], location=row["location"], changed_at=row["changed_at"]
+            )
+
+@router.get("/history/{entity_type}/{entity_id}", response_model=List[StatusTransition])
+async def get_entity_transitions(entity_type: HistoryEntity, entity_id: str,
+                                 start_date: Optional[datetime] = None, end_date: Optional[datetime] = None,
+                                 current_user: User = Depends(get_current_user)):
+    start = to_naive_utc(start_date) if start_date else datetime(1970, 1, 1)
+    end = to_naive_utc(end_date) if end_date else datetime.now(timezone.utc).replace(tzinfo=None)
+    pool = await get_read_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            await cursor.execute(
+                """SELECT * FROM status_history
+                   WHERE entity_type = %s AND entity_id = %s AND changed_at >= %s AND changed_at <= %s
+                   ORDER BY changed_at ASC, id ASC""",
+                (entity_type.value, entity_id, start, end)
+            )
+            transitions = await cursor.fetchall()
+            return [StatusTransition(**t) for t in transitions]
+
+@router.get("/history/{entity_type}", response_model=List[StatusTransition])
+async def get_transitions_in_range(entity_type: HistoryEntity, start_date: datetime,
+                                   end_date: Optional[datetime] = None, limit: int = Query(1000, ge=1, le=10000),
+                                   current_user: User = Depends(get_current_user)):
+    start = to_naive_utc(start_date)
+    end = to_naive_utc(end_date) if end_date else datetime.now(timezone.utc).replace(tzinfo=None)
+    pool = await get_read_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            await cursor.execute(
+                """SELECT * FROM status_history
+                   WHERE entity_type = %s AND changed_at >= %s AND changed_at <= %s
+                   ORDER BY changed_at ASC, id ASC LIMIT %s""",
+                (entity_type.value, start, end, limit)
+            )
+            transitions = await cursor.fetchall()
+            return [StatusTransition(**t) for t in transitions]
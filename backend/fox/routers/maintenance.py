@@ -0,0 +1,349 @@
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
+from typing import List, Optional
+from datetime import datetime, timezone
+import uuid
+
+from fox.cache import get_cached_row, invalidate_cached, touch_tables
+from fox.db import TracedDictCursor, get_db, get_read_db, transaction
+from fox.history import record_status_change
+from fox.jobs import run_with_lock
+from fox.models import (DumpsterStatus, HistoryEntity, Maintenance, MaintenanceCreate, MaintenanceProposal,
+                        MaintenanceStatus, MaintenanceUpdate, ProposalStatus, SchedulerRunResult, User)
+from fox.preventive import PM_TIMEOUT_SECONDS, run_preventive_maintenance
+from fox.responses import check_not_modified, parse_fields, projected_response, select_list
+from fox.security import get_current_user
+
+router = APIRouter()
+
+# Maintenance routes
+@router.post("/dumpsters/{dumpster_id}/maintenance", response_model=Maintenance)
+async def create_maintenance(dumpster_id: str, maintenance: MaintenanceCreate, current_user: User = Depends(get_current_user)):
+    pool = await get_db()
+    maintenance_id = str(uuid.uuid4())
+    
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            async with transaction(conn):
+                # Locked, so the history row records the status this update really replaced
+                await cursor.execute(
+                    "SELECT identifier, status, current_location FROM dumpsters WHERE id = %s AND deleted_at IS NULL "
+                    "FOR UPDATE",
+                    (dumpster_id,)
+                )
+                dumpster = await cursor.fetchone()
+                if not dumpster:
+                    raise HTTPException(status_code=404, detail="Dumpster not found")
+                if dumpster["status"] == DumpsterStatus.RENTED:
+                    raise HTTPException(status_code=409, detail="Dumpster is rented")
+                if dumpster["status"] == DumpsterStatus.MAINTENANCE:
+                    raise HTTPException(status_code=409, detail="Dumpster is already in maintenance")
+
+                # Create maintenance record
+                await cursor.execute(
+                    """INSERT INTO dumpster_maintenance (id, dumpster_id, reason, supplier, start_date,
+                       expected_end_date, estimated_cost, notes, status, created_at, updated_at)
+                       VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""",
+                    (maintenance_id, dumpster_id, maintenance.reason, maintenance.supplier, 
+                     maintenance.start_date, maintenance.expected_end_date, maintenance.estimated_cost,
+                     maintenance.notes, MaintenanceStatus.IN_PROGRESS, 
+                     datetime.now(timezone.utc), datetime.now(timezone.utc))
+                )
+                
+                # Update dumpster status to maintenance
+                await cursor.execute(
+                    "UPDATE dumpsters SET status = %s WHERE id = %s",
+                    (DumpsterStatus.MAINTENANCE, dumpster_id)
+                )
+                await record_status_change(cursor, HistoryEntity.DUMPSTER, dumpster_id, dumpster["status"],
+                                           DumpsterStatus.MAINTENANCE, current_user.email,
+                                           location=dumpster["current_location"], reference_id=maintenance_id)
+            await invalidate_cached(cursor, "dumpsters", dumpster_id)
+            await touch_tables(cursor, "dumpster_maintenance", "dumpsters")
+            
+            await cursor.execute("SELECT * FROM dumpster_maintenance WHERE id = %s", (maintenance_id,))
+            result = await cursor.fetchone()
+            result['dumpster_identifier'] = dumpster['identifier']
+            return Maintenance(**result)
+
+@router.get("/maintenance/proposals", response_model=List[MaintenanceProposal])
+async def get_maintenance_proposals(status: ProposalStatus = ProposalStatus.PROPOSED,
+                                    current_user: User = Depends(get_current_user)):
+    pool = await get_read_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            await cursor.execute(
+                """SELECT p.*, d.identifier as dumpster_identifier
+                   FROM maintenance_proposals p
+                   JOIN dumpsters d ON p.dumpster_id = d.id AND d.deleted_at IS NULL
+                   WHERE p.status = %s
+                   ORDER BY p.proposed_start ASC""",
+                (status.value,)
+            )
+            proposals = await cursor.fetchall()
+            return [MaintenanceProposal(**p) for p in proposals]
+
+@router.post("/maintenance/proposals/{proposal_id}/accept", response_model=Maintenance)
+async def accept_maintenance_proposal(proposal_id: str, current_user: User = Depends(get_current_user)):
+    """Open the proposed maintenance now; only once its window has started and the dumpster is in the yard."""
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    maintenance_id = str(uuid.uuid4())
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            async with transaction(conn):
+                await cursor.execute(
+                    "SELECT * FROM maintenance_proposals WHERE id = %s AND status = %s FOR UPDATE",
+                    (proposal_id, ProposalStatus.PROPOSED.value)
+                )
+                proposal = await cursor.fetchone()
+                if not proposal:
+                    raise HTTPException(status_code=404, detail="Proposal not found")
+                if proposal["proposed_start"] > now:
+                    raise HTTPException(status_code=409, detail="The proposed maintenance window has not started")
+                await cursor.execute(
+                    "SELECT identifier, status, current_location FROM dumpsters WHERE id = %s AND deleted_at IS NULL "
+                    "FOR UPDATE",
+                    (proposal["dumpster_id"],)
+                )
+                dumpster = await cursor.fetchone()
+                if not dumpster:
+                    raise HTTPException(status_code=404, detail="Dumpster not found")
+                if dumpster["status"] != DumpsterStatus.AVAILABLE:
+                    raise HTTPException(status_code=409, detail="Dumpster is not available")
+
+                # Same length as the proposed window, counted from now
+                await cursor.execute(
+                    """INSERT INTO dumpster_maintenance (id, dumpster_id, reason, start_date,
+                       expected_end_date, status, created_at, updated_at)
+                       VALUES (%s, %s, %s, %s, %s, %s, %s, %s)""",
+                    (maintenance_id, proposal["dumpster_id"], proposal["reason"], now,
+                     now + (proposal["proposed_end"] - proposal["proposed_start"]),
+                     MaintenanceStatus.IN_PROGRESS.value, now, now)
+                )
+                await cursor.execute(
+                    "UPDATE dumpsters SET status = %s WHERE id = %s",
+                    (DumpsterStatus.MAINTENANCE.value, proposal["dumpster_id"])
+                )
+                await record_status_change(cursor, HistoryEntity.DUMPSTER, proposal["dumpster_id"],
+                                           dumpster["status"], DumpsterStatus.MAINTENANCE, current_user.email,
+                                           location=dumpster["current_location"], reference_id=maintenance_id)
+                await cursor.execute(
+                    "UPDATE maintenance_proposals SET status = %s, maintenance_id = %s, updated_at = %s WHERE id = %s",
+                    (ProposalStatus.ACCEPTED.value, maintenance_id, now, proposal_id)
+                )
+            await invalidate_cached(cursor, "dumpsters", proposal["dumpster_id"])
+            await touch_tables(cursor, "dumpster_maintenance", "dumpsters")
+
+            await cursor.execute("SELECT * FROM dumpster_maintenance WHERE id = %s", (maintenance_id,))
+            result = await cursor.fetchone()
+            result['dumpster_identifier'] = dumpster['identifier']
+            return Maintenance(**result)
+
+@router.post("/maintenance/proposals/{proposal_id}/dismiss")
+async def dismiss_maintenance_proposal(proposal_id: str, current_user: User = Depends(get_current_user)):
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            await cursor.execute(
+                "UPDATE maintenance_proposals SET status = %s, updated_at = %s WHERE id = %s AND status = %s",
+                (ProposalStatus.DISMISSED.value, datetime.now(timezone.utc), proposal_id,
+                 ProposalStatus.PROPOSED.value)
+            )
+            if cursor.rowcount == 0:
+                raise HTTPException(status_code=404, detail="Proposal not found")
+            return {"message": "Proposal dismissed"}
+
+@router.post("/maintenance/scheduler/run", response_model=SchedulerRunResult)
+async def run_maintenance_scheduler(current_user: User = Depends(get_current_user)):
+    result = await run_with_lock("fox:preventive-maintenance", run_preventive_maintenance, PM_TIMEOUT_SECONDS)
+    return result or SchedulerRunResult(ran=False)
+
+@router.get("/maintenance", response_model=List[Maintenance])
+async def get_all_maintenance(request: Request, response: Response, fields: Optional[str] = None,
+                              current_user: User = Depends(get_current_user)):
+    columns = parse_fields(fields, Maintenance)
+    pool = await get_read_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            not_modified = await check_not_modified(request, response, cursor,
+                                                    ("dumpster_maintenance", "dumpsters"), columns)
+            if not_modified:
+                return not_modified
+            columns_sql = select_list(columns, alias="m", computed={"dumpster_identifier": "d.identifier"},
+                                      default="m.*, d.identifier as dumpster_identifier")
+            await cursor.execute(
+                f"""SELECT {columns_sql}
+                   FROM dumpster_maintenance m
+                   JOIN dumpsters d ON m.dumpster_id = d.id AND d.deleted_at IS NULL
+                   ORDER BY m.created_at DESC"""
+            )
+            maintenances = await cursor.fetchall()
+            if columns:
+                return projected_response(response, Maintenance, columns, maintenances)
+            return [Maintenance(**m) for m in maintenances]
+
+@router.get("/dumpsters/{dumpster_id}/maintenance", response_model=List[Maintenance])
+async def get_dumpster_maintenance(dumpster_id: str, request: Request, response: Response, fields: Optional[str] = None,
+                                   current_user: User = Depends(get_current_user)):
+    columns = parse_fields(fields, Maintenance)
+    pool = await get_read_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            not_modified = await check_not_modified(request, response, cursor,
+                                                    ("dumpster_maintenance", "dumpsters"), dumpster_id, columns)
+            if not_modified:
+                return not_modified
+            # Check if dumpster exists
+            await cursor.execute("SELECT identifier FROM dumpsters WHERE id = %s AND deleted_at IS NULL", (dumpster_id,))
+            dumpster = await cursor.fetchone()
+            if not dumpster:
+                raise HTTPException(status_code=404, detail="Dumpster not found")
+            
+            # The identifier is filled in below, so it only needs a placeholder column
+            columns_sql = select_list(columns, computed={"dumpster_identifier": "NULL"})
+            await cursor.execute(
+                f"SELECT {columns_sql} FROM dumpster_maintenance WHERE dumpster_id = %s ORDER BY created_at DESC",
+                (dumpster_id,)
+            )
+            maintenances = await cursor.fetchall()
+            for m in maintenances:
+                m['dumpster_identifier'] = dumpster['identifier']
+            if columns:
+                return projected_response(response, Maintenance, columns, maintenances)
+            return [Maintenance(**m) for m in maintenances]
+
+@router.get("/maintenance/{maintenance_id}", response_model=Maintenance)
+async def get_maintenance(maintenance_id: str, request: Request, response: Response, current_user: User = Depends(get_current_user)):
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            not_modified = await check_not_modified(request, response, cursor,
+                                                    ("dumpster_maintenance", "dumpsters"), maintenance_id)
+            if not_modified:
+                return not_modified
+            # Two cached lookups instead of the join, so each row is invalidated on its own
+            maintenance = await get_cached_row(cursor, "dumpster_maintenance", maintenance_id)
+            if not maintenance:
+                raise HTTPException(status_code=404, detail="Maintenance record not found")
+            dumpster = await get_cached_row(cursor, "dumpsters", maintenance["dumpster_id"])
+            if not dumpster:
+                raise HTTPException(status_code=404, detail="Maintenance record not found")
+            maintenance['dumpster_identifier'] = dumpster['identifier']
+            return Maintenance(**maintenance)
+
+@router.put("/maintenance/{maintenance_id}", response_model=Maintenance)
+async def update_maintenance(maintenance_id: str, maintenance_data: MaintenanceUpdate, current_user: User = Depends(get_current_user)):
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            # Get existing maintenance
+            await cursor.execute("SELECT * FROM dumpster_maintenance WHERE id = %s", (maintenance_id,))
+            existing = await cursor.fetchone()
+            if not existing:
+                raise HTTPException(status_code=404, detail="Maintenance record not found")
+            
+            # Build update query dynamically
+            update_fields = []
+            update_values = []
+            
+            if maintenance_data.reason is not None:
+                update_fields.append("reason = %s")
+                update_values.append(maintenance_data.reason)
+            if maintenance_data.supplier is not None:
+                update_fields.append("supplier = %s")
+                update_values.append(maintenance_data.supplier)
+            if maintenance_data.start_date is not None:
+                update_fields.append("start_date = %s")
+                update_values.append(maintenance_data.start_date)
+            if maintenance_data.expected_end_date is not None:
+                update_fields.append("expected_end_date = %s")
+                update_values.append(maintenance_data.expected_end_date)
+            if maintenance_data.actual_end_date is not None:
+                update_fields.append("actual_end_date = %s")
+                update_values.append(maintenance_data.actual_end_date)
+            if maintenance_data.estimated_cost is not None:
+                update_fields.append("estimated_cost = %s")
+                update_values.append(maintenance_data.estimated_cost)
+            if maintenance_data.actual_cost is not None:
+                update_fields.append("actual_cost = %s")
+                update_values.append(maintenance_data.actual_cost)
+            if maintenance_data.notes is not None:
+                update_fields.append("notes = %s")
+                update_values.append(maintenance_data.notes)
+            if maintenance_data.status is not None:
+                update_fields.append("status = %s")
+                update_values.append(maintenance_data.status)
+            
+            update_fields.append("updated_at = %s")
+            update_values.append(datetime.now(timezone.utc))
+            
+            if update_fields:
+                query = f"UPDATE dumpster_maintenance SET {', '.join(update_fields)} WHERE id = %s"
+                update_values.append(maintenance_id)
+                await cursor.execute(query, tuple(update_values))
+                await invalidate_cached(cursor, "dumpster_maintenance", maintenance_id)
+                await touch_tables(cursor, "dumpster_maintenance")
+            
+            # Get updated record
+            await cursor.execute(
+                """SELECT m.*, d.identifier as dumpster_identifier 
+                   FROM dumpster_maintenance m
+                   JOIN dumpsters d ON m.dumpster_id = d.id
+                   WHERE m.id = %s""",
+                (maintenance_id,)
+            )
+            result = await cursor.fetchone()
+            return Maintenance(**result)
+
+@router.patch("/maintenance/{maintenance_id}/complete")
+async def complete_maintenance(maintenance_id: str, actual_cost: Optional[float] = None, current_user: User = Depends(get_current_user)):
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            async with transaction(conn):
+                # Get maintenance record
+                await cursor.execute("SELECT * FROM dumpster_maintenance WHERE id = %s", (maintenance_id,))
+                maintenance = await cursor.fetchone()
+                if not maintenance:
+                    raise HTTPException(status_code=404, detail="Maintenance record not found")
+                
+                # Update maintenance to completed
+                await cursor.execute(
+                    """UPDATE dumpster_maintenance 
+                       SET status = %s, actual_end_date = %s, actual_cost = %s, updated_at = %s
+                       WHERE id = %s""",
+                    (MaintenanceStatus.COMPLETED, datetime.now(timezone.utc), actual_cost, 
+                     datetime.now(timezone.utc), maintenance_id)
+                )
+                
+                # Update dumpster status to available
+                await cursor.execute(
+                    "SELECT status, current_location FROM dumpsters WHERE id = %s FOR UPDATE",
+                    (maintenance['dumpster_id'],)
+                )
+                dumpster = await cursor.fetchone()
+                await cursor.execute(
+                    "UPDATE dumpsters SET status = %s WHERE id = %s",
+                    (DumpsterStatus.AVAILABLE, maintenance['dumpster_id'])
+                )
+                if dumpster:
+                    await record_status_change(cursor, HistoryEntity.DUMPSTER, maintenance['dumpster_id'],
+                                               dumpster["status"], DumpsterStatus.AVAILABLE, current_user.email,
+                                               location=dumpster["current_location"], reference_id=maintenance_id)
+            await invalidate_cached(cursor, "dumpster_maintenance", maintenance_id)
+            await invalidate_cached(cursor, "dumpsters", maintenance['dumpster_id'])
+            await touch_tables(cursor, "dumpster_maintenance", "dumpsters")
+            
+            return {"message": "Maintenance completed successfully"}
+
+@router.delete("/maintenance/{maintenance_id}")
+async def delete_maintenance(maintenance_id: str, current_user: User = Depends(get_current_user)):
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            await cursor.execute("DELETE FROM dumpster_maintenance WHERE id = %s", (maintenance_id,))
+            if cursor.rowcount == 0:
+                raise HTTPException(status_code=404, detail="Maintenance record not found")
+            await invalidate_cached(cursor, "dumpster_maintenance", maintenance_id)
+            await touch_tables(cursor, "dumpster_maintenance")
+            return {"message": "Maintenance record deleted successfully"}
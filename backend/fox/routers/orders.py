@@ -0,0 +1,325 @@
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
+from typing import List, Optional
+from datetime import datetime, timezone
+import uuid
+
+from fox.archive import archive_columns, date_range, needs_archive, with_archive
+from fox.bulk import BULK_CHUNK_SIZE, bulk_result, chunked, in_clause, resolve_bulk_ids
+from fox.cache import get_cached_row, invalidate_cached, touch_tables
+from fox.db import TracedDictCursor, get_db, get_read_db, transaction
+from fox.geo import text_position
+from fox.history import record_status_change, record_status_changes
+from fox.models import (BulkItemResult, BulkOrderStatusUpdate, BulkResult, DumpsterStatus, HistoryEntity, Order,
+                        OrderCreate, OrderStatus, OrderType, User)
+from fox.pricing import price_table, text_zone
+from fox.purge import LIVE_CLIENT, LIVE_DUMPSTER
+from fox.rentals import open_rental, sync_rentals
+from fox.responses import check_not_modified, parse_fields, projected_response, select_list
+from fox.security import get_current_user
+
+router = APIRouter()
+
+# Order routes
+@router.post("/orders", response_model=Order)
+async def create_order(order: OrderCreate, current_user: User = Depends(get_current_user)):
+    pool = await get_db()
+    order_id = str(uuid.uuid4())
+    
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            # Get client
+            client = await get_cached_row(cursor, "clients", order.client_id)
+            if not client:
+                raise HTTPException(status_code=404, detail="Client not found")
+            
+            # Get dumpster
+            dumpster = await get_cached_row(cursor, "dumpsters", order.dumpster_id)
+            if not dumpster:
+                raise HTTPException(status_code=404, detail="Dumpster not found")
+            
+            if dumpster["status"] != DumpsterStatus.AVAILABLE and order.order_type == OrderType.PLACEMENT:
+                raise HTTPException(status_code=400, detail="Dumpster not available")
+            
+            # If delivery_address_id is provided, get the full address
+            delivery_address_text = order.delivery_address
+            position = address = None
+            if order.delivery_address_id:
+                await cursor.execute(
+                    "SELECT * FROM client_addresses WHERE id = %s AND client_id = %s",
+                    (order.delivery_address_id, order.client_id)
+                )
+                address = await cursor.fetchone()
+                if address:
+                    # Format full address
+                    delivery_address_text = f"{address['street']}, {address['number']}"
+                    if address['complement']:
+                        delivery_address_text += f" - {address['complement']}"
+                    delivery_address_text += f" - {address['neighborhood']}, {address['city']}/{address['state']} - CEP: {address['cep']}"
+                    if address.get("latitude") is not None:
+                        position = (float(address["latitude"]), float(address["longitude"]))
+            if order.order_type == OrderType.PLACEMENT and position is None:
+                position = await text_position(cursor, delivery_address_text)
+            
+            # No value typed in: price it from the price table
+            rental_value, rental_days = order.rental_value, order.rental_days
+            if rental_value is None:
+                await price_table.refresh(cursor)
+                if address:
+                    zone_id = price_table.zone_for(address["cep"], address["city"], address["neighborhood"])
+                else:
+                    zone_id = text_zone(delivery_address_text)
+                quote = price_table.quote(dumpster["size"], order.order_type.value, rental_days, zone_id,
+                                          order.client_id)
+                rental_value, rental_days = quote.total, quote.days
+            
+            async with transaction(conn):
+                # Create order
+                await cursor.execute(
+                    """INSERT INTO orders (id, client_id, client_name, dumpster_id, dumpster_identifier,
+                       order_type, status, delivery_address, delivery_address_id, rental_value, payment_method, 
+                       scheduled_date, completed_date, notes, created_at)
+                       VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""",
+                    (order_id, order.client_id, client["name"], order.dumpster_id, dumpster["identifier"],
+                     order.order_type, OrderStatus.PENDING, delivery_address_text, order.delivery_address_id,
+                     rental_value, order.payment_method, order.scheduled_date, None, order.notes, 
+                     datetime.now(timezone.utc))
+                )
+                await record_status_change(cursor, HistoryEntity.ORDER, order_id, None, OrderStatus.PENDING,
+                                           current_user.email)
+                
+                # Update dumpster status; the status guard catches a stale cached read
+                if order.order_type == OrderType.PLACEMENT:
+                    await cursor.execute(
+                        """UPDATE dumpsters SET status = %s, current_location = %s, latitude = %s, longitude = %s
+                           WHERE id = %s AND status = %s""",
+                        (DumpsterStatus.RENTED, delivery_address_text, *(position or (None, None)),
+                         order.dumpster_id, DumpsterStatus.AVAILABLE.value)
+                    )
+                    if cursor.rowcount == 0:
+                        raise HTTPException(status_code=400, detail="Dumpster not available")
+                    await record_status_change(cursor, HistoryEntity.DUMPSTER, order.dumpster_id,
+                                               dumpster["status"], DumpsterStatus.RENTED, current_user.email,
+                                               location=delivery_address_text, reference_id=order_id)
+                    await open_rental(cursor, order_id, order.dumpster_id, order.client_id, order.scheduled_date,
+                                      rental_value, rental_days)
+                
+                # Create accounts receivable
+                receivable_id = str(uuid.uuid4())
+                await cursor.execute(
+                    """INSERT INTO accounts_receivable (id, client_id, client_name, order_id, amount,
+                       due_date, received_date, is_received, notes, created_at)
+                       VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""",
+                    (receivable_id, order.client_id, client["name"], order_id, rental_value,
+                     order.scheduled_date, None, False, 
+                     f"Pedido {order.order_type.value} - {dumpster['identifier']}", 
+                     datetime.now(timezone.utc))
+                )
+            if order.order_type == OrderType.PLACEMENT:
+                await invalidate_cached(cursor, "dumpsters", order.dumpster_id)
+            await touch_tables(cursor, "orders", "accounts_receivable", "dumpsters",
+                               *(["rentals"] if order.order_type == OrderType.PLACEMENT else []))
+            
+            await cursor.execute("SELECT * FROM orders WHERE id = %s", (order_id,))
+            result = await cursor.fetchone()
+            return Order(**result)
+
+@router.get("/orders", response_model=List[Order])
+async def get_orders(request: Request, response: Response, fields: Optional[str] = None,
+                     date_from: Optional[datetime] = None, date_to: Optional[datetime] = None,
+                     current_user: User = Depends(get_current_user)):
+    columns = parse_fields(fields, Order)
+    pool = await get_read_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            not_modified = await check_not_modified(request, response, cursor, ("orders",), columns,
+                                                    date_from, date_to)
+            if not_modified:
+                return not_modified
+            conditions, params = date_range("created_at", date_from, date_to)
+            await cursor.execute(*with_archive(
+                "orders", select_list(columns, default=archive_columns("orders")),
+                " AND ".join([LIVE_CLIENT, LIVE_DUMPSTER] + conditions), tuple(params), "created_at DESC",
+                await needs_archive(cursor, date_from)
+            ))
+            orders = await cursor.fetchall()
+            if columns:
+                return projected_response(response, Order, columns, orders)
+            return [Order(**o) for o in orders]
+
+@router.get("/orders/{order_id}", response_model=Order)
+async def get_order(order_id: str, request: Request, response: Response, current_user: User = Depends(get_current_user)):
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            not_modified = await check_not_modified(request, response, cursor, ("orders",), order_id)
+            if not_modified:
+                return not_modified
+            order = await get_cached_row(cursor, "orders", order_id)
+            if not order and await needs_archive(cursor, None):
+                await cursor.execute(
+                    f"SELECT {archive_columns('orders')} FROM orders_archive WHERE id = %s", (order_id,)
+                )
+                order = await cursor.fetchone()
+            if not order:
+                raise HTTPException(status_code=404, detail="Order not found")
+            return Order(**order)
+
+@router.patch("/orders/{order_id}/status")
+async def update_order_status(order_id: str, status: OrderStatus, current_user: User = Depends(get_current_user)):
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            async with transaction(conn):
+                # Get order
+                await cursor.execute("SELECT * FROM orders WHERE id = %s FOR UPDATE", (order_id,))
+                order = await cursor.fetchone()
+                if not order:
+                    raise HTTPException(status_code=404, detail="Order not found")
+                
+                # Update order status
+                now = datetime.now(timezone.utc)
+                if status == OrderStatus.COMPLETED:
+                    await cursor.execute(
+                        "UPDATE orders SET status = %s, completed_date = %s WHERE id = %s",
+                        (status, now, order_id)
+                    )
+                else:
+                    await cursor.execute(
+                        "UPDATE orders SET status = %s WHERE id = %s",
+                        (status, order_id)
+                    )
+                await record_status_change(cursor, HistoryEntity.ORDER, order_id, order["status"], status,
+                                           current_user.email)
+                
+                # Update dumpster status if completed
+                if status == OrderStatus.COMPLETED and order["order_type"] == "removal":
+                    await cursor.execute(
+                        "SELECT status FROM dumpsters WHERE id = %s FOR UPDATE",
+                        (order["dumpster_id"],)
+                    )
+                    dumpster = await cursor.fetchone()
+                    await cursor.execute(
+                        """UPDATE dumpsters SET status = %s, current_location = %s, latitude = NULL, longitude = NULL
+                           WHERE id = %s""",
+                        (DumpsterStatus.AVAILABLE, None, order["dumpster_id"])
+                    )
+                    if dumpster:
+                        await record_status_change(cursor, HistoryEntity.DUMPSTER, order["dumpster_id"],
+                                                   dumpster["status"], DumpsterStatus.AVAILABLE,
+                                                   current_user.email, reference_id=order_id)
+                
+                # Removals and exchanges end the rental period, a cancelled placement drops it
+                rentals_changed = order["status"] != status.value and await sync_rentals(cursor, [order], status, now)
+            await invalidate_cached(cursor, "orders", order_id)
+            if status == OrderStatus.COMPLETED and order["order_type"] == "removal":
+                await invalidate_cached(cursor, "dumpsters", order["dumpster_id"])
+            await touch_tables(cursor, "orders", "dumpsters", *(["rentals"] if rentals_changed else []))
+            
+            return {"message": "Order status updated successfully"}
+
+@router.post("/orders/bulk-status", response_model=BulkResult)
+async def bulk_update_order_status(update: BulkOrderStatusUpdate, current_user: User = Depends(get_current_user)):
+    conditions, params = [], []
+    if update.current_status:
+        conditions.append("status = %s")
+        params.append(update.current_status.value)
+    if update.order_type:
+        conditions.append("order_type = %s")
+        params.append(update.order_type.value)
+    if update.scheduled_before:
+        conditions.append("scheduled_date <= %s")
+        params.append(update.scheduled_before)
+
+    status = update.status
+    now = datetime.now(timezone.utc)
+    results = []
+    freed_dumpsters = rentals_changed = False
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            ids = await resolve_bulk_ids(cursor, "orders", update.ids, conditions, params, "scheduled_date")
+            for chunk in chunked(ids, BULK_CHUNK_SIZE):
+                async with transaction(conn):
+                    await cursor.execute(
+                        f"""SELECT id, status, order_type, dumpster_id, client_id, rental_value FROM orders
+                            WHERE id IN ({in_clause(chunk)}) FOR UPDATE""",
+                        chunk
+                    )
+                    orders = {row["id"]: row for row in await cursor.fetchall()}
+                    changed = [order_id for order_id in chunk
+                               if order_id in orders and orders[order_id]["status"] != status.value]
+                    if changed:
+                        if status == OrderStatus.COMPLETED:
+                            await cursor.execute(
+                                f"UPDATE orders SET status = %s, completed_date = %s WHERE id IN ({in_clause(changed)})",
+                                (status.value, now, *changed)
+                            )
+                        else:
+                            await cursor.execute(
+                                f"UPDATE orders SET status = %s WHERE id IN ({in_clause(changed)})",
+                                (status.value, *changed)
+                            )
+                        await record_status_changes(
+                            cursor, HistoryEntity.ORDER,
+                            [(order_id, orders[order_id]["status"], status, None, None) for order_id in changed],
+                            current_user.email
+                        )
+
+                    # Completed removals bring their dumpsters back to the yard
+                    removals = {}
+                    if status == OrderStatus.COMPLETED:
+                        for order_id in changed:
+                            if orders[order_id]["order_type"] == OrderType.REMOVAL.value:
+                                removals[orders[order_id]["dumpster_id"]] = order_id
+                    if removals:
+                        dumpster_ids = list(removals)
+                        await cursor.execute(
+                            f"SELECT id, status FROM dumpsters WHERE id IN ({in_clause(dumpster_ids)}) FOR UPDATE",
+                            dumpster_ids
+                        )
+                        dumpsters = await cursor.fetchall()
+                        await cursor.execute(
+                            f"""UPDATE dumpsters SET status = %s, current_location = %s, latitude = NULL, longitude = NULL
+                                WHERE id IN ({in_clause(dumpster_ids)})""",
+                            (DumpsterStatus.AVAILABLE.value, None, *dumpster_ids)
+                        )
+                        await record_status_changes(
+                            cursor, HistoryEntity.DUMPSTER,
+                            [(d["id"], d["status"], DumpsterStatus.AVAILABLE, None, removals[d["id"]])
+                             for d in dumpsters],
+                            current_user.email
+                        )
+                        freed_dumpsters = True
+                    if changed and await sync_rentals(cursor, [orders[order_id] for order_id in changed], status, now):
+                        rentals_changed = True
+
+                for order_id in chunk:
+                    if order_id not in orders:
+                        results.append(BulkItemResult(id=order_id, success=False, detail="Order not found"))
+                    elif order_id in changed:
+                        results.append(BulkItemResult(id=order_id, success=True, changed=True))
+                    else:
+                        results.append(BulkItemResult(id=order_id, success=True, detail="Already in status"))
+
+            if any(r.changed for r in results):
+                await invalidate_cached(cursor, "orders")
+                if freed_dumpsters:
+                    await invalidate_cached(cursor, "dumpsters")
+                await touch_tables(cursor, "orders", "dumpsters", *(["rentals"] if rentals_changed else []))
+            return bulk_result(results)
+
+@router.delete("/orders/{order_id}")
+async def delete_order(order_id: str, current_user: User = Depends(get_current_user)):
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            async with transaction(conn):
+                await cursor.execute("DELETE FROM orders WHERE id = %s", (order_id,))
+                if cursor.rowcount == 0:
+                    raise HTTPException(status_code=404, detail="Order not found")
+                # rentals has no FK to orders (orders move to the archive), so unlink by hand
+                await cursor.execute("DELETE FROM rentals WHERE start_order_id = %s", (order_id,))
+                await cursor.execute("UPDATE rentals SET end_order_id = NULL WHERE end_order_id = %s", (order_id,))
+            await invalidate_cached(cursor, "orders", order_id)
+            await touch_tables(cursor, "orders", "accounts_receivable", "rentals")
+            return {"message": "Order deleted successfully"}
@@ -0,0 +1,225 @@
+from fastapi import APIRouter, HTTPException, Depends
+from typing import List, Optional
+from datetime import datetime, timezone
+import uuid
+import aiomysql
+
+from fox.cache import touch_tables
+from fox.db import TracedDictCursor, get_db, get_read_db, transaction
+from fox.models import (ClientContract, ClientContractCreate, PriceQuoteRequest, PriceQuoteResult, PriceRule,
+                        PriceRuleCreate, PriceZone, PriceZoneArea, PriceZoneCreate, User)
+from fox.pricing import PRICE_QUOTE_MAX_BATCH, quote_many
+from fox.security import get_admin_user, get_current_user
+
+router = APIRouter()
+
+DUPLICATE_ENTRY = 1062
+NO_REFERENCED_ROW = 1452
+
+def pricing_conflict(exc: aiomysql.IntegrityError, duplicate: str) -> Exception:
+    if exc.args and exc.args[0] == DUPLICATE_ENTRY:
+        return HTTPException(status_code=409, detail=duplicate)
+    if exc.args and exc.args[0] == NO_REFERENCED_ROW:
+        return HTTPException(status_code=400, detail="Unknown zone or client")
+    return exc
+
+# Quotes; a batch shares one dumpster query and one address query
+@router.post("/pricing/quotes", response_model=List[PriceQuoteResult])
+async def quote_prices(requests: List[PriceQuoteRequest], current_user: User = Depends(get_current_user)):
+    if len(requests) > PRICE_QUOTE_MAX_BATCH:
+        raise HTTPException(status_code=400, detail=f"At most {PRICE_QUOTE_MAX_BATCH} quotes per request")
+    pool = await get_read_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            return await quote_many(cursor, requests)
+
+# Price rules
+@router.get("/pricing/rules", response_model=List[PriceRule])
+async def get_price_rules(current_user: User = Depends(get_current_user)):
+    pool = await get_read_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            await cursor.execute("SELECT * FROM price_rules ORDER BY size, order_type, zone_id")
+            return [PriceRule(**r) for r in await cursor.fetchall()]
+
+@router.post("/pricing/rules", response_model=PriceRule)
+async def create_price_rule(rule: PriceRuleCreate, current_user: User = Depends(get_admin_user)):
+    rule_id = str(uuid.uuid4())
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            try:
+                await cursor.execute(
+                    """INSERT INTO price_rules (id, size, order_type, zone_id, base_price, included_days,
+                       extra_day_price, created_at)
+                       VALUES (%s, %s, %s, %s, %s, %s, %s, %s)""",
+                    (rule_id, rule.size, rule.order_type.value, rule.zone_id, rule.base_price, rule.included_days,
+                     rule.extra_day_price, datetime.now(timezone.utc))
+                )
+            except aiomysql.IntegrityError as exc:
+                raise pricing_conflict(exc, "A rule for this size, order type and zone already exists")
+            await touch_tables(cursor, "price_rules")
+            await cursor.execute("SELECT * FROM price_rules WHERE id = %s", (rule_id,))
+            return PriceRule(**await cursor.fetchone())
+
+@router.put("/pricing/rules/{rule_id}", response_model=PriceRule)
+async def update_price_rule(rule_id: str, rule: PriceRuleCreate, current_user: User = Depends(get_admin_user)):
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            try:
+                await cursor.execute(
+                    """UPDATE price_rules SET size = %s, order_type = %s, zone_id = %s, base_price = %s,
+                       included_days = %s, extra_day_price = %s WHERE id = %s""",
+                    (rule.size, rule.order_type.value, rule.zone_id, rule.base_price, rule.included_days,
+                     rule.extra_day_price, rule_id)
+                )
+            except aiomysql.IntegrityError as exc:
+                raise pricing_conflict(exc, "A rule for this size, order type and zone already exists")
+            await cursor.execute("SELECT * FROM price_rules WHERE id = %s", (rule_id,))
+            row = await cursor.fetchone()
+            if not row:
+                raise HTTPException(status_code=404, detail="Price rule not found")
+            await touch_tables(cursor, "price_rules")
+            return PriceRule(**row)
+
+@router.delete("/pricing/rules/{rule_id}")
+async def delete_price_rule(rule_id: str, current_user: User = Depends(get_admin_user)):
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            await cursor.execute("DELETE FROM price_rules WHERE id = %s", (rule_id,))
+            if cursor.rowcount == 0:
+                raise HTTPException(status_code=404, detail="Price rule not found")
+            await touch_tables(cursor, "price_rules")
+            return {"message": "Price rule deleted successfully"}
+
+# Delivery zones
+async def zone_with_areas(cursor, zone_id: str) -> Optional[PriceZone]:
+    await cursor.execute("SELECT * FROM price_zones WHERE id = %s", (zone_id,))
+    zone = await cursor.fetchone()
+    if not zone:
+        return None
+    await cursor.execute("SELECT cep_prefix, city, neighborhood FROM price_zone_areas WHERE zone_id = %s", (zone_id,))
+    return PriceZone(**zone, areas=[PriceZoneArea(**a) for a in await cursor.fetchall()])
+
+async def write_zone_areas(cursor, zone_id: str, areas: List[PriceZoneArea]):
+    if any(not area.cep_prefix and not area.neighborhood for area in areas):
+        raise HTTPException(status_code=400, detail="An area needs a CEP prefix or a neighborhood")
+    await cursor.execute("DELETE FROM price_zone_areas WHERE zone_id = %s", (zone_id,))
+    if areas:
+        await cursor.executemany(
+            """INSERT INTO price_zone_areas (id, zone_id, cep_prefix, city, neighborhood)
+               VALUES (%s, %s, %s, %s, %s)""",
+            [(str(uuid.uuid4()), zone_id, area.cep_prefix, area.city, area.neighborhood) for area in areas]
+        )
+
+@router.get("/pricing/zones", response_model=List[PriceZone])
+async def get_price_zones(current_user: User = Depends(get_current_user)):
+    pool = await get_read_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            await cursor.execute("SELECT * FROM price_zones ORDER BY name")
+            zones = await cursor.fetchall()
+            await cursor.execute("SELECT zone_id, cep_prefix, city, neighborhood FROM price_zone_areas")
+            areas = {}
+            for area in await cursor.fetchall():
+                areas.setdefault(area.pop("zone_id"), []).append(PriceZoneArea(**area))
+            return [PriceZone(**z, areas=areas.get(z["id"], [])) for z in zones]
+
+@router.post("/pricing/zones", response_model=PriceZone)
+async def create_price_zone(zone: PriceZoneCreate, current_user: User = Depends(get_admin_user)):
+    zone_id = str(uuid.uuid4())
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            try:
+                async with transaction(conn):
+                    await cursor.execute(
+                        "INSERT INTO price_zones (id, name, surcharge, created_at) VALUES (%s, %s, %s, %s)",
+                        (zone_id, zone.name, zone.surcharge, datetime.now(timezone.utc))
+                    )
+                    await write_zone_areas(cursor, zone_id, zone.areas)
+            except aiomysql.IntegrityError as exc:
+                raise pricing_conflict(exc, "A zone with this name already exists")
+            await touch_tables(cursor, "price_zones")
+            return await zone_with_areas(cursor, zone_id)
+
+@router.put("/pricing/zones/{zone_id}", response_model=PriceZone)
+async def update_price_zone(zone_id: str, zone: PriceZoneCreate, current_user: User = Depends(get_admin_user)):
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            try:
+                async with transaction(conn):
+                    await cursor.execute("SELECT id FROM price_zones WHERE id = %s FOR UPDATE", (zone_id,))
+                    if not await cursor.fetchone():
+                        raise HTTPException(status_code=404, detail="Price zone not found")
+                    await cursor.execute("UPDATE price_zones SET name = %s, surcharge = %s WHERE id = %s",
+                                         (zone.name, zone.surcharge, zone_id))
+                    await write_zone_areas(cursor, zone_id, zone.areas)
+            except aiomysql.IntegrityError as exc:
+                raise pricing_conflict(exc, "A zone with this name already exists")
+            await touch_tables(cursor, "price_zones")
+            return await zone_with_areas(cursor, zone_id)
+
+@router.delete("/pricing/zones/{zone_id}")
+async def delete_price_zone(zone_id: str, current_user: User = Depends(get_admin_user)):
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            # Cascades to the zone's areas and zone-specific rules
+            await cursor.execute("DELETE FROM price_zones WHERE id = %s", (zone_id,))
+            if cursor.rowcount == 0:
+                raise HTTPException(status_code=404, detail="Price zone not found")
+            await touch_tables(cursor, "price_zones", "price_rules")
+            return {"message": "Price zone deleted successfully"}
+
+# Client contracts
+@router.get("/pricing/contracts", response_model=List[ClientContract])
+async def get_client_contracts(client_id: Optional[str] = None, current_user: User = Depends(get_current_user)):
+    pool = await get_read_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            if client_id:
+                await cursor.execute(
+                    "SELECT * FROM client_contracts WHERE client_id = %s ORDER BY valid_from DESC", (client_id,)
+                )
+            else:
+                await cursor.execute("SELECT * FROM client_contracts ORDER BY client_id, valid_from DESC")
+            return [ClientContract(**c) for c in await cursor.fetchall()]
+
+@router.post("/pricing/contracts", response_model=ClientContract)
+async def create_client_contract(contract: ClientContractCreate, current_user: User = Depends(get_admin_user)):
+    if contract.valid_from and contract.valid_until and contract.valid_until < contract.valid_from:
+        raise HTTPException(status_code=400, detail="valid_until is before valid_from")
+    contract_id = str(uuid.uuid4())
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            try:
+                await cursor.execute(
+                    """INSERT INTO client_contracts (id, client_id, size, order_type, fixed_price, discount_percent,
+                       valid_from, valid_until, notes, created_at)
+                       VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""",
+                    (contract_id, contract.client_id, contract.size,
+                     contract.order_type.value if contract.order_type else None, contract.fixed_price,
+                     contract.discount_percent, contract.valid_from, contract.valid_until, contract.notes,
+                     datetime.now(timezone.utc))
+                )
+            except aiomysql.IntegrityError as exc:
+                raise pricing_conflict(exc, "Contract already exists")
+            await touch_tables(cursor, "client_contracts")
+            await cursor.execute("SELECT * FROM client_contracts WHERE id = %s", (contract_id,))
+            return ClientContract(**await cursor.fetchone())
+
+@router.delete("/pricing/contracts/{contract_id}")
+async def delete_client_contract(contract_id: str, current_user: User = Depends(get_admin_user)):
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            await cursor.execute("DELETE FROM client_contracts WHERE id = %s", (contract_id,))
+            if cursor.rowcount == 0:
+                raise HTTPException(status_code=404, detail="Contract not found")
+            await touch_tables(cursor, "client_contracts")
+            return {"message": "Contract deleted successfully"}
@@ -0,0 +1,53 @@
+from fastapi import APIRouter, Depends, Query
+from typing import List, Optional
+from datetime import datetime, timezone
+
+from fox.db import TracedDictCursor, get_read_db
+from fox.jobs import run_with_lock
+from fox.models import Rental, RentalBillingResult, User
+from fox.rentals import RENTAL_BILLING_TIMEOUT_SECONDS, run_rental_billing
+from fox.security import get_current_user
+
+router = APIRouter()
+
+# Rental routes; no ETag here, since "overdue" moves with the clock and not only with writes
+@router.get("/rentals", response_model=List[Rental])
+async def get_rentals(open: Optional[bool] = None, overdue: bool = False, client_id: Optional[str] = None,
+                      dumpster_id: Optional[str] = None, limit: int = Query(200, ge=1, le=1000),
+                      current_user: User = Depends(get_current_user)):
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    conditions, params = ["c.deleted_at IS NULL", "d.deleted_at IS NULL"], [now]
+    if open or overdue:
+        # Open rentals are never settled: idx_billing narrows the scan to the unsettled ones
+        conditions += ["r.settled = FALSE", "r.ended_at IS NULL"]
+    elif open is False:
+        conditions.append("r.ended_at IS NOT NULL")
+    if overdue:
+        conditions.append("r.due_at < %s")
+        params.append(now)
+    if client_id:
+        conditions.append("r.client_id = %s")
+        params.append(client_id)
+    if dumpster_id:
+        conditions.append("r.dumpster_id = %s")
+        params.append(dumpster_id)
+    pool = await get_read_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            await cursor.execute(
+                f"""SELECT r.*, c.name AS client_name, d.identifier AS dumpster_identifier,
+                           GREATEST(TIMESTAMPDIFF(DAY, r.due_at, COALESCE(r.ended_at, %s)), 0) AS overdue_days
+                    FROM rentals r
+                    JOIN clients c ON c.id = r.client_id
+                    JOIN dumpsters d ON d.id = r.dumpster_id
+                    WHERE {" AND ".join(conditions)}
+                    ORDER BY {"r.due_at" if overdue else "r.started_at DESC"}
+                    LIMIT %s""",
+                (*params, limit)
+            )
+            return [Rental(**r) for r in await cursor.fetchall()]
+
+@router.post("/rentals/billing/run", response_model=RentalBillingResult)
+async def run_rental_billing_now(current_user: User = Depends(get_current_user)):
+    result = await run_with_lock("fox:rental-billing", run_rental_billing, RENTAL_BILLING_TIMEOUT_SECONDS)
+    return result or RentalBillingResult(ran=False)
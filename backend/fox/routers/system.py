@@ -0,0 +1,155 @@
+from fastapi import APIRouter, HTTPException, Depends, Query, UploadFile, File
+from typing import List, Optional
+from fastapi.responses import FileResponse
+import json
+import asyncio
+
+from fox.archive import ARCHIVE_TIMEOUT_SECONDS, run_archiver
+from fox.cache import cache_backend, entity_cache
+from fox.cepindex import index_stats
+from fox.db import BoundedPool, TracedDictCursor, get_db, read_pool_stats, replica_router
+from fox.geo import GEO_CENTROIDS_MAX_BYTES, parse_centroids, store_centroids
+from fox.middleware.admission import ADMISSION_LANES, ADMISSION_ROUTE_RULES
+from fox.middleware.profiling import PROFILE_DIR, PROFILE_ID
+from fox.middleware.ratelimit import SQLiteBucketStore, rate_limiter
+from fox.jobs import run_with_lock
+from fox.models import (ArchiveRunResult, GeoCentroidLoadResult, NameDriftReport, NameSyncResult, PurgeJob,
+                        PurgeRunResult, PurgeStatus, User)
+from fox.namesync import NAME_SYNC_TIMEOUT_SECONDS, NAME_VERIFY_TIMEOUT_SECONDS, run_name_sync, verify_names
+from fox.pricing import price_table_stats
+from fox.purge import PURGE_TIMEOUT_SECONDS, run_purge_jobs
+from fox.security import get_admin_user, get_current_user
+
+router = APIRouter()
+
+# Cache metrics
+@router.get("/cache/stats")
+async def get_cache_stats(current_user: User = Depends(get_current_user)):
+    return {"backend": cache_backend.name, **entity_cache.stats()}
+
+@router.get("/admin/profiles")
+async def list_profiles(current_user: User = Depends(get_admin_user)):
+    reports = sorted(PROFILE_DIR.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+    profiles = []
+    for path in reports:
+        report = json.loads(path.read_text())
+        report.pop("profile", None)
+        report["statements"] = len(report["statements"])
+        profiles.append(report)
+    return profiles
+
+@router.get("/admin/profiles/{profile_id}")
+async def get_profile(profile_id: str, current_user: User = Depends(get_admin_user)):
+    path = PROFILE_DIR / f"{profile_id}.json"
+    if not PROFILE_ID.match(profile_id) or not path.exists():
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return json.loads(path.read_text())
+
+@router.get("/admin/profiles/{profile_id}/download")
+async def download_profile(profile_id: str, current_user: User = Depends(get_admin_user)):
+    # Raw pstats dump, for snakeviz / pstats
+    path = PROFILE_DIR / f"{profile_id}.prof"
+    if not PROFILE_ID.match(profile_id) or not path.exists():
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="application/octet-stream", filename=f"{profile_id}.prof")
+
+@router.post("/admin/archive/run", response_model=ArchiveRunResult)
+async def run_archive(current_user: User = Depends(get_admin_user)):
+    result = await run_with_lock("fox:archive", run_archiver, ARCHIVE_TIMEOUT_SECONDS)
+    return result or ArchiveRunResult(ran=False)
+
+@router.post("/admin/geo/centroids", response_model=GeoCentroidLoadResult)
+async def load_cep_centroids(file: UploadFile = File(...), current_user: User = Depends(get_admin_user)):
+    content = await file.read(GEO_CENTROIDS_MAX_BYTES + 1)
+    if len(content) > GEO_CENTROIDS_MAX_BYTES:
+        raise HTTPException(status_code=413, detail="Centroid file too large")
+    rows = parse_centroids(content.decode("utf-8-sig", errors="replace"))
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            return await store_centroids(cursor, rows)
+
+# Purge jobs (background part of client/dumpster deletion)
+@router.get("/purge-jobs", response_model=List[PurgeJob])
+async def list_purge_jobs(status: Optional[PurgeStatus] = None, limit: int = Query(50, ge=1, le=500),
+                          current_user: User = Depends(get_current_user)):
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            if status:
+                await cursor.execute(
+                    "SELECT * FROM purge_jobs WHERE status = %s ORDER BY created_at DESC LIMIT %s",
+                    (status.value, limit)
+                )
+            else:
+                await cursor.execute("SELECT * FROM purge_jobs ORDER BY created_at DESC LIMIT %s", (limit,))
+            return [PurgeJob(**job) for job in await cursor.fetchall()]
+
+@router.get("/purge-jobs/{job_id}", response_model=PurgeJob)
+async def get_purge_job(job_id: str, current_user: User = Depends(get_current_user)):
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            await cursor.execute("SELECT * FROM purge_jobs WHERE id = %s", (job_id,))
+            job = await cursor.fetchone()
+            if not job:
+                raise HTTPException(status_code=404, detail="Purge job not found")
+            return PurgeJob(**job)
+
+@router.post("/admin/purge/run", response_model=PurgeRunResult)
+async def run_purge(current_user: User = Depends(get_admin_user)):
+    result = await run_with_lock("fox:purge", run_purge_jobs, PURGE_TIMEOUT_SECONDS)
+    return result or PurgeRunResult(ran=False)
+
+@router.post("/admin/name-sync/run", response_model=NameSyncResult)
+async def run_name_sync_now(current_user: User = Depends(get_admin_user)):
+    result = await run_with_lock("fox:name-sync", run_name_sync, NAME_SYNC_TIMEOUT_SECONDS)
+    return result or NameSyncResult(ran=False)
+
+@router.post("/admin/name-sync/verify", response_model=NameDriftReport)
+async def verify_name_copies(current_user: User = Depends(get_admin_user)):
+    result = await run_with_lock("fox:name-verify", verify_names, NAME_VERIFY_TIMEOUT_SECONDS)
+    return result or NameDriftReport(ran=False)
+
+@router.get("/metrics/name-sync")
+async def get_name_sync_metrics(current_user: User = Depends(get_current_user)):
+    pool = await get_db()
+    async with pool.acquire() as conn:
+        async with conn.cursor(TracedDictCursor) as cursor:
+            await cursor.execute(
+                "SELECT COUNT(*) AS pending, MIN(requested_at) AS oldest_request FROM name_sync_queue"
+            )
+            return await cursor.fetchone()
+
+@router.get("/metrics/admission")
+async def get_admission_metrics(current_user: User = Depends(get_current_user)):
+    pool = await get_db()
+    return {
+        "pool": pool.stats() if isinstance(pool, BoundedPool) else None,
+        "lanes": {name: lane.stats() for name, lane in ADMISSION_LANES.items()},
+        "routes": {route_lane.name: route_lane.stats()
+                   for _, _, _, route_lane in ADMISSION_ROUTE_RULES if route_lane is not None},
+    }
+
+@router.get("/metrics/cep-index")
+async def get_cep_index_metrics(current_user: User = Depends(get_current_user)):
+    return index_stats()
+
+@router.get("/metrics/price-table")
+async def get_price_table_metrics(current_user: User = Depends(get_current_user)):
+    return price_table_stats()
+
+@router.get("/metrics/replica")
+async def get_replica_metrics(current_user: User = Depends(get_current_user)):
+    return {**replica_router.stats(), "pool": read_pool_stats()}
+
+@router.get("/metrics/rate-limits")
+async def get_rate_limit_metrics(current_user: User = Depends(get_current_user)):
+    if isinstance(rate_limiter, SQLiteBucketStore):
+        return await asyncio.to_thread(rate_limiter.stats)
+    return rate_limiter.stats()
+
+@router.get("/health")
+async def health():
+    # Liveness only: no auth and no database round trip
+    return {"status": "ok"}
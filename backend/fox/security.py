@@ -0,0 +1,87 @@
+from fastapi import HTTPException, Depends
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from starlette.datastructures import Headers
+import os
+from typing import Optional
+from datetime import datetime, timezone, timedelta
+import bcrypt
+import jwt
+
+from fox.db import PoolSaturated, TracedDictCursor, get_db, note_write, request_trace
+from fox.models import User
+
+# JWT Configuration
+SECRET_KEY = os.environ.get('JWT_SECRET', 'fox-secret-key-change-in-production')
+ALGORITHM = "HS256"
+ACCESS_TOKEN_EXPIRE_MINUTES = 1440
+
+security = HTTPBearer()
+
+READ_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Auth utilities
+def hash_password(password: str) -> str:
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+
+def create_access_token(data: dict, expires_delta: timedelta = None):
+    to_encode = data.copy()
+    if expires_delta:
+        expire = datetime.now(timezone.utc) + expires_delta
+    else:
+        expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    to_encode.update({"exp": expire})
+    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    return encoded_jwt
+
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    try:
+        token = credentials.credentials
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        email: str = payload.get("sub")
+        if email is None:
+            raise HTTPException(status_code=401, detail="Invalid token")
+        
+        pool = await get_db()
+        async with pool.acquire() as conn:
+            async with conn.cursor(TracedDictCursor) as cursor:
+                await cursor.execute("SELECT email, full_name, created_at FROM users WHERE email = %s", (email,))
+                user = await cursor.fetchone()
+                if user is None:
+                    raise HTTPException(status_code=401, detail="User not found")
+                trace = request_trace.get()
+                if trace is not None:
+                    trace.user = user["email"]
+                    if trace.scope["method"] not in READ_METHODS:
+                        # Pinned before the write runs, so the follow-up reads go to the primary
+                        note_write(user["email"])
+                        trace.wrote = True
+                return User(**user)
+    except jwt.ExpiredSignatureError:
+        raise HTTPException(status_code=401, detail="Token expired")
+    except PoolSaturated:
+        raise
+    except Exception:
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+def token_subject(scope) -> Optional[str]:
+    """Email from a valid bearer token, without touching the database."""
+    authorization = Headers(scope=scope).get("authorization", "")
+    if not authorization.lower().startswith("bearer "):
+        return None
+    try:
+        return jwt.decode(authorization[7:], SECRET_KEY, algorithms=[ALGORITHM]).get("sub")
+    except jwt.PyJWTError:
+        return None
+
+ADMIN_EMAILS = {e.strip().lower() for e in os.environ.get('ADMIN_EMAILS', '').split(',') if e.strip()}
+
+def is_admin_email(email: Optional[str]) -> bool:
+    return bool(email) and email.lower() in ADMIN_EMAILS
+
+async def get_admin_user(current_user: User = Depends(get_current_user)):
+    if not is_admin_email(current_user.email):
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return current_user
@@ -0,0 +1,8 @@
+-- Índices para o relatório de utilização de caçambas
+USE fox_db;
+
+-- Varredura ordenada de pedidos por caçamba (uma única passada)
+ALTER TABLE orders ADD INDEX idx_dumpster_scheduled (dumpster_id, scheduled_date);
+
+-- Intervalos de manutenção por caçamba
+ALTER TABLE dumpster_maintenance ADD INDEX idx_dumpster_start (dumpster_id, start_date);
@@ -0,0 +1,77 @@
+-- Arquivo histórico de pedidos encerrados e recebíveis quitados
+USE fox_db;
+
+-- Mesmas colunas das tabelas vivas, sem FOREIGN KEY: a exclusão em cascata de um
+-- cliente não alcança o arquivo. Particionado por ano de criação; a chave primária
+-- inclui created_at porque o MySQL exige a coluna de partição em toda chave única.
+CREATE TABLE IF NOT EXISTS orders_archive (
+    id VARCHAR(36) NOT NULL,
+    client_id VARCHAR(36) NOT NULL,
+    client_name VARCHAR(255) NOT NULL,
+    dumpster_id VARCHAR(36) NOT NULL,
+    dumpster_identifier VARCHAR(100) NOT NULL,
+    order_type ENUM('placement', 'removal', 'exchange') NOT NULL,
+    status ENUM('pending', 'in_progress', 'completed', 'cancelled') NOT NULL,
+    delivery_address TEXT NOT NULL,
+    delivery_address_id VARCHAR(36) NULL,
+    rental_value DECIMAL(10, 2) NOT NULL,
+    payment_method ENUM('cash', 'credit_card', 'debit_card', 'bank_transfer', 'pix') NOT NULL,
+    scheduled_date DATETIME NOT NULL,
+    completed_date DATETIME,
+    notes TEXT,
+    created_at DATETIME NOT NULL,
+    archived_at DATETIME NOT NULL,
+    PRIMARY KEY (id, created_at),
+    INDEX idx_client_created (client_id, created_at),
+    INDEX idx_dumpster_scheduled (dumpster_id, scheduled_date),
+    INDEX idx_created_at (created_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+PARTITION BY RANGE (YEAR(created_at)) (
+    PARTITION p2022 VALUES LESS THAN (2023),
+    PARTITION p2023 VALUES LESS THAN (2024),
+    PARTITION p2024 VALUES LESS THAN (2025),
+    PARTITION p2025 VALUES LESS THAN (2026),
+    PARTITION p2026 VALUES LESS THAN (2027),
+    PARTITION pmax VALUES LESS THAN MAXVALUE
+);
+
+CREATE TABLE IF NOT EXISTS accounts_receivable_archive (
+    id VARCHAR(36) NOT NULL,
+    client_id VARCHAR(36) NOT NULL,
+    client_name VARCHAR(255) NOT NULL,
+    order_id VARCHAR(36) NOT NULL,
+    amount DECIMAL(10, 2) NOT NULL,
+    due_date DATETIME NOT NULL,
+    received_date DATETIME,
+    is_received BOOLEAN NOT NULL,
+    bank_transaction_id VARCHAR(64) NULL,
+    notes TEXT,
+    created_at DATETIME NOT NULL,
+    archived_at DATETIME NOT NULL,
+    PRIMARY KEY (id, created_at),
+    INDEX idx_client_due (client_id, due_date),
+    INDEX idx_order_id (order_id),
+    INDEX idx_due_date (due_date),
+    -- Não pode ser UNIQUE (não contém created_at); a conciliação consulta as duas tabelas
+    INDEX idx_bank_transaction (bank_transaction_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+PARTITION BY RANGE (YEAR(created_at)) (
+    PARTITION p2022 VALUES LESS THAN (2023),
+    PARTITION p2023 VALUES LESS THAN (2024),
+    PARTITION p2024 VALUES LESS THAN (2025),
+    PARTITION p2025 VALUES LESS THAN (2026),
+    PARTITION p2026 VALUES LESS THAN (2027),
+    PARTITION pmax VALUES LESS THAN MAXVALUE
+);
+-- Todo ano: ALTER TABLE ... REORGANIZE PARTITION pmax INTO (PARTITION p2027 VALUES LESS THAN (2028), PARTITION pmax VALUES LESS THAN MAXVALUE);
+
+-- Marca d'água: todas as datas das linhas arquivadas são anteriores a archived_before.
+-- Consultas cujo intervalo começa depois dela não precisam ler o arquivo.
+CREATE TABLE IF NOT EXISTS archive_state (
+    table_name VARCHAR(64) PRIMARY KEY,
+    archived_before DATETIME NOT NULL,
+    updated_at DATETIME NOT NULL
+) ENGINE=InnoDB;
+
+-- Seleção de candidatos do arquivador
+ALTER TABLE orders ADD INDEX idx_status_created (status, created_at);
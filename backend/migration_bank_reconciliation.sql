@@ -0,0 +1,9 @@
+-- Conciliação bancária de contas a receber
+USE fox_db;
+
+-- Identificador do lançamento no extrato (FITID do OFX); impede aplicar o mesmo crédito duas vezes
+ALTER TABLE accounts_receivable ADD COLUMN bank_transaction_id VARCHAR(64) NULL AFTER is_received;
+ALTER TABLE accounts_receivable ADD UNIQUE INDEX idx_bank_transaction (bank_transaction_id);
+
+-- Carga dos títulos em aberto
+ALTER TABLE accounts_receivable ADD INDEX idx_received_due (is_received, due_date);
@@ -0,0 +1,11 @@
+-- Invalidações do cache de entidades compartilhadas entre workers
+-- (usada quando ENTITY_CACHE_BACKEND=mysql)
+USE fox_db;
+
+CREATE TABLE IF NOT EXISTS cache_invalidations (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    entity_table VARCHAR(64) NOT NULL,
+    entity_id VARCHAR(36),
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_created_at (created_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -0,0 +1,32 @@
+-- Documento normalizado e único para importação em massa de clientes
+USE fox_db;
+
+-- CPF/CNPJ sem pontuação, em maiúsculas (o CNPJ alfanumérico mantém as letras)
+ALTER TABLE clients ADD COLUMN document_normalized VARCHAR(14) NULL AFTER document_type;
+
+UPDATE clients
+SET document_normalized = NULLIF(UPPER(REGEXP_REPLACE(document, '[^0-9A-Za-z]', '')), '');
+
+-- Zeros à esquerda perdidos quando a planilha tratou o documento como número:
+-- completa para 11 (CPF) ou 14 (CNPJ) dígitos, como document_key() na importação
+UPDATE clients
+SET document_normalized = LPAD(document_normalized, IF(CHAR_LENGTH(document_normalized) < 11, 11, 14), '0')
+WHERE document_normalized REGEXP '^([0-9]{9,10}|[0-9]{12,13})$';
+
+-- Duplicados já existentes: o cliente mais antigo fica com o documento, os demais
+-- ficam fora do índice único até serem mesclados manualmente. Para listá-los:
+--   SELECT id, name, document FROM clients
+--   WHERE deleted_at IS NULL AND document_normalized IS NULL AND document <> '';
+UPDATE clients c
+JOIN clients keep
+  ON keep.document_normalized = c.document_normalized
+ AND keep.deleted_at IS NULL
+ AND (keep.created_at < c.created_at OR (keep.created_at = c.created_at AND keep.id < c.id))
+SET c.document_normalized = NULL
+WHERE c.deleted_at IS NULL;
+
+-- Só clientes vivos disputam o documento: a exclusão lógica libera o valor na hora
+ALTER TABLE clients
+    ADD COLUMN document_key VARCHAR(14)
+        AS (IF(deleted_at IS NULL, document_normalized, NULL)) STORED,
+    ADD UNIQUE INDEX idx_document_key (document_key);
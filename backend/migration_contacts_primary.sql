@@ -0,0 +1,27 @@
+-- Exatamente um telefone e um endereço principal por cliente
+USE fox_db;
+
+-- Corrige os dados atuais: fica principal o mais antigo dos marcados, ou o mais
+-- antigo de todos quando o cliente não tem nenhum
+UPDATE client_phones p
+JOIN (
+    SELECT id, ROW_NUMBER() OVER (PARTITION BY client_id ORDER BY is_primary DESC, created_at, id) AS position
+    FROM client_phones
+) ranked ON ranked.id = p.id
+SET p.is_primary = (ranked.position = 1);
+
+UPDATE client_addresses a
+JOIN (
+    SELECT id, ROW_NUMBER() OVER (PARTITION BY client_id ORDER BY is_primary DESC, created_at, id) AS position
+    FROM client_addresses
+) ranked ON ranked.id = a.id
+SET a.is_primary = (ranked.position = 1);
+
+-- client_id só para a linha principal; o índice único barra um segundo principal
+ALTER TABLE client_phones
+    ADD COLUMN primary_client_id VARCHAR(36) AS (IF(is_primary, client_id, NULL)) STORED,
+    ADD UNIQUE INDEX idx_primary_client (primary_client_id);
+
+ALTER TABLE client_addresses
+    ADD COLUMN primary_client_id VARCHAR(36) AS (IF(is_primary, client_id, NULL)) STORED,
+    ADD UNIQUE INDEX idx_primary_client (primary_client_id);
@@ -0,0 +1,19 @@
+-- Coordenadas de endereços e caçambas a partir de centroides de CEP
+USE fox_db;
+
+-- Carregada por POST /api/admin/geo/centroids (CSV cep;latitude;longitude)
+CREATE TABLE IF NOT EXISTS cep_centroids (
+    cep CHAR(8) PRIMARY KEY,
+    latitude DECIMAL(9, 6) NOT NULL,
+    longitude DECIMAL(9, 6) NOT NULL,
+    updated_at DATETIME NOT NULL
+) ENGINE=InnoDB;
+
+ALTER TABLE client_addresses
+    ADD COLUMN latitude DECIMAL(9, 6) NULL,
+    ADD COLUMN longitude DECIMAL(9, 6) NULL;
+
+-- NULL numa caçamba = no pátio (DEPOT_LATITUDE/DEPOT_LONGITUDE) ou posição desconhecida
+ALTER TABLE dumpsters
+    ADD COLUMN latitude DECIMAL(9, 6) NULL,
+    ADD COLUMN longitude DECIMAL(9, 6) NULL;
@@ -0,0 +1,15 @@
+-- Chaves de idempotência para rotas de escrita (retentativas de clientes móveis)
+USE fox_db;
+
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    key_hash BINARY(32) PRIMARY KEY,
+    request_hash BINARY(32) NOT NULL,
+    status_code SMALLINT NULL,
+    content_type VARCHAR(100) NULL,
+    response_body MEDIUMBLOB NULL,
+    created_at DATETIME NOT NULL,
+    -- Início da execução; uma retentativa assume a chave se a resposta não chegar a tempo
+    claimed_at DATETIME(6) NOT NULL,
+    expires_at DATETIME NOT NULL,
+    INDEX idx_expires (expires_at)
+) ENGINE=InnoDB;
@@ -0,0 +1,8 @@
+-- Índices para os relatórios de custo e tempo parado de manutenção
+USE fox_db;
+
+-- Agrupamento por fornecedor dentro de um intervalo de datas
+ALTER TABLE dumpster_maintenance ADD INDEX idx_supplier_start (supplier, start_date);
+
+-- Manutenções em andamento com previsão de término vencida
+ALTER TABLE dumpster_maintenance ADD INDEX idx_status_expected_end (status, expected_end_date);
@@ -0,0 +1,20 @@
+-- Propostas de manutenção preventiva geradas pelo agendador em segundo plano
+USE fox_db;
+
+CREATE TABLE IF NOT EXISTS maintenance_proposals (
+    id VARCHAR(36) PRIMARY KEY,
+    dumpster_id VARCHAR(36) NOT NULL,
+    reason VARCHAR(255) NOT NULL,
+    proposed_start DATETIME NOT NULL,
+    proposed_end DATETIME NOT NULL,
+    status ENUM('proposed', 'accepted', 'dismissed') NOT NULL DEFAULT 'proposed',
+    maintenance_id VARCHAR(36),
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX idx_dumpster_status (dumpster_id, status),
+    INDEX idx_status_start (status, proposed_start),
+    FOREIGN KEY (dumpster_id) REFERENCES dumpsters(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Última manutenção concluída por caçamba
+ALTER TABLE dumpster_maintenance ADD INDEX idx_dumpster_status (dumpster_id, status);
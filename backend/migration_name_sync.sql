@@ -0,0 +1,27 @@
+-- Fila de propagação de nomes para as cópias desnormalizadas (client_name, dumpster_identifier)
+USE fox_db;
+
+-- Uma linha por entidade: edições repetidas só atualizam requested_at
+CREATE TABLE IF NOT EXISTS name_sync_queue (
+    entity_type ENUM('client', 'dumpster') NOT NULL,
+    entity_id VARCHAR(36) NOT NULL,
+    requested_at DATETIME(6) NOT NULL,
+    PRIMARY KEY (entity_type, entity_id),
+    INDEX idx_requested_at (requested_at)
+) ENGINE=InnoDB;
+
+-- Nomes já divergentes antes desta migração
+INSERT IGNORE INTO name_sync_queue (entity_type, entity_id, requested_at)
+SELECT DISTINCT 'client', o.client_id, NOW(6)
+FROM orders o JOIN clients c ON c.id = o.client_id
+WHERE o.client_name <> c.name;
+
+INSERT IGNORE INTO name_sync_queue (entity_type, entity_id, requested_at)
+SELECT DISTINCT 'client', ar.client_id, NOW(6)
+FROM accounts_receivable ar JOIN clients c ON c.id = ar.client_id
+WHERE ar.client_name <> c.name;
+
+INSERT IGNORE INTO name_sync_queue (entity_type, entity_id, requested_at)
+SELECT DISTINCT 'dumpster', o.dumpster_id, NOW(6)
+FROM orders o JOIN dumpsters d ON d.id = o.dumpster_id
+WHERE o.dumpster_identifier <> d.identifier;
@@ -0,0 +1,60 @@
+-- Tabelas de preço: regras por tamanho/tipo/zona, zonas de entrega e contratos por cliente
+USE fox_db;
+
+CREATE TABLE IF NOT EXISTS price_zones (
+    id VARCHAR(36) PRIMARY KEY,
+    name VARCHAR(100) NOT NULL UNIQUE,
+    -- Somado ao preço das regras sem zona
+    surcharge DECIMAL(10, 2) NOT NULL DEFAULT 0,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Uma área é um prefixo de CEP ou um bairro (cidade + bairro)
+CREATE TABLE IF NOT EXISTS price_zone_areas (
+    id VARCHAR(36) PRIMARY KEY,
+    zone_id VARCHAR(36) NOT NULL,
+    cep_prefix VARCHAR(8),
+    city VARCHAR(100),
+    neighborhood VARCHAR(100),
+    INDEX idx_zone (zone_id),
+    FOREIGN KEY (zone_id) REFERENCES price_zones(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS price_rules (
+    id VARCHAR(36) PRIMARY KEY,
+    size VARCHAR(50) NOT NULL,
+    order_type ENUM('placement', 'removal', 'exchange') NOT NULL,
+    -- NULL = qualquer zona (mais a sobretaxa da zona); uma regra da zona vale no lugar dela
+    zone_id VARCHAR(36),
+    base_price DECIMAL(10, 2) NOT NULL,
+    included_days INT NOT NULL DEFAULT 7,
+    extra_day_price DECIMAL(10, 2) NOT NULL DEFAULT 0,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    zone_key VARCHAR(36) AS (COALESCE(zone_id, '')) STORED,
+    UNIQUE INDEX idx_size_type_zone (size, order_type, zone_key),
+    FOREIGN KEY (zone_id) REFERENCES price_zones(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- size/order_type NULL = vale para todos; o contrato mais específico e mais recente vence
+CREATE TABLE IF NOT EXISTS client_contracts (
+    id VARCHAR(36) PRIMARY KEY,
+    client_id VARCHAR(36) NOT NULL,
+    size VARCHAR(50),
+    order_type ENUM('placement', 'removal', 'exchange'),
+    fixed_price DECIMAL(10, 2),
+    discount_percent DECIMAL(5, 2) NOT NULL DEFAULT 0,
+    valid_from DATE,
+    valid_until DATE,
+    notes TEXT,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX idx_client (client_id),
+    FOREIGN KEY (client_id) REFERENCES clients(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+INSERT IGNORE INTO table_versions (table_name, version) VALUES
+    ('price_rules', 1),
+    ('price_zones', 1),
+    ('client_contracts', 1);
@@ -0,0 +1,48 @@
+-- Períodos de locação: abertos por colocação ou troca, encerrados por troca ou retirada
+USE fox_db;
+
+CREATE TABLE IF NOT EXISTS rentals (
+    id VARCHAR(36) PRIMARY KEY,
+    dumpster_id VARCHAR(36) NOT NULL,
+    client_id VARCHAR(36) NOT NULL,
+    start_order_id VARCHAR(36) NOT NULL,
+    end_order_id VARCHAR(36),
+    started_at DATETIME NOT NULL,
+    agreed_days INT NOT NULL,
+    due_at DATETIME NOT NULL,
+    daily_rate DECIMAL(10, 2) NOT NULL,
+    -- Até onde o excedente já virou conta a receber (começa em due_at)
+    billed_until DATETIME NOT NULL,
+    ended_at DATETIME,
+    -- TRUE quando encerrada e sem excedente a cobrar
+    settled BOOLEAN NOT NULL DEFAULT FALSE,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    -- No máximo uma locação aberta por caçamba
+    open_dumpster_id VARCHAR(36) AS (IF(ended_at IS NULL, dumpster_id, NULL)) STORED,
+    UNIQUE INDEX idx_open_dumpster (open_dumpster_id),
+    -- Varredura do job de cobrança: só as locações ainda não quitadas
+    INDEX idx_billing (settled, billed_until),
+    INDEX idx_start_order (start_order_id),
+    INDEX idx_client (client_id),
+    INDEX idx_dumpster_started (dumpster_id, started_at),
+    FOREIGN KEY (client_id) REFERENCES clients(id) ON DELETE CASCADE,
+    FOREIGN KEY (dumpster_id) REFERENCES dumpsters(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Caçambas alugadas hoje: uma locação aberta a partir da última colocação (prazo padrão de 7 dias).
+-- Sem cobrança retroativa: o excedente só conta a partir desta migração
+INSERT IGNORE INTO rentals (id, dumpster_id, client_id, start_order_id, started_at, agreed_days, due_at,
+                            daily_rate, billed_until, created_at)
+SELECT UUID(), o.dumpster_id, o.client_id, o.id, o.scheduled_date, 7,
+       o.scheduled_date + INTERVAL 7 DAY, ROUND(o.rental_value / 7, 2),
+       GREATEST(o.scheduled_date + INTERVAL 7 DAY, UTC_TIMESTAMP()), UTC_TIMESTAMP()
+FROM dumpsters d
+JOIN orders o ON o.id = (
+    SELECT o2.id FROM orders o2
+    WHERE o2.dumpster_id = d.id AND o2.order_type = 'placement' AND o2.status != 'cancelled'
+    ORDER BY o2.created_at DESC LIMIT 1
+)
+WHERE d.status = 'rented' AND d.deleted_at IS NULL;
+
+INSERT IGNORE INTO table_versions (table_name, version) VALUES ('rentals', 1);
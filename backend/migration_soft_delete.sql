@@ -0,0 +1,28 @@
+-- Exclusão lógica de clientes e caçambas com limpeza em segundo plano
+USE fox_db;
+
+-- deleted_at preenchido = registro oculto imediatamente; as linhas dependentes
+-- são removidas aos poucos pelo purge worker
+ALTER TABLE clients ADD COLUMN deleted_at DATETIME NULL;
+ALTER TABLE clients ADD INDEX idx_deleted_at (deleted_at);
+ALTER TABLE dumpsters ADD COLUMN deleted_at DATETIME NULL;
+ALTER TABLE dumpsters ADD INDEX idx_deleted_at (deleted_at);
+
+CREATE TABLE IF NOT EXISTS purge_jobs (
+    id VARCHAR(36) PRIMARY KEY,
+    entity_type ENUM('client', 'dumpster') NOT NULL,
+    entity_id VARCHAR(36) NOT NULL,
+    status ENUM('pending', 'running', 'done', 'failed') NOT NULL DEFAULT 'pending',
+    current_step VARCHAR(64),
+    deleted_rows INT NOT NULL DEFAULT 0,
+    batches INT NOT NULL DEFAULT 0,
+    attempts INT NOT NULL DEFAULT 0,  -- falhas; em PURGE_MAX_ATTEMPTS o job fica failed
+    last_error TEXT,
+    requested_by VARCHAR(255),
+    created_at DATETIME NOT NULL,
+    updated_at DATETIME NOT NULL,
+    finished_at DATETIME,
+    UNIQUE INDEX idx_entity (entity_type, entity_id),
+    INDEX idx_status_created (status, created_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
@@ -0,0 +1,34 @@
+-- Histórico de transições de status (somente inserção) para caçambas e pedidos
+USE fox_db;
+
+CREATE TABLE IF NOT EXISTS status_history (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    entity_type ENUM('dumpster', 'order') NOT NULL,
+    entity_id VARCHAR(36) NOT NULL,
+    old_status VARCHAR(20),
+    new_status VARCHAR(20) NOT NULL,
+    location TEXT,
+    reference_id VARCHAR(36),
+    changed_by VARCHAR(255),
+    changed_at DATETIME(6) NOT NULL,
+    INDEX idx_entity_changed_at (entity_type, entity_id, changed_at),
+    INDEX idx_type_changed_at (entity_type, changed_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+-- Sem FOREIGN KEY: o histórico deve sobreviver à exclusão da caçamba/pedido
+
+-- Estado inicial a partir dos dados atuais (uma linha por entidade ainda sem histórico).
+-- Vale só a partir de agora: o histórico anterior à migração é desconhecido, e
+-- consultas "as-of" antes desta data respondem 404 em vez do status de hoje
+INSERT INTO status_history (entity_type, entity_id, old_status, new_status, location, changed_by, changed_at)
+SELECT 'dumpster', d.id, NULL, d.status, d.current_location, NULL, UTC_TIMESTAMP(6)
+FROM dumpsters d
+WHERE NOT EXISTS (
+    SELECT 1 FROM status_history h WHERE h.entity_type = 'dumpster' AND h.entity_id = d.id
+);
+
+INSERT INTO status_history (entity_type, entity_id, old_status, new_status, location, changed_by, changed_at)
+SELECT 'order', o.id, NULL, o.status, NULL, NULL, UTC_TIMESTAMP(6)
+FROM orders o
+WHERE NOT EXISTS (
+    SELECT 1 FROM status_history h WHERE h.entity_type = 'order' AND h.entity_id = o.id
+);
@@ -0,0 +1,18 @@
+-- Versão por tabela, incrementada a cada escrita; usada para ETag / If-None-Match
+USE fox_db;
+
+CREATE TABLE IF NOT EXISTS table_versions (
+    table_name VARCHAR(64) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+INSERT IGNORE INTO table_versions (table_name, version) VALUES
+    ('clients', 1),
+    ('client_phones', 1),
+    ('client_addresses', 1),
+    ('dumpsters', 1),
+    ('orders', 1),
+    ('accounts_payable', 1),
+    ('accounts_receivable', 1),
+    ('dumpster_maintenance', 1);
@@ -0,0 +1,61 @@
+class RecordingCursor:
+    """Stand-in for a DictCursor: records every statement and answers fetches from ``results``.
+
+    ``results`` is a list of row lists, one per fetch, consumed in order.
+    """
+
+    def __init__(self, results=(), connection=None):
+        self.results = list(results)
+        self.statements = []
+        self.rowcount = 0
+        self.connection = connection
+
+    async def execute(self, query, args=None):
+        self.statements.append((" ".join(query.split()), args))
+
+    async def executemany(self, query, args):
+        self.statements.append((" ".join(query.split()), list(args)))
+
+    async def fetchall(self):
+        return self.results.pop(0) if self.results else []
+
+    async def fetchone(self):
+        rows = await self.fetchall()
+        return rows[0] if rows else None
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.events = []
+
+    async def begin(self):
+        self.events.append("begin")
+
+    async def commit(self):
+        self.events.append("commit")
+
+    async def rollback(self):
+        self.events.append("rollback")
+
+    def cursor(self, cursor_class=None):
+        return AsyncContext(self._cursor)
+
+class FakePool:
+    """What get_db() returns, handing out one connection around ``cursor``."""
+
+    def __init__(self, cursor):
+        self.conn = FakeConnection(cursor)
+        cursor.connection = self.conn
+
+    def acquire(self):
+        return AsyncContext(self.conn)
+
+class AsyncContext:
+    def __init__(self, value):
+        self.value = value
+
+    async def __aenter__(self):
+        return self.value
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
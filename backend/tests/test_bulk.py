@@ -0,0 +1,75 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from fox import bulk
+from fox.bulk import bulk_result, chunked, in_clause, resolve_bulk_ids, settle_accounts
+from fox.models import BulkItemResult
+from tests.fakes import FakeConnection, RecordingCursor
+
+SETTLED_AT = datetime(2026, 3, 2, 12)
+
+def test_chunked_keeps_order_and_the_last_partial_chunk():
+    assert list(chunked(["a", "b", "c", "d", "e"], 2)) == [["a", "b"], ["c", "d"], ["e"]]
+    assert list(chunked([], 2)) == []
+
+def test_in_clause_has_one_placeholder_per_value():
+    assert in_clause(["a", "b", "c"]) == "%s, %s, %s"
+
+def test_bulk_result_counts_unchanged_items_apart():
+    result = bulk_result([
+        BulkItemResult(id="a", success=True, changed=True),
+        BulkItemResult(id="b", success=True, detail="Already settled"),
+        BulkItemResult(id="c", success=False, detail="Account not found"),
+        BulkItemResult(id="d", success=True, changed=True),
+    ])
+    assert (result.updated, result.unchanged, result.failed) == (2, 1, 1)
+
+def test_explicit_ids_are_deduplicated_in_order():
+    cursor = RecordingCursor()
+    ids = asyncio.run(resolve_bulk_ids(cursor, "orders", ["b", "a", "b"], [], [], "created_at"))
+    assert ids == ["b", "a"]
+    assert cursor.statements == []
+
+def test_filter_selects_the_ids():
+    cursor = RecordingCursor([[{"id": "a"}, {"id": "b"}]])
+    ids = asyncio.run(resolve_bulk_ids(cursor, "orders", None, ["status = %s"], ["pending"], "created_at"))
+    assert ids == ["a", "b"]
+    [(query, args)] = cursor.statements
+    assert "WHERE status = %s ORDER BY created_at LIMIT %s" in query
+    assert args == ("pending", bulk.BULK_MAX_ITEMS + 1)
+
+def test_ids_or_a_filter_are_required():
+    with pytest.raises(HTTPException) as raised:
+        asyncio.run(resolve_bulk_ids(RecordingCursor(), "orders", None, [], [], "created_at"))
+    assert raised.value.status_code == 400
+
+def test_too_many_ids_are_rejected(monkeypatch):
+    monkeypatch.setattr(bulk, "BULK_MAX_ITEMS", 2)
+    with pytest.raises(HTTPException):
+        asyncio.run(resolve_bulk_ids(RecordingCursor(), "orders", ["a", "b", "c"], [], [], "created_at"))
+
+def test_settle_updates_only_pending_accounts(monkeypatch):
+    monkeypatch.setattr(bulk, "BULK_CHUNK_SIZE", 10)
+    cursor = RecordingCursor([[{"id": "a", "settled": 0}, {"id": "b", "settled": 1}]])
+    conn = FakeConnection(cursor)
+    results = asyncio.run(settle_accounts(conn, cursor, "accounts_payable", ["a", "b", "c"], SETTLED_AT))
+    assert [(r.id, r.success, r.changed, r.detail) for r in results] == [
+        ("a", True, True, None), ("b", True, False, "Already settled"), ("c", False, False, "Account not found"),
+    ]
+    update_query, update_args = cursor.statements[1]
+    assert update_query == "UPDATE accounts_payable SET is_paid = %s, paid_date = %s WHERE id IN (%s)"
+    assert update_args == (True, SETTLED_AT, "a")
+    assert conn.events == ["begin", "commit"]
+
+def test_settle_runs_one_transaction_per_chunk(monkeypatch):
+    monkeypatch.setattr(bulk, "BULK_CHUNK_SIZE", 2)
+    cursor = RecordingCursor([[{"id": "a", "settled": 1}, {"id": "b", "settled": 1}], [{"id": "c", "settled": 1}]])
+    conn = FakeConnection(cursor)
+    results = asyncio.run(settle_accounts(conn, cursor, "accounts_receivable", ["a", "b", "c"], SETTLED_AT))
+    assert conn.events == ["begin", "commit", "begin", "commit"]
+    # Nothing pending: only the two locking selects ran
+    assert len(cursor.statements) == 2
+    assert bulk_result(results).unchanged == 3
@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+
+from fox import cache
+from fox.cache import EntityCache, MySQLInvalidationBackend, get_cached_row
+from tests.fakes import RecordingCursor
+
+class ReplicaConnection:
+    replica = True
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    cache.entity_cache.clear()
+    yield
+    cache.entity_cache.clear()
+
+def invalidation(row_id, entity_id):
+    return {"id": row_id, "entity_table": "clients", "entity_id": entity_id}
+
+def test_lru_evicts_the_least_recently_used_row():
+    entity_cache = EntityCache(max_entries=2, ttl_seconds=30)
+    entity_cache.set("clients", "a", {"id": "a"})
+    entity_cache.set("clients", "b", {"id": "b"})
+    entity_cache.get("clients", "a")
+    entity_cache.set("clients", "c", {"id": "c"})
+    assert entity_cache.get("clients", "b") is None
+    assert entity_cache.get("clients", "a") == {"id": "a"}
+
+def test_rows_expire_after_the_ttl(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: clock[0])
+    entity_cache = EntityCache(max_entries=10, ttl_seconds=30)
+    entity_cache.set("clients", "a", {"id": "a"})
+    clock[0] += 29
+    assert entity_cache.get("clients", "a") is not None
+    clock[0] += 2
+    assert entity_cache.get("clients", "a") is None
+
+def test_table_invalidation_keeps_other_tables():
+    entity_cache = EntityCache(max_entries=10, ttl_seconds=30)
+    entity_cache.set("clients", "a", {"id": "a"})
+    entity_cache.set("orders", "a", {"id": "a"})
+    entity_cache.invalidate("clients")
+    assert entity_cache.get("clients", "a") is None
+    assert entity_cache.get("orders", "a") is not None
+
+def test_invalidation_committed_out_of_id_order_is_still_applied():
+    backend = MySQLInvalidationBackend(sync_interval=0, rescan_ids=100)
+    backend._last_id = 10
+    entity_cache = EntityCache(max_entries=10, ttl_seconds=30)
+    backend.apply([invalidation(12, "a")], entity_cache)
+    entity_cache.set("clients", "a", {"id": "a"})
+    entity_cache.set("clients", "b", {"id": "b"})
+    # id 11 became visible after 12 was read; 12 is not applied a second time
+    backend.apply([invalidation(11, "b"), invalidation(12, "a")], entity_cache)
+    assert entity_cache.get("clients", "b") is None
+    assert entity_cache.get("clients", "a") == {"id": "a"}
+    assert backend._last_id == 12
+
+def test_sync_rescans_a_window_below_the_last_id():
+    backend = MySQLInvalidationBackend(sync_interval=0, rescan_ids=100)
+    backend._last_id = 500
+    cursor = RecordingCursor([[invalidation(450, "a")]])
+    asyncio.run(backend.sync(cursor, EntityCache(max_entries=10, ttl_seconds=30)))
+    [(query, args)] = cursor.statements
+    assert "WHERE id > %s" in query
+    assert args == (400,)
+
+def test_seen_ids_are_forgotten_below_the_window():
+    backend = MySQLInvalidationBackend(sync_interval=0, rescan_ids=5)
+    backend._last_id = 0
+    entity_cache = EntityCache(max_entries=10, ttl_seconds=30)
+    backend.apply([invalidation(i, "a") for i in range(1, 21)], entity_cache)
+    assert backend._seen == set(range(16, 21))
+
+def test_primary_reads_are_cached():
+    cursor = RecordingCursor([[{"id": "a", "name": "Ana", "deleted_at": None}]])
+    assert asyncio.run(get_cached_row(cursor, "clients", "a"))["name"] == "Ana"
+    assert asyncio.run(get_cached_row(cursor, "clients", "a"))["name"] == "Ana"
+    assert len(cursor.statements) == 1
+
+def test_replica_reads_are_not_cached():
+    cursor = RecordingCursor([[{"id": "a", "name": "Ana", "deleted_at": None}]], connection=ReplicaConnection())
+    assert asyncio.run(get_cached_row(cursor, "clients", "a"))["name"] == "Ana"
+    assert cache.entity_cache.get("clients", "a") is None
+
+def test_soft_deleted_rows_read_as_missing():
+    cursor = RecordingCursor([[{"id": "a", "name": "Ana", "deleted_at": "2026-01-01"}]])
+    assert asyncio.run(get_cached_row(cursor, "clients", "a")) is None
+
+def test_callers_get_a_copy():
+    cursor = RecordingCursor([[{"id": "a", "name": "Ana", "deleted_at": None}]])
+    asyncio.run(get_cached_row(cursor, "clients", "a"))["name"] = "Changed"
+    assert asyncio.run(get_cached_row(cursor, "clients", "a"))["name"] == "Ana"
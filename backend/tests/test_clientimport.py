@@ -0,0 +1,94 @@
+import pytest
+from fastapi import HTTPException
+
+from fox.clientimport import (check_digit, document_key, document_type_of, header_positions, parse_client_row,
+                              validate_rows)
+from fox.models import ClientCreate
+from fox.routers.clients import checked_document
+
+HEADER = ["Nome", "CPF/CNPJ", "E-mail", "Telefone", "Celular", "CEP", "Rua", "Número", "Bairro", "Cidade", "UF"]
+
+def sheet(*rows):
+    return [(1, HEADER)] + [(line, row) for line, row in enumerate(rows, start=2)]
+
+def row(name="Ana Souza", document="529.982.247-25", email="", phone="", mobile="", cep="", street="",
+        number="", neighborhood="", city="", state=""):
+    return [name, document, email, phone, mobile, cep, street, number, neighborhood, city, state]
+
+def client(document, document_type="cpf"):
+    return ClientCreate(name="Ana", phone="(11) 99999-9999", address="Rua A, 1", document=document,
+                        document_type=document_type)
+
+def test_check_digits_of_a_known_cpf():
+    assert check_digit("529982247", range(10, 1, -1)) == 2
+    assert check_digit("5299822472", range(11, 1, -1)) == 5
+
+@pytest.mark.parametrize("value, expected", [
+    ("529.982.247-25", ("52998224725", "cpf")),
+    ("11.222.333/0001-81", ("11222333000181", "cnpj")),
+    ("12.abc.345/01de-35", ("12ABC34501DE35", "cnpj")),
+    ("529.982.247-26", ("52998224726", None)),
+    ("111.111.111-11", ("11111111111", None)),
+    ("", ("", None)),
+])
+def test_document_key(value, expected):
+    assert document_key(value) == expected
+
+@pytest.mark.parametrize("value, expected", [
+    ("1234567890", "01234567890"),       # CPF that lost its leading zero
+    ("623904000173", "00623904000173"),  # CNPJ that lost two
+])
+def test_document_key_restores_dropped_leading_zeros(value, expected):
+    assert document_key(value) == (expected, document_type_of(expected))
+    assert document_type_of(expected) is not None
+
+def test_valid_row_becomes_an_import_record():
+    record, problems = parse_client_row(
+        row(email="ANA@Example.com", phone="(11) 3333-4444", mobile="+55 11 98888-7777", cep="01310100",
+            street="Av. Paulista", number="1000", neighborhood="Bela Vista", city="São Paulo", state="sp"),
+        header_positions(HEADER)
+    )
+    assert problems == []
+    assert (record["document_key"], record["document_type"]) == ("52998224725", "cpf")
+    assert record["email"] == "ANA@example.com"
+    assert set(record["phones"]) == {"1133334444", "11988887777"}
+    [address] = record["addresses"].values()
+    assert (address["cep"], address["state"], address["address_type"]) == ("01310-100", "SP", "Residencial")
+    assert record["address"] == "Av. Paulista, 1000 - Bela Vista, São Paulo/SP"
+
+def test_invalid_rows_are_reported_with_every_problem():
+    clients, report = validate_rows(sheet(
+        row(name="", document="529.982.247-26", email="not-an-email", phone="123"),
+        row(document="", cep="01310100"),
+    ))
+    assert clients == []
+    first, second = report.errors
+    assert first.row == 2
+    assert first.detail == ("missing name; invalid CPF/CNPJ 529.982.247-26; invalid email not-an-email; "
+                            "invalid phone 123")
+    assert "missing document" in second.detail
+    assert "incomplete address: missing street, neighborhood, city, state" in second.detail
+
+def test_same_document_twice_in_the_file_is_merged():
+    clients, report = validate_rows(sheet(
+        row(document="529.982.247-25", phone="(11) 3333-4444"),
+        row(name="Ana S. Souza", document="52998224725", phone="(11) 98888-7777"),
+    ))
+    [merged] = clients
+    assert (report.valid, report.duplicates_in_file) == (2, 1)
+    assert merged["name"] == "Ana S. Souza"
+    assert len(merged["phones"]) == 2
+
+def test_sheet_without_a_document_column_is_rejected():
+    with pytest.raises(HTTPException):
+        validate_rows([(1, ["Nome", "Email"]), (2, ["Ana", "ana@example.com"])])
+
+def test_single_client_routes_keep_documents_as_typed():
+    assert checked_document(client("123.456.789-01")) == "12345678901"
+    assert checked_document(client("1234567890")) == "01234567890"
+
+@pytest.mark.parametrize("document", ["", " ./- ", "1" * 15])
+def test_single_client_routes_reject_empty_or_long_documents(document):
+    with pytest.raises(HTTPException) as raised:
+        checked_document(client(document))
+    assert raised.value.status_code == 400
@@ -0,0 +1,69 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from fox.history import record_status_change, record_status_changes
+from fox.models import DumpsterStatus, HistoryEntity, MaintenanceCreate, OrderStatus, User
+from fox.routers import maintenance
+from tests.fakes import FakePool, RecordingCursor
+
+USER = User(email="ops@fox.com", full_name="Ops")
+
+def test_single_change_is_one_append():
+    cursor = RecordingCursor()
+    asyncio.run(record_status_change(cursor, HistoryEntity.DUMPSTER, "d1", DumpsterStatus.AVAILABLE,
+                                     DumpsterStatus.MAINTENANCE, "ops@fox.com", location="Pátio",
+                                     reference_id="m1"))
+    [(query, rows)] = cursor.statements
+    assert query.startswith("INSERT INTO status_history")
+    [row] = rows
+    assert row[:7] == ("dumpster", "d1", "available", "maintenance", "Pátio", "m1", "ops@fox.com")
+
+def test_batch_shares_one_timestamp_and_stores_plain_values():
+    cursor = RecordingCursor()
+    asyncio.run(record_status_changes(cursor, HistoryEntity.ORDER, [
+        ("o1", OrderStatus.PENDING, OrderStatus.COMPLETED, None, None),
+        ("o2", "in_progress", "completed", None, None),
+    ]))
+    [(_, rows)] = cursor.statements
+    assert [row[2:4] for row in rows] == [("pending", "completed"), ("in_progress", "completed")]
+    assert all(type(value) is str for row in rows for value in row[:4])
+    assert rows[0][7] == rows[1][7]
+    assert rows[0][7].tzinfo is not None
+
+def test_no_changes_writes_nothing():
+    cursor = RecordingCursor()
+    asyncio.run(record_status_changes(cursor, HistoryEntity.ORDER, []))
+    assert cursor.statements == []
+
+def open_maintenance(monkeypatch, dumpster_status):
+    cursor = RecordingCursor([
+        [{"identifier": "CAC-001", "status": dumpster_status, "current_location": "Rua A, 1"}],
+        [{"id": "m1", "dumpster_id": "d1", "start_date": datetime(2026, 3, 1), "status": "in_progress"}],
+    ])
+    pool = FakePool(cursor)
+
+    async def get_db():
+        return pool
+
+    monkeypatch.setattr(maintenance, "get_db", get_db)
+    request = MaintenanceCreate(reason="Solda", start_date=datetime(2026, 3, 1))
+    return cursor, pool, asyncio.run(maintenance.create_maintenance("d1", request, USER))
+
+def test_maintenance_records_the_status_it_locked(monkeypatch):
+    cursor, pool, result = open_maintenance(monkeypatch, "available")
+    queries = [query for query, _ in cursor.statements]
+    assert queries[0].startswith("SELECT identifier, status, current_location FROM dumpsters")
+    assert queries[0].endswith("FOR UPDATE")
+    [(_, history)] = [(q, args) for q, args in cursor.statements if q.startswith("INSERT INTO status_history")]
+    assert history[0][2:5] == ("available", "maintenance", "Rua A, 1")
+    assert pool.conn.events == ["begin", "commit"]
+    assert result.dumpster_identifier == "CAC-001"
+
+@pytest.mark.parametrize("status", ["rented", "maintenance"])
+def test_maintenance_refuses_a_busy_dumpster(monkeypatch, status):
+    with pytest.raises(HTTPException) as raised:
+        open_maintenance(monkeypatch, status)
+    assert raised.value.status_code == 409
@@ -0,0 +1,160 @@
+import asyncio
+import json
+from datetime import timedelta
+
+import pytest
+
+from fox.middleware import idempotency
+from fox.middleware.idempotency import IdempotencyMiddleware
+from fox.security import create_access_token
+from tests.fakes import FakePool
+
+class IdempotencyTable:
+    """Cursor over an in-memory idempotency_keys table, for the statements the middleware runs."""
+
+    def __init__(self):
+        self.rows = {}
+        self.rowcount = 0
+        self.connection = None
+        self._fetched = None
+
+    async def execute(self, query, args=None):
+        query = " ".join(query.split())
+        self.rowcount = 0
+        if query.startswith("DELETE FROM idempotency_keys WHERE key_hash = %s AND expires_at"):
+            return
+        if query.startswith("INSERT IGNORE INTO idempotency_keys"):
+            key_hash, request_hash, _, claimed_at, _ = args
+            if key_hash not in self.rows:
+                self.rows[key_hash] = {"request_hash": request_hash, "claimed_at": claimed_at, "status_code": None,
+                                       "content_type": None, "response_body": None}
+                self.rowcount = 1
+        elif query.startswith("UPDATE idempotency_keys SET claimed_at"):
+            claimed_at, key_hash, request_hash, stale_before = args
+            row = self.rows.get(key_hash)
+            if (row and row["request_hash"] == request_hash and row["status_code"] is None
+                    and row["claimed_at"] < stale_before):
+                row["claimed_at"] = claimed_at
+                self.rowcount = 1
+        elif query.startswith("SELECT request_hash"):
+            self._fetched = self.rows.get(args[0])
+        elif query.startswith("UPDATE idempotency_keys SET status_code"):
+            status_code, content_type, body, key_hash, claimed_at = args
+            row = self.rows.get(key_hash)
+            if row and row["claimed_at"] == claimed_at:
+                row.update(status_code=status_code, content_type=content_type, response_body=body)
+                self.rowcount = 1
+        elif query.startswith("DELETE FROM idempotency_keys WHERE key_hash = %s AND claimed_at"):
+            key_hash, claimed_at = args
+            if key_hash in self.rows and self.rows[key_hash]["claimed_at"] == claimed_at:
+                del self.rows[key_hash]
+                self.rowcount = 1
+        else:
+            raise AssertionError(f"unexpected statement: {query}")
+
+    async def fetchone(self):
+        return dict(self._fetched) if self._fetched else None
+
+class CountingApp:
+    def __init__(self, status=201):
+        self.calls = 0
+        self.status = status
+
+    async def __call__(self, scope, receive, send):
+        self.calls += 1
+        body = (await receive())["body"]
+        payload = json.dumps({"call": self.calls, "echo": json.loads(body)}).encode()
+        await send({"type": "http.response.start", "status": self.status,
+                    "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": payload})
+
+@pytest.fixture
+def table(monkeypatch):
+    table = IdempotencyTable()
+
+    async def get_db():
+        return FakePool(table)
+
+    monkeypatch.setattr(idempotency, "get_db", get_db)
+    idempotency.idempotency_cache.clear()
+    yield table
+    idempotency.idempotency_cache.clear()
+
+def token(minutes=30, subject="ana@fox.com"):
+    return create_access_token({"sub": subject}, timedelta(minutes=minutes))
+
+def post(app, body, key="k-1", bearer=None):
+    bearer = bearer or token()
+    scope = {"type": "http", "method": "POST", "path": "/api/orders", "headers": [
+        (b"authorization", f"Bearer {bearer}".encode()), (b"idempotency-key", key.encode()),
+    ]}
+    messages = [{"type": "http.request", "body": json.dumps(body).encode(), "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    return sent[0]["status"], json.loads(sent[1]["body"])
+
+def test_retry_replays_the_stored_response(table):
+    app = CountingApp()
+    middleware = IdempotencyMiddleware(app)
+    first = post(middleware, {"total": 10})
+    idempotency.idempotency_cache.clear()
+    assert post(middleware, {"total": 10}) == first
+    assert app.calls == 1
+
+def test_refreshed_token_of_the_same_user_still_replays(table):
+    app = CountingApp()
+    middleware = IdempotencyMiddleware(app)
+    post(middleware, {"total": 10}, bearer=token(minutes=30))
+    post(middleware, {"total": 10}, bearer=token(minutes=60))
+    assert app.calls == 1
+
+def test_keys_are_scoped_per_user(table):
+    app = CountingApp()
+    middleware = IdempotencyMiddleware(app)
+    post(middleware, {"total": 10}, bearer=token(subject="ana@fox.com"))
+    post(middleware, {"total": 10}, bearer=token(subject="bia@fox.com"))
+    assert app.calls == 2
+
+def test_different_payload_under_the_same_key_is_rejected(table):
+    middleware = IdempotencyMiddleware(CountingApp())
+    post(middleware, {"total": 10})
+    assert post(middleware, {"total": 11})[0] == 422
+
+def test_retry_during_a_live_claim_gets_409(table):
+    app = CountingApp()
+    middleware = IdempotencyMiddleware(app)
+    post(middleware, {"total": 10})
+    for row in table.rows.values():
+        row["status_code"] = None
+    idempotency.idempotency_cache.clear()
+    assert post(middleware, {"total": 10})[0] == 409
+    assert app.calls == 1
+
+def test_retry_takes_over_a_stale_claim(table):
+    app = CountingApp()
+    middleware = IdempotencyMiddleware(app)
+    post(middleware, {"total": 10})
+    # The worker died before storing its response
+    for row in table.rows.values():
+        row.update(status_code=None, claimed_at=row["claimed_at"] - timedelta(
+            seconds=idempotency.IDEMPOTENCY_LEASE_SECONDS + 1))
+    idempotency.idempotency_cache.clear()
+    status, body = post(middleware, {"total": 10})
+    assert (status, body["call"]) == (201, 2)
+    [row] = table.rows.values()
+    assert row["status_code"] == 201
+
+def test_server_errors_release_the_key(table):
+    app = CountingApp(status=503)
+    middleware = IdempotencyMiddleware(app)
+    post(middleware, {"total": 10})
+    assert table.rows == {}
+    post(middleware, {"total": 10})
+    assert app.calls == 2
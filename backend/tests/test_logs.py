@@ -0,0 +1,48 @@
+import json
+import logging
+import queue
+import sys
+
+from fox.logs import JsonFormatter, TracebackQueueHandler
+
+def failing_record(msg="charge %s failed", args=("r1",)):
+    try:
+        1 / 0
+    except ZeroDivisionError:
+        exc_info = sys.exc_info()
+    return logging.LogRecord("fox.test", logging.ERROR, __file__, 1, msg, args, exc_info)
+
+def test_prepare_keeps_the_traceback_out_of_the_message():
+    record = failing_record()
+    prepared = TracebackQueueHandler(queue.SimpleQueue()).prepare(record)
+    assert prepared.msg == "charge r1 failed"
+    assert prepared.args is None
+    assert prepared.exc_info is None
+    assert "ZeroDivisionError" in prepared.exc_text
+    # The emitting side's record is left alone
+    assert record.exc_info is not None
+
+def test_json_entry_has_a_separate_exception_field():
+    prepared = TracebackQueueHandler(queue.SimpleQueue()).prepare(failing_record())
+    entry = json.loads(JsonFormatter().format(prepared))
+    assert entry["message"] == "charge r1 failed"
+    assert entry["exception"].startswith("Traceback")
+
+def test_text_format_still_shows_the_traceback():
+    prepared = TracebackQueueHandler(queue.SimpleQueue()).prepare(failing_record())
+    text = logging.Formatter("%(levelname)s %(message)s").format(prepared)
+    assert text.startswith("ERROR charge r1 failed\nTraceback")
+
+def test_request_fields_and_extra_fields_reach_the_entry():
+    record = logging.LogRecord("fox.test", logging.INFO, __file__, 1, "ok", None, None)
+    record.request_id = "req-1"
+    record.fields = {"rows": 3}
+    entry = json.loads(JsonFormatter().format(TracebackQueueHandler(queue.SimpleQueue()).prepare(record)))
+    assert (entry["request_id"], entry["rows"]) == ("req-1", 3)
+    assert "exception" not in entry and "route" not in entry
+
+def test_records_cross_the_queue_to_the_listener():
+    log_queue = queue.SimpleQueue()
+    TracebackQueueHandler(log_queue).handle(failing_record())
+    entry = json.loads(JsonFormatter().format(log_queue.get_nowait()))
+    assert "ZeroDivisionError" in entry["exception"]
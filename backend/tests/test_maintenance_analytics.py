@@ -0,0 +1,59 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from fox.models import User
+from fox.routers import analytics
+from tests.fakes import FakePool, RecordingCursor
+
+USER = User(email="ops@fox.com", full_name="Ops")
+START, END = datetime(2026, 1, 1), datetime(2026, 4, 1)
+
+def group(key, **values):
+    row = {"key": key, "job_count": 2, "completed_jobs": 1, "in_progress_jobs": 1, "overdue_jobs": 1,
+           "total_estimated_cost": 100, "total_actual_cost": 120, "avg_cost_ratio": 1.2,
+           "mean_abs_estimate_error_percent": 20, "avg_downtime_days": 3.5, "p50_downtime_days": 3,
+           "p90_downtime_days": 4}
+    row.update(values)
+    return row
+
+def run_report(monkeypatch, results, start=START, end=END):
+    cursor = RecordingCursor(results)
+
+    async def get_read_db():
+        return FakePool(cursor)
+
+    monkeypatch.setattr(analytics, "get_read_db", get_read_db)
+    return cursor, asyncio.run(analytics.get_maintenance_analytics(start, end, USER))
+
+def test_report_is_built_from_the_three_queries(monkeypatch):
+    overdue = {"id": "m1", "dumpster_id": "d1", "dumpster_identifier": "CAC-001", "supplier": "Solda Já",
+               "start_date": START, "expected_end_date": START + timedelta(days=2), "days_overdue": 10.5}
+    _, report = run_report(monkeypatch, [[group("Solda Já")], [group("5m3", total_actual_cost=80)], [overdue]])
+    assert report.by_supplier[0].key == "Solda Já"
+    assert report.by_size[0].total_actual_cost == 80
+    assert report.overdue[0].days_overdue == 10.5
+
+def test_every_query_skips_deleted_dumpsters_and_keeps_the_range(monkeypatch):
+    cursor, _ = run_report(monkeypatch, [[], [], []])
+    assert len(cursor.statements) == 3
+    for query, args in cursor.statements:
+        assert "JOIN dumpsters d ON d.id = m.dumpster_id AND d.deleted_at IS NULL" in query
+        assert "m.start_date >= %s AND m.start_date < %s" in query
+        assert args[-2:] == (START, END)
+
+def test_groups_by_supplier_and_by_size(monkeypatch):
+    cursor, _ = run_report(monkeypatch, [[], [], []])
+    assert "SELECT m.supplier AS group_key" in cursor.statements[0][0]
+    assert "SELECT d.size AS group_key" in cursor.statements[1][0]
+
+def test_default_range_is_the_last_year(monkeypatch):
+    cursor, report = run_report(monkeypatch, [[], [], []], start=None, end=END)
+    assert report.start_date == END - timedelta(days=365)
+
+def test_empty_range_is_rejected(monkeypatch):
+    with pytest.raises(HTTPException) as raised:
+        run_report(monkeypatch, [], start=END, end=START)
+    assert raised.value.status_code == 400
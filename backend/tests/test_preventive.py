@@ -0,0 +1,39 @@
+from datetime import datetime, timedelta
+
+from fox.preventive import find_maintenance_window
+
+NOW = datetime(2026, 3, 2, 8)
+WINDOW = timedelta(days=2)
+HORIZON = NOW + timedelta(days=14)
+
+def order(order_type, days):
+    return {"order_type": order_type, "scheduled_date": NOW + timedelta(days=days)}
+
+def window(status, orders, horizon=HORIZON):
+    return find_maintenance_window(status, orders, NOW, WINDOW, horizon)
+
+def test_free_dumpster_without_orders_starts_now():
+    assert window("available", []) == NOW
+
+def test_window_must_end_before_the_horizon():
+    assert window("available", [], horizon=NOW + timedelta(days=1)) is None
+
+def test_gap_before_the_next_placement_is_used_when_long_enough():
+    assert window("available", [order("placement", 3)]) == NOW
+
+def test_short_gap_waits_for_the_next_removal():
+    orders = [order("placement", 1), order("removal", 5)]
+    assert window("available", orders) == NOW + timedelta(days=5)
+
+def test_rented_dumpster_is_free_once_removed():
+    assert window("rented", [order("removal", 3)]) == NOW + timedelta(days=3)
+
+def test_rented_dumpster_without_a_removal_has_no_window():
+    assert window("rented", [order("exchange", 3)]) is None
+
+def test_removal_followed_too_soon_by_a_placement_is_skipped():
+    orders = [order("removal", 1), order("placement", 2), order("removal", 6), order("placement", 9)]
+    assert window("rented", orders) == NOW + timedelta(days=6)
+
+def test_overdue_orders_count_from_now():
+    assert window("rented", [order("removal", -3)]) == NOW
@@ -0,0 +1,111 @@
+import asyncio
+from datetime import date
+
+import pytest
+from fastapi import HTTPException
+
+from fox import pricing
+from fox.models import PriceQuoteRequest
+from fox.pricing import PriceTable, quote_many
+from tests.fakes import RecordingCursor
+
+ON = date(2026, 3, 2)
+RULES = [
+    {"id": "r-any", "size": "5m3", "order_type": "placement", "zone_id": None, "base_price": 300,
+     "included_days": 7, "extra_day_price": 20},
+    {"id": "r-centro", "size": "5m3", "order_type": "placement", "zone_id": "z-centro", "base_price": 280,
+     "included_days": 5, "extra_day_price": 25},
+]
+ZONES = [{"id": "z-centro", "name": "Centro", "surcharge": 40}, {"id": "z-norte", "name": "Norte", "surcharge": 50}]
+AREAS = [
+    {"zone_id": "z-norte", "cep_prefix": "02", "city": None, "neighborhood": None},
+    {"zone_id": "z-centro", "cep_prefix": "01310", "city": None, "neighborhood": None},
+    {"zone_id": "z-norte", "cep_prefix": None, "city": "São Paulo", "neighborhood": "Santana"},
+    {"zone_id": "z-centro", "cep_prefix": None, "city": None, "neighborhood": "Sé"},
+]
+
+def contract(contract_id, size=None, order_type=None, fixed_price=None, discount=0, valid_from=None,
+             valid_until=None):
+    return {"id": contract_id, "client_id": "c1", "size": size, "order_type": order_type, "fixed_price": fixed_price,
+            "discount_percent": discount, "valid_from": valid_from, "valid_until": valid_until}
+
+def table(contracts=()):
+    price_table = PriceTable()
+    price_table.build(RULES, ZONES, AREAS, list(contracts))
+    return price_table
+
+@pytest.mark.parametrize("cep, city, neighborhood, zone", [
+    ("01310-100", None, None, "z-centro"),   # longest prefix wins
+    ("02012-000", None, None, "z-norte"),
+    ("04000-000", None, None, None),
+    (None, "sao paulo", "SANTANA", "z-norte"),  # accents and case folded
+    (None, "Campinas", "Sé", "z-centro"),       # neighborhood without a city
+    (None, "Campinas", "Santana", None),
+])
+def test_zone_lookup(cep, city, neighborhood, zone):
+    assert table().zone_for(cep, city, neighborhood) == zone
+
+def test_zone_rule_replaces_the_generic_rule_and_its_surcharge():
+    quote = table().quote("5m3", "placement", 6, "z-centro", on=ON)
+    assert (quote.rule_id, quote.zone_surcharge, quote.extra_days, quote.total) == ("r-centro", 0.0, 1, 305.0)
+
+def test_generic_rule_adds_the_zone_surcharge():
+    quote = table().quote("5m3", "placement", None, "z-norte", on=ON)
+    assert (quote.rule_id, quote.days, quote.zone_name, quote.total) == ("r-any", 7, "Norte", 350.0)
+
+def test_missing_rule_is_a_400():
+    with pytest.raises(HTTPException) as raised:
+        table().quote("10m3", "placement", on=ON)
+    assert raised.value.status_code == 400
+
+def test_most_specific_contract_wins():
+    price_table = table([contract("k-all", discount=5), contract("k-size", size="5m3", fixed_price=250)])
+    quote = price_table.quote("5m3", "placement", 7, client_id="c1", on=ON)
+    assert (quote.contract_id, quote.base_price, quote.discount, quote.total) == ("k-size", 250.0, 0.0, 250.0)
+    assert price_table.contract_for("c1", "10m3", "placement", ON)["id"] == "k-all"
+
+def test_discount_applies_to_the_whole_subtotal():
+    quote = table([contract("k", discount=10)]).quote("5m3", "placement", 9, "z-norte", "c1", ON)
+    assert (quote.discount, quote.total) == (39.0, 351.0)
+
+def test_most_recent_contract_valid_on_the_date_wins():
+    price_table = table([
+        contract("old", valid_from=date(2025, 1, 1), discount=5),
+        contract("new", valid_from=date(2026, 1, 1), discount=15),
+        contract("future", valid_from=date(2026, 6, 1), discount=30),
+        contract("expired", valid_from=date(2025, 6, 1), valid_until=date(2025, 12, 31), discount=50),
+    ])
+    assert price_table.contract_for("c1", "5m3", "placement", ON)["id"] == "new"
+    assert price_table.contract_for("c1", "5m3", "placement", date(2025, 7, 1))["id"] == "expired"
+    assert price_table.contract_for("c2", "5m3", "placement", ON) is None
+    assert price_table.contract_for(None, "5m3", "placement", ON) is None
+
+def test_rebuild_swaps_every_table():
+    price_table = table([contract("k")])
+    price_table.build(RULES[:1], [], [], [])
+    assert price_table.zone_for("01310-100") is None
+    assert price_table.prefix_lengths == []
+    assert price_table.contracts == {}
+
+def test_batch_quotes_share_one_dumpster_and_one_address_query(monkeypatch):
+    price_table = table()
+    price_table.versions = (1, 1, 1)
+    monkeypatch.setattr(pricing, "price_table", price_table)
+    cursor = RecordingCursor([
+        [{"table_name": name, "version": 1} for name in pricing.PRICE_TABLES],
+        [{"id": "d1", "size": "5m3"}],
+        [{"id": "a1", "client_id": "c1", "cep": "01310-100", "city": None, "neighborhood": None}],
+    ])
+    results = asyncio.run(quote_many(cursor, [
+        PriceQuoteRequest(order_type="placement", dumpster_id="d1", delivery_address_id="a1", client_id="c1"),
+        PriceQuoteRequest(order_type="placement", dumpster_id="d1", cep="02012-000"),
+        PriceQuoteRequest(order_type="placement", dumpster_id="gone"),
+        PriceQuoteRequest(order_type="placement", size="5m3", delivery_address_id="a1", client_id="c2"),
+        PriceQuoteRequest(order_type="removal", size="5m3"),
+    ]))
+    assert len(cursor.statements) == 3
+    assert [r.success for r in results] == [True, True, False, False, False]
+    assert results[0].quote.zone_id == "z-centro"
+    assert results[1].quote.zone_id == "z-norte"
+    assert [r.detail for r in results[2:]] == ["Unknown size or dumpster", "Address not found",
+                                               "No price rule for size 5m3 and removal"]
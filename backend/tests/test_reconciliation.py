@@ -0,0 +1,83 @@
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from fox.models import StatementTransaction
+from fox.reconciliation import (documents_in_text, match_statement, parse_ofx, parse_statement_amount,
+                                parse_statement_csv, parse_statement_date)
+
+def credit(transaction_id, day, amount, memo=""):
+    return StatementTransaction(transaction_id=transaction_id, date=datetime(2026, 3, day), amount=amount, memo=memo)
+
+def receivable(account_id, day, amount, document="00000000000"):
+    return {"id": account_id, "client_id": f"c-{account_id}", "client_name": f"Cliente {account_id}",
+            "due_date": datetime(2026, 3, day), "amount": amount, "document_digits": document}
+
+@pytest.mark.parametrize("value, expected", [
+    ("1.234,56", 1234.56), ("R$ 350,00", 350.0), ("-89.90", -89.9), ("1200", 1200.0),
+])
+def test_amounts_in_both_formats(value, expected):
+    assert parse_statement_amount(value) == expected
+
+@pytest.mark.parametrize("value", ["20260302", "20260302120000[-3:BRT]", "02/03/2026", "2026-03-02"])
+def test_dates_in_ofx_brazilian_and_iso_formats(value):
+    assert parse_statement_date(value) == datetime(2026, 3, 2)
+
+def test_documents_are_found_with_or_without_punctuation():
+    assert documents_in_text("PIX 529.982.247-25 e 11.222.333/0001-81") == {"52998224725", "11222333000181"}
+    assert documents_in_text("pedido 123456789012") == set()
+    assert documents_in_text(None) == set()
+
+def test_ofx_transactions_without_closing_tags():
+    text = """<BANKTRANLIST>
+<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20260302<TRNAMT>350.00<FITID>A1<NAME>JOAO
+<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20260303<TRNAMT>120.50<MEMO>PIX
+</BANKTRANLIST>"""
+    first, second = parse_ofx(text)
+    assert (first.transaction_id, first.amount, first.memo) == ("A1", 350.0, "JOAO")
+    assert second.transaction_id.endswith("-1")
+    assert second.date == datetime(2026, 3, 3)
+
+def test_csv_columns_are_found_by_name_and_ids_are_generated():
+    text = "Data;Histórico;Valor\n02/03/2026;PIX JOAO;350,00\n\n02/03/2026;PIX JOAO;350,00\n"
+    first, second = parse_statement_csv(text)
+    assert first.amount == 350.0
+    assert first.transaction_id != second.transaction_id
+    assert first.transaction_id[:-2] == second.transaction_id[:-2]
+
+def test_csv_without_an_amount_column_is_rejected():
+    with pytest.raises(HTTPException):
+        parse_statement_csv("data;descricao\n02/03/2026;x\n")
+
+def test_credit_matches_the_closest_due_date_with_the_same_amount():
+    matches = match_statement(
+        [credit("t1", 10, 350.0)],
+        [receivable("far", 4, 350.0), receivable("near", 11, 350.0), receivable("other", 10, 351.0)],
+        tolerance_days=7,
+    )
+    [match] = matches
+    assert (match.account_id, match.days_apart, match.document_match) == ("near", 1, False)
+
+def test_document_in_the_memo_beats_date_proximity():
+    [match] = match_statement(
+        [credit("t1", 10, 350.0, "PIX 529.982.247-25")],
+        [receivable("near", 10, 350.0), receivable("owner", 14, 350.0, "52998224725")],
+        tolerance_days=7,
+    )
+    assert (match.account_id, match.document_match) == ("owner", True)
+
+def test_each_receivable_is_matched_once():
+    matches = match_statement(
+        [credit("t1", 10, 100.0), credit("t2", 11, 100.0), credit("t3", 12, 100.0)],
+        [receivable("a", 10, 100.0), receivable("b", 12, 100.0)],
+        tolerance_days=3,
+    )
+    assert [(m.transaction.transaction_id, m.account_id) for m in matches] == [("t1", "a"), ("t2", "b")]
+
+def test_credits_outside_the_window_stay_unmatched():
+    assert match_statement([credit("t1", 20, 100.0)], [receivable("a", 10, 100.0)], tolerance_days=5) == []
+
+def test_amounts_compare_in_cents():
+    [match] = match_statement([credit("t1", 10, 0.3)], [receivable("a", 10, "0.30")], tolerance_days=0)
+    assert match.account_id == "a"
@@ -0,0 +1,94 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from fox import rentals
+from fox.models import OrderStatus
+from fox.rentals import overdue_charge, run_rental_billing, sync_rentals
+from tests.fakes import FakePool, RecordingCursor
+
+NOW = datetime(2026, 3, 20, 12)
+
+def rental(billed_until, ended_at=None, **values):
+    row = {"id": "r1", "client_id": "c1", "client_name": "Ana", "start_order_id": "o1",
+           "dumpster_identifier": "CAC-001", "daily_rate": 20, "billed_until": billed_until, "ended_at": ended_at}
+    row.update(values)
+    return row
+
+def test_open_rental_is_billed_in_whole_periods(monkeypatch):
+    monkeypatch.setattr(rentals, "RENTAL_BILLING_PERIOD_DAYS", 7)
+    billed_until = NOW - timedelta(days=15)
+    assert overdue_charge(rental(billed_until), NOW) == (14, billed_until + timedelta(days=14), False)
+
+def test_open_rental_inside_its_period_owes_nothing(monkeypatch):
+    monkeypatch.setattr(rentals, "RENTAL_BILLING_PERIOD_DAYS", 7)
+    billed_until = NOW - timedelta(days=6)
+    assert overdue_charge(rental(billed_until), NOW) == (0, billed_until, False)
+
+def test_ended_rental_pays_every_started_day_and_settles():
+    billed_until = NOW - timedelta(days=10)
+    ended_at = billed_until + timedelta(days=2, hours=6)
+    assert overdue_charge(rental(billed_until, ended_at), NOW) == (3, ended_at, True)
+
+def test_rental_ended_before_its_due_date_settles_without_charge():
+    billed_until = NOW - timedelta(days=1)
+    assert overdue_charge(rental(billed_until, NOW - timedelta(days=3)), NOW) == (0, billed_until, True)
+
+def test_billing_turns_overdue_days_into_receivables(monkeypatch):
+    monkeypatch.setattr(rentals, "RENTAL_BILLING_PERIOD_DAYS", 7)
+    monkeypatch.setattr(rentals, "RENTAL_OVERDUE_RATE", 1.5)
+    billed_until = NOW - timedelta(days=8)
+    cursor = RecordingCursor([[
+        rental(billed_until),
+        rental(NOW - timedelta(days=1), NOW - timedelta(days=2), id="r2"),
+    ]])
+    pool = FakePool(cursor)
+
+    async def get_db():
+        return pool
+
+    monkeypatch.setattr(rentals, "get_db", get_db)
+    result = asyncio.run(run_rental_billing(NOW))
+    assert (result.evaluated, result.billed, result.amount) == (2, 1, 210.0)
+
+    select, (insert, receivables), (update, updates), (touch, _) = cursor.statements
+    assert select[0].endswith("FOR UPDATE")
+    assert "FOR UPDATE OF" not in select[0]
+    assert select[1] == (NOW - timedelta(days=7), rentals.RENTAL_BILLING_BATCH_SIZE)
+    [receivable] = receivables
+    assert receivable[4] == 210.0
+    assert "7 dia(s)" in receivable[7]
+    assert updates == [(billed_until + timedelta(days=7), False, "r1"), (NOW - timedelta(days=1), True, "r2")]
+    assert touch.startswith("INSERT INTO table_versions")
+    assert pool.conn.events == ["begin", "commit"]
+
+def test_completed_removal_ends_the_open_rental():
+    cursor = RecordingCursor([[{"dumpster_id": "d1", "agreed_days": 7}]])
+    order = {"id": "o2", "order_type": "removal", "dumpster_id": "d1", "client_id": "c1", "rental_value": 300}
+    assert asyncio.run(sync_rentals(cursor, [order], OrderStatus.COMPLETED, NOW)) is True
+    (_, _), (update, args) = cursor.statements
+    assert update.startswith("UPDATE rentals SET ended_at = %s, end_order_id = %s")
+    assert args == [(NOW, "o2", NOW, "d1")]
+
+def test_completed_exchange_opens_the_next_rental():
+    cursor = RecordingCursor([[{"dumpster_id": "d1", "agreed_days": 10}]])
+    order = {"id": "o3", "order_type": "exchange", "dumpster_id": "d1", "client_id": "c1", "rental_value": 300}
+    asyncio.run(sync_rentals(cursor, [order], OrderStatus.COMPLETED, NOW))
+    insert, args = cursor.statements[-1]
+    assert insert.startswith("INSERT INTO rentals")
+    assert args[5:9] == (10, NOW + timedelta(days=10), 30.0, NOW + timedelta(days=10))
+
+def test_cancelled_placement_ends_its_own_rental():
+    cursor = RecordingCursor()
+    cursor.rowcount = 1
+    order = {"id": "o1", "order_type": "placement", "dumpster_id": "d1", "client_id": "c1", "rental_value": 300}
+    assert asyncio.run(sync_rentals(cursor, [order], OrderStatus.CANCELLED, NOW)) is True
+    [(query, args)] = cursor.statements
+    assert "WHERE start_order_id IN (%s) AND ended_at IS NULL" in query
+    assert args == (NOW, NOW, "o1")
+
+def test_other_transitions_leave_rentals_alone():
+    cursor = RecordingCursor()
+    order = {"id": "o1", "order_type": "placement", "dumpster_id": "d1", "client_id": "c1", "rental_value": 300}
+    assert asyncio.run(sync_rentals(cursor, [order], OrderStatus.IN_PROGRESS, NOW)) is False
+    assert asyncio.run(sync_rentals(cursor, [order], OrderStatus.COMPLETED, NOW)) is False
+    assert cursor.statements == []
@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from fox.routers.analytics import SECONDS_PER_DAY, build_utilization_report, compute_utilization
+
+DAY = int(SECONDS_PER_DAY)
+PERIOD = 10 * DAY
+DUMPSTERS = [
+    {"id": "d1", "identifier": "CAC-001", "size": "5m3"},
+    {"id": "d2", "identifier": "CAC-002", "size": "5m3"},
+    {"id": "d3", "identifier": "CAC-003", "size": "10m3"},
+]
+
+def event(dumpster_id, order_type, day):
+    return {"dumpster_id": dumpster_id, "order_type": order_type, "event_offset": int(day * DAY)}
+
+def utilization(order_events=(), maintenance_rows=(), revenue_rows=()):
+    return compute_utilization(DUMPSTERS, list(order_events), list(maintenance_rows), list(revenue_rows), PERIOD)
+
+def test_placement_and_removal_inside_range():
+    occupied, maintenance, idle, _ = utilization([event("d1", "placement", 1), event("d1", "removal", 3)])
+    assert occupied.tolist() == [2.0, 0.0, 0.0]
+    assert maintenance.tolist() == [0.0, 0.0, 0.0]
+    assert idle.tolist() == [8.0, 10.0, 10.0]
+
+def test_placement_before_range_counts_from_range_start():
+    occupied, _, _, _ = utilization([event("d1", "placement", -5), event("d1", "removal", 4)])
+    assert occupied[0] == pytest.approx(4.0)
+
+def test_open_placement_runs_to_range_end():
+    occupied, _, idle, _ = utilization([event("d2", "placement", 6)])
+    assert occupied[1] == pytest.approx(4.0)
+    assert idle[1] == pytest.approx(6.0)
+
+def test_exchange_keeps_the_dumpster_on_site():
+    occupied, _, _, _ = utilization([
+        event("d1", "placement", 0), event("d1", "exchange", 2), event("d1", "removal", 5),
+    ])
+    assert occupied[0] == pytest.approx(5.0)
+
+def test_removal_without_placement_is_ignored():
+    occupied, _, _, _ = utilization([event("d1", "removal", 2)])
+    assert occupied[0] == 0.0
+
+def test_events_of_each_dumpster_are_swept_separately():
+    occupied, _, _, _ = utilization([
+        event("d1", "placement", 1),
+        event("d2", "placement", 2), event("d2", "removal", 3),
+        event("d3", "placement", 9),
+    ])
+    assert occupied.tolist() == pytest.approx([9.0, 1.0, 1.0])
+
+def test_unknown_dumpsters_are_skipped():
+    occupied, maintenance, _, revenue = utilization(
+        [event("gone", "placement", 0)],
+        [{"dumpster_id": "gone", "start_offset": 0, "end_offset": None}],
+        [{"dumpster_id": "gone", "revenue": 100}],
+    )
+    assert occupied.sum() == maintenance.sum() == revenue.sum() == 0.0
+
+def test_open_maintenance_runs_to_range_end_and_idle_never_goes_negative():
+    occupied, maintenance, idle, _ = utilization(
+        [event("d3", "placement", 0)],
+        [{"dumpster_id": "d3", "start_offset": 4 * DAY, "end_offset": None},
+         {"dumpster_id": "d1", "start_offset": -DAY, "end_offset": 2 * DAY}],
+    )
+    assert maintenance.tolist() == pytest.approx([2.0, 0.0, 6.0])
+    assert idle[0] == pytest.approx(8.0)
+    assert occupied[2] == pytest.approx(10.0)
+    assert idle[2] == 0.0
+
+def test_revenue_is_mapped_per_dumpster():
+    _, _, _, revenue = utilization(revenue_rows=[{"dumpster_id": "d2", "revenue": "350.50"}])
+    assert revenue.tolist() == [0.0, 350.5, 0.0]
+
+def test_report_aggregates_by_size():
+    occupied, maintenance, idle, revenue = utilization(
+        [event("d1", "placement", 0), event("d1", "removal", 5)],
+        revenue_rows=[{"dumpster_id": "d1", "revenue": 500}],
+    )
+    start = datetime(2026, 1, 1)
+    report = build_utilization_report(DUMPSTERS, occupied, maintenance, idle, revenue, start,
+                                      start + timedelta(days=10))
+    sizes = {s.size: s for s in report.sizes}
+    assert sizes["5m3"].dumpster_count == 2
+    assert sizes["5m3"].occupied_days == 5.0
+    assert sizes["5m3"].occupancy_percent == 25.0
+    assert sizes["5m3"].revenue_per_day == 50.0
+    assert sizes["10m3"].occupancy_percent == 0.0
+    assert report.dumpsters[0].occupancy_percent == 50.0